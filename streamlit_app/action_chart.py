@@ -0,0 +1,74 @@
+import time
+
+import streamlit as st
+
+from episode_stats import PolicyTrace
+
+
+class ActionDistributionView:
+    """
+    Live action-probability view that updates in place.
+
+    The distribution is shown as one native progress bar per action, created
+    once and updated with new values. Probabilities and value estimates are
+    recorded every step in a PolicyTrace; the trend chart shows a rolling
+    window of it, so each update costs the same regardless of episode length.
+    Charts are far more expensive to push than progress bars, so the trend is
+    redrawn at most once every `trend_interval` seconds.
+    """
+
+    def __init__(self, bar_placeholder, trend_placeholder, action_labels, window=200,
+                 max_points=500, trend_interval=2.0):
+        self.action_labels = list(action_labels)
+        self.trend_placeholder = trend_placeholder
+        self.window = window
+        self.max_points = max_points
+        self.trend_interval = trend_interval
+        self.trace = PolicyTrace(len(self.action_labels))
+        self._next_trend = 0.0
+
+        with bar_placeholder.container():
+            self._bars = [st.progress(0.0, text=f"{label}: -") for label in self.action_labels]
+
+    def reset(self):
+        """Start a new episode"""
+        self.trace = PolicyTrace(len(self.action_labels))
+
+    def load(self, trace):
+        """Replace the recorded trajectory, e.g. with the full trace of a finished episode"""
+        self.trace = trace
+
+    def record(self, step, probs, value):
+        """Record the policy output of one step"""
+        self.trace.append(step, probs, value)
+
+    def update(self):
+        """Push the latest probabilities and the rolling trajectory"""
+        if len(self.trace) == 0:
+            return
+
+        for bar, label, prob in zip(self._bars, self.action_labels, self.trace.probs[-1]):
+            bar.progress(float(prob), text=f"{label}: {prob:.3f}")
+
+        now = time.perf_counter()
+        if now >= self._next_trend:
+            self._next_trend = now + self.trend_interval
+            start = max(0, len(self.trace) - self.window)
+            self._draw_trend(start, len(self.trace), 1)
+
+    def show_trajectory(self):
+        """Show the whole recorded episode, downsampled to at most max_points"""
+        stride = max(1, -(-len(self.trace) // self.max_points))
+        self._draw_trend(0, len(self.trace), stride)
+
+    def _draw_trend(self, start, stop, stride):
+        import pandas as pd
+
+        steps = self.trace.steps[start:stop:stride]
+        probs = pd.DataFrame(self.trace.probs[start:stop:stride], index=steps,
+                             columns=[f"P({label})" for label in self.action_labels])
+        values = pd.DataFrame({"Value": self.trace.values[start:stop:stride]}, index=steps)
+
+        with self.trend_placeholder.container():
+            st.line_chart(probs, height=160)
+            st.line_chart(values, height=120)
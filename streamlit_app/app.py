@@ -1,17 +1,77 @@
 import streamlit as st
-import gymnasium as gym
-import torch
+import os
 import numpy as np
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from ppo_network import PPONetwork
+from model_registry import DEFAULT_CHECKPOINTS, PRECISIONS, served_checkpoint, checkpoint_training
+from action_chart import ActionDistributionView
+from episode_runner import EpisodeRunner, RunJob
+from eval_store import request_evaluation, DEFAULT_EVAL_EPISODES
+from history_store import EpisodeHistory
+from env_specs import ENV_SPECS, get_spec
+from trajectory_store import TRAJECTORY_DIR, STATE_RENDERABLE, Trajectory, StateRenderer
+from profiler import StageProfiler, append_profile_log, PROFILE_LOG
+from video_export import VIDEO_DIR, mp4_available
+from sweep_store import SweepStore, SWEEP_DB
+import static_charts
 import time
-from PIL import Image
-import io
-import json
+import uuid
 from datetime import datetime
 
+# Inference backend, chosen at startup: "torch" or "numpy" (skips importing torch)
+INFERENCE_BACKEND = os.environ.get("PPO_BACKEND", "torch")
+# Default precision of the torch backend (see quantize_policy.py)
+DEFAULT_PRECISION = os.environ.get("PPO_PRECISION", "fp32")
+
+
+@st.cache_resource
+def get_runner():
+    """Background episode runner shared by every session"""
+    return EpisodeRunner()
+
+
+@st.cache_resource(max_entries=8)
+def load_trajectory(path):
+    """Recorded episode, kept in memory while it is being scrubbed"""
+    return Trajectory.load(path)
+
+
+@st.cache_resource
+def get_state_renderer(env_name):
+    return StateRenderer(env_name)
+
+
+@st.cache_resource
+def open_sweep_store(path):
+    return SweepStore(path)
+
+
+def get_sweep_store():
+    """
+    Read connection to the results of run_sweep.py, or None before the first
+    sweep. Only an opened store is cached, so a sweep started after the app
+    shows up on the next rerun.
+    """
+    return open_sweep_store(SWEEP_DB) if os.path.exists(SWEEP_DB) else None
+
+
+@st.cache_data(max_entries=16)
+def comparison_figure(ppo_stats, solved_threshold):
+    """Algorithm comparison table and PNG chart, drawn once per evaluation result"""
+    import pandas as pd
+
+    data = static_charts.comparison_data(ppo_stats)
+    return pd.DataFrame(data), static_charts.comparison_chart(data, solved_threshold)
+
+
+@st.cache_data(max_entries=16)
+def reward_figure(episodes, rewards, solved, solved_threshold):
+    return static_charts.reward_chart(episodes, rewards, solved, solved_threshold)
+
+
+@st.cache_data(max_entries=16)
+def action_pie_figure(counts, labels):
+    return static_charts.action_pie(counts, labels)
+
+
 # Page configuration
 st.set_page_config(
     page_title="PPO Agent Demo - Week 12",
@@ -71,9 +131,18 @@ st.markdown('<div class="sub-header">Week 12: PPO Algorithm Showcase</div>', uns
 
 # Initialize session state
 if 'episode_history' not in st.session_state:
-    st.session_state.episode_history = []
+    # Episodes beyond the in-memory capacity spill to SQLite when a directory is configured
+    spill_dir = os.environ.get("PPO_HISTORY_SPILL_DIR")
+    spill_path = os.path.join(spill_dir, f"history_{uuid.uuid4().hex}.sqlite") if spill_dir else None
+    st.session_state.episode_history = EpisodeHistory(spill_path=spill_path)
 if 'current_episode' not in st.session_state:
     st.session_state.current_episode = 0
+if 'trajectories' not in st.session_state:
+    st.session_state.trajectories = []
+if 'profiles' not in st.session_state:
+    st.session_state.profiles = []
+if 'videos' not in st.session_state:
+    st.session_state.videos = []
 
 # Sidebar
 with st.sidebar:
@@ -82,24 +151,57 @@ with st.sidebar:
     # Environment selection
     env_name = st.selectbox(
         "Select Environment",
-        ["CartPole-v1", "LunarLander-v3"],
+        list(ENV_SPECS),
         help="Choose which environment to run"
     )
+    spec = get_spec(env_name)
+
+    # Quantized variants only exist for the torch backend
+    precision = "fp32"
+    if INFERENCE_BACKEND == "torch":
+        default_precision = DEFAULT_PRECISION
+        if default_precision not in PRECISIONS:
+            st.warning(f"Unknown PPO_PRECISION `{default_precision}` (expected one of {', '.join(PRECISIONS)}); "
+                       "using fp32")
+            default_precision = "fp32"
+        precision = st.selectbox("Model Precision", PRECISIONS, index=PRECISIONS.index(default_precision),
+                                 help="Serve the float32 checkpoint or a variant from quantize_policy.py")
 
     st.markdown("---")
 
     # Episode controls
     st.subheader("Episode Controls")
-    num_episodes = st.slider("Number of Episodes", 1, 10, 1)
+    num_episodes = st.slider("Number of Episodes", 1, 100, 1)
     deterministic = st.checkbox("Deterministic Policy", value=True)
+    fixed_seed = st.checkbox("Fixed Seed", value=True,
+                             help="Episode i is reset with seed + i, so runs are reproducible")
+    seed = int(st.number_input("Seed", min_value=0, value=0, step=1, disabled=not fixed_seed)) if fixed_seed else None
+    use_cache = st.checkbox("Use Cached Results", value=True,
+                            help="Serve seeded deterministic episodes that were already run for this checkpoint")
+    headless = st.checkbox("Headless Batch Mode", value=False,
+                           help="Run all episodes at once in a vector env, without rendering")
     show_probs = st.checkbox("Show Action Probs", value=True)
-    speed = st.slider("Animation Speed", 0.01, 0.2, 0.05, 0.01)
+    display_fps = st.slider("Display FPS", 5, 30, 15,
+                            help="Frames sent to the browser per second; extra frames are dropped")
+    realtime = st.checkbox("Real-time Playback", value=True,
+                           help="Pace the simulation to the environment's native FPS instead of running at full speed")
+    record_episodes = st.checkbox("Record for Replay", value=True,
+                                  help="Save rendered episodes so they can be replayed without re-running them")
+    profiling = st.checkbox("Profiling", value=False,
+                            help="Show per-stage timings and append them to the profile log")
+    # MP4 needs PyAV; GIF is written with Pillow alone
+    export_choice = st.selectbox("Export Video", ["Off", "GIF"] + (["MP4"] if mp4_available() else []),
+                                 disabled=headless,
+                                 help="Encode each rendered episode to a downloadable clip")
+    export_fps = st.select_slider("Export FPS", [10, 25, 50], value=25,
+                                  disabled=headless or export_choice == "Off",
+                                  help="Frames per second of the clip, independent of the display FPS")
 
     st.markdown("---")
 
     # Algorithm info
     st.subheader("Algorithm Info")
-    st.info("""
+    st.info(f"""
     **Algorithm:** PPO (Proximal Policy Optimization)
 
     **Features:**
@@ -109,10 +211,10 @@ with st.sidebar:
     - Expert-level performance
 
     **Network:**
-    - Input: State dimension
-    - Hidden: 128-128 neurons
-    - Output: Actions + Value
-    - Params: ~35K (CartPole)
+    - Input: {spec.state_dim} state dims
+    - Hidden: {spec.hidden_dim}-{spec.hidden_dim} neurons
+    - Output: {spec.action_dim} actions + Value
+    - Params: ~{spec.num_params / 1000:.1f}K ({spec.label})
     """)
 
     st.markdown("---")
@@ -120,336 +222,469 @@ with st.sidebar:
     # Model status
     st.subheader("Model Status")
 
-    if env_name == "CartPole-v1":
-        st.success("CartPole Model Ready")
+    # Measured on the current checkpoint; evaluated in the background on first view
+    eval_stats = request_evaluation(env_name, get_runner(), backend=INFERENCE_BACKEND, precision=precision)
+    served_path = served_checkpoint(env_name, INFERENCE_BACKEND, precision)
+    checkpoint_found = os.path.exists(served_path)
+
+    if checkpoint_found:
+        st.success(f"{spec.label} Model Ready ({precision})" if precision != "fp32" else f"{spec.label} Model Ready")
         col1, col2 = st.columns(2)
         with col1:
-            st.metric("Performance", "475±25")
-            st.metric("CV", "5.2%")
+            st.metric("Performance", f"{eval_stats['mean_reward']:.0f}±{eval_stats['std_reward']:.0f}" if eval_stats else "...")
+            st.metric("CV", f"{eval_stats['cv'] * 100:.1f}%" if eval_stats else "...")
         with col2:
-            st.metric("Success Rate", "95%")
+            st.metric("Success Rate", f"{eval_stats['success_rate'] * 100:.0f}%" if eval_stats else "...")
             st.metric("Episodes Run", st.session_state.current_episode)
+        if eval_stats is None:
+            st.caption(f"Evaluating checkpoint over {DEFAULT_EVAL_EPISODES} episodes...")
     else:
-        st.warning("LunarLander Model")
-        st.info("Model available but requires Day 78 checkpoint")
+        st.warning(f"{spec.label} checkpoint not found")
+        st.info(f"Runs use random weights until a checkpoint is saved to `{served_path}`")
 
     # Clear history button
     if st.button("Clear History"):
-        st.session_state.episode_history = []
+        st.session_state.episode_history.clear()
         st.session_state.current_episode = 0
         st.rerun()
 
-# Main content
+# Main content; only the open tab runs (switching tabs reruns the script), so a
+# page view pays for the imports and charts of that tab alone. Needs Streamlit >= 1.55
 tab1, tab2, tab3, tab4, tab5 = st.tabs([
     "Live Demo", 
     "Performance", 
     "Training History", 
     "Analysis", 
     "About"
-])
+], key="main_tab", on_change="rerun")
 
 with tab1:
-    st.header("Live Agent Demonstration")
-
-    col1, col2 = st.columns([2, 1])
-
-    with col1:
-        st.subheader("Environment Rendering")
-        render_placeholder = st.empty()
-
-        # Control buttons
-        btn_col1, btn_col2 = st.columns(2)
-        with btn_col1:
-            run_episode = st.button("Run Episode(s)", key="run_episode", use_container_width=True)
-        with btn_col2:
-            save_stats = st.checkbox("Save to History", value=True)
-
-    with col2:
-        st.subheader("Episode Stats")
-        stats_placeholder = st.empty()
-
-        st.subheader("Action Probabilities")
-        prob_placeholder = st.empty()
-
-    # Progress bar
-    progress_bar = st.progress(0)
-    status_text = st.empty()
-
-    # Run episode logic
-    if run_episode and env_name == "CartPole-v1":
-        try:
-            # Load model
-            device = torch.device("cpu")
-            model = PPONetwork(state_dim=4, action_dim=2, hidden_dim=128).to(device)
-
-            # Try to load trained model
-            model_loaded = False
-            try:
-                model.load_state_dict(torch.load('../results/day79/cartpole_best_model.pt', map_location=device))
-                st.success("Loaded trained model from Day 79!")
-                model_loaded = True
-            except:
-                st.warning("Using random model (for demo purposes)")
-
-            model.eval()
-
-            # Run multiple episodes
-            for ep in range(num_episodes):
-                status_text.text(f"Running episode {ep+1}/{num_episodes}...")
-
-                # Create environment
-                env = gym.make(env_name, render_mode="rgb_array")
-                state, _ = env.reset()
-
-                episode_reward = 0
-                episode_length = 0
-                done = False
-                actions_taken = []
-
-                # Run episode
-                while not done and episode_length < 500:
-                    # Get action
-                    action, probs, value = model.get_action(state, deterministic=deterministic)
-                    actions_taken.append(action)
-
-                    # Step environment
-                    next_state, reward, terminated, truncated, _ = env.step(action)
-                    done = terminated or truncated
+    if tab1.open:
+        st.header("Live Agent Demonstration")
 
-                    episode_reward += reward
-                    episode_length += 1
-                    state = next_state
+        col1, col2 = st.columns([2, 1])
 
-                    # Update display
-                    if episode_length % 5 == 0 or done:
-                        # Render
-                        frame = env.render()
-                        render_placeholder.image(frame, caption=f"Episode {ep+1}/{num_episodes} - Step {episode_length}", use_column_width=True)
+        with col1:
+            st.subheader("Environment Rendering")
+            render_placeholder = st.empty()
+
+            # Control buttons
+            btn_col1, btn_col2, btn_col3 = st.columns(3)
+            with btn_col1:
+                run_episode = st.button("Run Episode(s)", key="run_episode", width="stretch")
+            with btn_col2:
+                stop_run = st.button("Stop", key="stop_run", width="stretch")
+            with btn_col3:
+                save_stats = st.checkbox("Save to History", value=True)
 
-                        # Update stats
-                        status_class = "success-card" if episode_reward >= 475 else "warning-card" if episode_reward >= 200 else "metric-card"
+        with col2:
+            st.subheader("Episode Stats")
+            stats_placeholder = st.empty()
+
+            st.subheader("Action Probabilities")
+            prob_placeholder = st.empty()
+            trend_placeholder = st.empty()
+
+        # Progress bar
+        progress_bar = st.progress(0)
+        status_text = st.empty()
+
+        # Start a run in the background, replacing any run this session still has going
+        if run_episode:
+            if st.session_state.get('run_handle') is not None:
+                st.session_state.run_handle.cancel()
+            st.session_state.run_handle = get_runner().submit(RunJob(
+                env_name, num_episodes, deterministic=deterministic, seed=seed, backend=INFERENCE_BACKEND,
+                precision=precision,
+                headless=headless, display_fps=display_fps, realtime=realtime,
+                record_dir=TRAJECTORY_DIR if record_episodes else None, use_cache=use_cache,
+                profile_log=PROFILE_LOG if profiling else None,
+                export_format=None if export_choice == "Off" else export_choice.lower(), export_fps=export_fps,
+                export_dir=VIDEO_DIR
+            ))
+
+        handle = st.session_state.get('run_handle')
+        if handle is not None and stop_run:
+            handle.cancel()
+
+        # Follow the active run; reruns re-attach to it instead of restarting it
+        if handle is not None:
+            job = handle.job
+            run_spec = get_spec(job.env_name)
+            prob_view = None
+            if show_probs and not job.headless:
+                prob_view = ActionDistributionView(prob_placeholder, trend_placeholder, get_spec(job.env_name).action_labels)
+            current_ep = None
+            error_event = None
+            # Time spent pushing frames and charts to the browser
+            ui_profiler = StageProfiler(("frame", "plot"))
+            clock = time.perf_counter
+
+            finished = False
+            while not finished:
+                # Read the flag before polling so the final events are drained
+                finished = handle.finished
+
+                for event in handle.poll():
+                    kind = event['type']
+
+                    if kind == 'frame':
+                        start = clock()
+                        render_placeholder.image(event['data'], caption=event['caption'], width="stretch")
+                        ui_profiler.add("frame", clock() - start)
+
+                    elif kind == 'progress':
+                        status_text.text(event['status'])
+                        progress_bar.progress(event['fraction'])
+                        if 'reward' not in event:
+                            continue
+
+                        start = clock()
+                        episode_reward = event['reward']
+                        status_class = ("success-card" if episode_reward >= run_spec.solved_threshold else
+                                        "warning-card" if episode_reward >= run_spec.good_threshold else "metric-card")
                         stats_html = f"""
                         <div class="{status_class}">
-                            <h3>Episode {ep+1} Progress</h3>
-                            <p><strong>Steps:</strong> {episode_length}/500</p>
+                            <h3>Episode {event['episode']+1} Progress</h3>
+                            <p><strong>Steps:</strong> {event['step']}/{job.max_steps}</p>
                             <p><strong>Reward:</strong> {episode_reward:.1f}</p>
-                            <p><strong>Status:</strong> {'Completed' if done else 'Running'}</p>
-                            <p><strong>Left/Right:</strong> {actions_taken.count(0)}/{actions_taken.count(1)}</p>
+                            <p><strong>Status:</strong> {'Completed' if event['done'] else 'Running'}</p>
+                            <p><strong>{'/'.join(run_spec.action_labels)}:</strong> {'/'.join(map(str, event['action_counts']))}</p>
                         </div>
                         """
                         stats_placeholder.markdown(stats_html, unsafe_allow_html=True)
 
                         # Show action probabilities
-                        if show_probs:
-                            prob_fig, ax = plt.subplots(figsize=(5, 3))
-                            actions = ['Left', 'Right']
-                            colors = ['#FF6B6B', '#4ECDC4']
-                            bars = ax.bar(actions, probs[0], color=colors, alpha=0.8, edgecolor='black', linewidth=2)
-                            ax.set_ylabel('Probability', fontweight='bold')
-                            ax.set_title('Action Distribution', fontweight='bold')
-                            ax.set_ylim([0, 1])
-                            ax.grid(True, alpha=0.3, axis='y')
-
-                            # Add value labels
-                            for bar, prob in zip(bars, probs[0]):
-                                height = bar.get_height()
-                                ax.text(bar.get_x() + bar.get_width()/2., height + 0.02,
-                                       f'{prob:.3f}', ha='center', va='bottom', fontweight='bold')
-
-                            prob_placeholder.pyplot(prob_fig)
-                            plt.close()
-
-                        # Update progress bar
-                        progress = (episode_length / 500.0) * (1.0 / num_episodes) + (ep / num_episodes)
-                        progress_bar.progress(min(progress, 1.0))
-
-                        time.sleep(speed)
-
-                env.close()
-
-                # Save to history
-                if save_stats:
-                    st.session_state.episode_history.append({
-                        'episode': st.session_state.current_episode + 1,
-                        'reward': episode_reward,
-                        'length': episode_length,
-                        'left_actions': actions_taken.count(0),
-                        'right_actions': actions_taken.count(1),
-                        'solved': episode_reward >= 475
-                    })
-                    st.session_state.current_episode += 1
+                        if prob_view is not None:
+                            if event['episode'] != current_ep:
+                                current_ep = event['episode']
+                                prob_view.reset()
+                            if event['probs'] is not None:
+                                prob_view.record(event['step'], event['probs'], event['value'])
+                            prob_view.update()
+                        ui_profiler.add("plot", clock() - start)
+
+                    elif kind == 'episode':
+                        # Keep the full per-step trace of the finished episode
+                        if prob_view is not None and event.get('trace') is not None:
+                            prob_view.load(event['trace'])
+                        if event.get('trajectory'):
+                            st.session_state.trajectories.append(event['trajectory'])
+                        if event.get('video'):
+                            st.session_state.videos.append(event['video'])
+                        if event.get('profile'):
+                            st.session_state.profiles = (st.session_state.profiles + [event['profile']])[-50:]
+
+                    elif kind == 'error':
+                        error_event = event
+
+                if not finished:
+                    time.sleep(1.0 / job.display_fps)
+
+            if handle.model_loaded:
+                st.success(f"Loaded trained model from "
+                           f"{os.path.basename(served_checkpoint(job.env_name, job.backend, job.precision))}")
+            elif handle.model_loaded is not None:
+                st.warning("Using random model (for demo purposes)")
+            if handle.cache_hits:
+                st.caption(f"{handle.cache_hits} of {len(handle.records)} episode(s) served from the result cache "
+                           f"(seed {job.seed}, deterministic)")
+
+            run_records = handle.records
+            st.session_state.run_handle = None
+
+            if error_event is not None:
+                st.error(f"Error running episode: {error_event['message']}")
+                st.info(f"Make sure the trained model exists at: `{DEFAULT_CHECKPOINTS[job.env_name]}`")
+                with st.expander("Show error details"):
+                    st.code(error_event['details'])
+
+            # Save to history
+            if save_stats:
+                st.session_state.episode_history.extend(run_records)
+                st.session_state.current_episode = st.session_state.episode_history.count
+
+            if prob_view is not None and len(prob_view.trace) > 0:
+                with ui_profiler.stage("plot"):
+                    prob_view.show_trajectory()
+
+            st.session_state.ui_profile = ui_profiler.summary()
+            if job.profile_log:
+                append_profile_log(dict(st.session_state.ui_profile, kind="ui", env_name=job.env_name,
+                                        episodes=len(handle.records)), job.profile_log)
 
             # Final summary
-            if num_episodes == 1:
-                final_class = "success-card" if episode_reward >= 475 else "warning-card"
+            if len(run_records) == 1:
+                episode_reward = run_records[0]['reward']
+                final_class = "success-card" if episode_reward >= run_spec.solved_threshold else "warning-card"
+                action_counts = run_records[0].get('action_counts',
+                                                   [run_records[0]['left_actions'], run_records[0]['right_actions']])
+                action_balance = ", ".join(f"{label}: {count}" for label, count in zip(run_spec.action_labels, action_counts))
                 final_html = f"""
                 <div class="{final_class}">
                     <h2>Episode Complete!</h2>
                     <h3>Total Reward: {episode_reward:.1f}</h3>
-                    <p><strong>Episode Length:</strong> {episode_length} steps</p>
-                    <p><strong>Action Balance:</strong> Left: {actions_taken.count(0)}, Right: {actions_taken.count(1)}</p>
-                    <p><strong>Status:</strong> {'SOLVED! (>=475)' if episode_reward >= 475 else 'Good! (>=200)' if episode_reward >= 200 else 'Try again'}</p>
+                    <p><strong>Episode Length:</strong> {run_records[0]['length']} steps</p>
+                    <p><strong>Action Balance:</strong> {action_balance}</p>
+                    <p><strong>Status:</strong> {f'SOLVED! (>={run_spec.solved_threshold})' if episode_reward >= run_spec.solved_threshold else f'Good! (>={run_spec.good_threshold})' if episode_reward >= run_spec.good_threshold else 'Try again'}</p>
                 </div>
                 """
-            else:
-                avg_reward = np.mean([h['reward'] for h in st.session_state.episode_history[-num_episodes:]])
-                success_rate = sum([h['solved'] for h in st.session_state.episode_history[-num_episodes:]]) / num_episodes * 100
+            elif len(run_records) > 1:
+                run_count = len(run_records)
+                run_rewards = [h['reward'] for h in run_records]
+                num_solved = sum([h['solved'] for h in run_records])
+                avg_reward = np.mean(run_rewards)
+                success_rate = num_solved / run_count * 100
                 final_class = "success-card" if success_rate >= 80 else "warning-card"
                 final_html = f"""
                 <div class="{final_class}">
-                    <h2>{num_episodes} Episodes Complete!</h2>
+                    <h2>{run_count} Episodes Complete!</h2>
                     <h3>Average Reward: {avg_reward:.1f}</h3>
-                    <p><strong>Success Rate:</strong> {success_rate:.1f}% ({sum([h['solved'] for h in st.session_state.episode_history[-num_episodes:]])}/{num_episodes})</p>
-                    <p><strong>Best Reward:</strong> {max([h['reward'] for h in st.session_state.episode_history[-num_episodes:]]):.1f}</p>
-                    <p><strong>Worst Reward:</strong> {min([h['reward'] for h in st.session_state.episode_history[-num_episodes:]]):.1f}</p>
+                    <p><strong>Success Rate:</strong> {success_rate:.1f}% ({num_solved}/{run_count})</p>
+                    <p><strong>Best Reward:</strong> {max(run_rewards):.1f}</p>
+                    <p><strong>Worst Reward:</strong> {min(run_rewards):.1f}</p>
                 </div>
                 """
 
-            stats_placeholder.markdown(final_html, unsafe_allow_html=True)
-            progress_bar.progress(1.0)
-            status_text.text("All episodes completed!")
-
-        except Exception as e:
-            st.error(f"Error running episode: {str(e)}")
-            st.info("Make sure the trained model exists at: `../results/day79/cartpole_best_model.pt`")
-            import traceback
-            with st.expander("Show error details"):
-                st.code(traceback.format_exc())
+            if run_records:
+                stats_placeholder.markdown(final_html, unsafe_allow_html=True)
+            if handle.cancelled:
+                status_text.text(f"Run stopped after {len(run_records)}/{job.num_episodes} episodes")
+            elif error_event is None:
+                progress_bar.progress(1.0)
+                status_text.text("All episodes completed!")
+
+        # Scrub through a recorded episode; neither the environment nor the network is run
+        trajectories = [p for p in st.session_state.trajectories if os.path.exists(p)]
+        if trajectories:
+            with st.expander("Episode Replay"):
+                path = st.selectbox("Recorded episode", trajectories[::-1], format_func=os.path.basename)
+                trajectory = load_trajectory(path)
+                replay_labels = trajectory.action_labels
+                step = st.slider("Step", 0, len(trajectory), len(trajectory), key=f"replay_step_{path}")
+                replay_stats = trajectory.step_stats(step)
+
+                replay_col1, replay_col2 = st.columns([2, 1])
+                with replay_col1:
+                    if trajectory.env_name in STATE_RENDERABLE:
+                        frame = get_state_renderer(trajectory.env_name).render(trajectory.obs[step])
+                        st.image(frame, caption=f"Step {step}/{len(trajectory)}")
+                    else:
+                        frame, frame_step = trajectory.keyframe(step)
+                        if frame is not None:
+                            st.image(frame, caption=f"Keyframe at step {frame_step} (scrubbed to {step}/{len(trajectory)})")
+                with replay_col2:
+                    st.markdown(f"""
+                    <div class="metric-card">
+                        <p><strong>Seed:</strong> {trajectory.seed if trajectory.seed is not None else 'unseeded'}</p>
+                        <p><strong>Step:</strong> {step}/{len(trajectory)}</p>
+                        <p><strong>Reward:</strong> {replay_stats['reward']:.1f}</p>
+                        <p><strong>{'/'.join(replay_labels)}:</strong> {'/'.join(map(str, replay_stats['action_counts']))}</p>
+                        <p><strong>Last action:</strong> {replay_labels[replay_stats['action']] if replay_stats['action'] is not None else '-'}</p>
+                    </div>
+                    """, unsafe_allow_html=True)
+                    if replay_stats['probs'] is not None:
+                        for label, prob in zip(replay_labels, replay_stats['probs']):
+                            st.progress(float(prob), text=f"{label}: {prob:.3f}")
+
+        # Clips encoded by the runner while the episodes were rendered
+        videos = [p for p in st.session_state.videos if os.path.exists(p)]
+        if videos:
+            with st.expander("Exported Videos"):
+                video_path = st.selectbox("Clip", videos[::-1], format_func=os.path.basename)
+                with open(video_path, "rb") as f:
+                    video_bytes = f.read()
+                if video_path.endswith(".mp4"):
+                    st.video(video_bytes)
+                    mime = "video/mp4"
+                else:
+                    st.image(video_bytes)
+                    mime = "image/gif"
+                st.download_button(
+                    label=f"Download Clip ({len(video_bytes) / 1024:.0f} KB)",
+                    data=video_bytes,
+                    file_name=os.path.basename(video_path),
+                    mime=mime
+                )
+
+        # Stage timings of the latest episode and of the UI updates of the latest run
+        if profiling and st.session_state.profiles:
+            with st.expander("Profiling", expanded=True):
+                profile = st.session_state.profiles[-1]
+                prof_col1, prof_col2, prof_col3, prof_col4 = st.columns(4)
+                prof_col1.metric("Steps/sec", f"{profile['steps_per_sec']:.0f}" if profile['steps_per_sec'] else "-")
+                prof_col2.metric("Frames/sec", f"{profile['frames_per_sec']:.1f}" if profile['frames_per_sec'] else "-")
+                prof_col3.metric("Episode Wall Time", f"{profile['wall_s']:.2f}s")
+                prof_col4.metric("Frames Dropped", profile['counters'].get('frames_dropped', 0))
+
+                stages = dict(profile['stages'])
+                stages.update({f"ui_{name}": row for name, row in st.session_state.get('ui_profile', {}).get('stages', {}).items()})
+                import pandas as pd
+                timing_df = pd.DataFrame([
+                    {'Stage': name, 'Calls': row['count'], 'Total (ms)': round(row['total_ms'], 1),
+                     'Share (%)': round(row['share'] * 100, 1), 'p50 (ms)': round(row['p50_ms'], 3),
+                     'p95 (ms)': round(row['p95_ms'], 3), 'p99 (ms)': round(row['p99_ms'], 3)}
+                    for name, row in stages.items()
+                ])
+                st.dataframe(timing_df, width="stretch", hide_index=True)
+                st.caption(f"Latest of {len(st.session_state.profiles)} profiled episodes this session. "
+                           f"ui_* stages run in the browser session; per-episode logs go to `{PROFILE_LOG}`.")
 
 with tab2:
-    st.header("Performance Metrics")
+    if tab2.open:
+        st.header("Performance Metrics")
 
-    st.subheader("Training Results Summary")
+        st.subheader("Training Results Summary")
 
-    col1, col2, col3, col4 = st.columns(4)
+        col1, col2, col3, col4 = st.columns(4)
 
-    with col1:
-        st.metric("Mean Reward", "475±25", delta="Solved")
+        if eval_stats is not None:
+            mean_lo, mean_hi = eval_stats['mean_reward_ci']
+            success_lo, success_hi = eval_stats['success_rate_ci']
 
-    with col2:
-        st.metric("Success Rate", "95%", delta="+53% vs baseline")
+            with col1:
+                st.metric("Mean Reward", f"{eval_stats['mean_reward']:.0f}±{eval_stats['std_reward']:.0f}",
+                          delta="Solved" if eval_stats['mean_reward'] >= spec.solved_threshold else
+                          f"{eval_stats['mean_reward'] - spec.solved_threshold:.0f} vs {spec.solved_threshold}",
+                          delta_color="normal" if eval_stats['mean_reward'] >= spec.solved_threshold else "inverse")
 
-    with col3:
-        st.metric("Training Episodes", "500", delta="Day 79")
+            with col2:
+                st.metric("Success Rate", f"{eval_stats['success_rate'] * 100:.0f}%")
 
-    with col4:
-        st.metric("CV", "5.2%", delta="Excellent")
+            with col3:
+                # Recorded by train_ppo.py; older converted checkpoints lack it
+                training = checkpoint_training(env_name)
+                st.metric("Training Episodes", f"{training['episodes']:,}" if 'episodes' in training else "n/a",
+                          delta=f"{training['steps']:,} steps" if 'steps' in training else None, delta_color="off")
 
-    st.markdown("---")
+            with col4:
+                st.metric("CV", f"{eval_stats['cv'] * 100:.1f}%")
 
-    # Performance comparison chart
-    st.subheader("Algorithm Comparison")
+            st.caption(f"Measured over {eval_stats['episodes']} seeded deterministic episodes. "
+                       f"95% bootstrap CI: mean reward {mean_lo:.1f}-{mean_hi:.1f}, "
+                       f"success rate {success_lo * 100:.0f}-{success_hi * 100:.0f}%.")
+        elif checkpoint_found:
+            st.info(f"Evaluating the current checkpoint over {DEFAULT_EVAL_EPISODES} episodes in the background. "
+                    "Results appear on the next refresh and are cached until the checkpoint changes.")
+        else:
+            st.info(f"No {spec.label} checkpoint to evaluate yet.")
 
-    comparison_data = {
-        'Algorithm': ['REINFORCE', 'A2C', 'PPO (Base)', 'PPO (Opt)'],
-        'Mean Reward': [200, 200, 200, 475],
-        'Std Dev': [50, 50, 40, 25],
-        'Success Rate (%)': [42, 42, 42, 95]
-    }
+        st.markdown("---")
 
-    df = pd.DataFrame(comparison_data)
+        # Performance comparison chart (the baselines are CartPole experiments)
+        if env_name == "CartPole-v1":
+            st.subheader("Algorithm Comparison")
 
-    col1, col2 = st.columns([1, 1])
+            # Baselines have no shipped checkpoints; PPO (Opt) is the measured checkpoint when available
+            ppo_stats = None
+            if eval_stats is not None:
+                ppo_stats = (round(eval_stats['mean_reward'], 1), round(eval_stats['std_reward'], 1),
+                             round(eval_stats['success_rate'] * 100, 1))
+            df, chart_png = comparison_figure(ppo_stats, spec.solved_threshold)
 
-    with col1:
-        st.dataframe(df, use_container_width=True, hide_index=True)
+            col1, col2 = st.columns([1, 1])
 
-    with col2:
-        fig, ax = plt.subplots(figsize=(6, 4))
-        colors = ['#FF6B6B', '#FFA07A', '#FFD93D', '#6BCB77']
-        bars = ax.bar(df['Algorithm'], df['Mean Reward'], 
-                     yerr=df['Std Dev'], capsize=5, color=colors, 
-                     alpha=0.8, edgecolor='black', linewidth=2)
-        ax.axhline(475, color='green', linestyle='--', linewidth=2, alpha=0.7, label='Solved Threshold')
-        ax.set_ylabel('Average Reward', fontweight='bold')
-        ax.set_xlabel('Algorithm', fontweight='bold')
-        ax.set_title('Performance Comparison', fontweight='bold', fontsize=14)
-        ax.legend()
-        ax.grid(True, alpha=0.3, axis='y')
+            with col1:
+                st.dataframe(df, width="stretch", hide_index=True)
 
-        st.pyplot(fig)
-        plt.close()
+            with col2:
+                st.image(chart_png, width="stretch")
 
 with tab3:
-    st.header("Your Testing History")
+    if tab3.open:
+        st.header("Your Testing History")
+
+        history = st.session_state.episode_history
+
+        if len(history) > 0:
+            # Newest episodes only (bounded); totals come from running aggregates
+            history_df = history.to_frame()
+
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                # Plot reward over episodes; redrawn only when the history changes
+                st.image(reward_figure(history_df['episode'].to_numpy(), history_df['reward'].to_numpy(),
+                                       history_df['solved'].to_numpy(), spec.solved_threshold),
+                         width="stretch")
+
+            with col2:
+                st.subheader("Statistics")
+                st.metric("Episodes Run", history.count)
+                st.metric("Average Reward", f"{history.mean_reward:.1f}")
+                st.metric("Best Reward", f"{history.max_reward:.1f}")
+                st.metric("Success Rate", f"{history.success_rate * 100:.1f}%")
+
+                st.markdown("---")
+
+                # Action distribution
+                total_left = history.left_total
+                total_right = history.right_total
+
+                # The tracked actions may never have been taken (e.g. LunarLander's side engines)
+                if total_left + total_right == 0:
+                    st.caption("No tracked actions taken yet")
+                else:
+                    st.image(action_pie_figure((total_left, total_right),
+                                               tuple(spec.action_labels[a] for a in spec.history_actions)),
+                             width="stretch")
+
+            # Show data table
+            st.subheader("Episode Details")
+            if history.count > len(history):
+                st.caption(f"Showing the latest {len(history)} of {history.count} episodes")
+            st.dataframe(history_df, width="stretch", hide_index=True)
+
+            # Download button
+            csv = history_df.to_csv(index=False)
+            st.download_button(
+                label="Download History as CSV",
+                data=csv,
+                file_name=f"ppo_agent_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
+        else:
+            st.info("Run some episodes in the Live Demo tab to see your history here!")
 
-    if len(st.session_state.episode_history) > 0:
-        # Convert to dataframe
-        history_df = pd.DataFrame(st.session_state.episode_history)
+with tab4:
+    if tab4.open:
+        st.header("Technical Analysis")
 
-        col1, col2 = st.columns([2, 1])
+        col1, col2 = st.columns(2)
 
-        with col1:
-            # Plot reward over episodes
-            fig, ax = plt.subplots(figsize=(10, 5))
-            ax.plot(history_df['episode'], history_df['reward'], 
-                   marker='o', linewidth=2, markersize=8, 
-                   color='#1f77b4', label='Episode Reward')
-            ax.axhline(475, color='green', linestyle='--', linewidth=2, 
-                      alpha=0.7, label='Solved Threshold')
-            ax.fill_between(history_df['episode'], 0, history_df['reward'], 
-                           where=(history_df['reward'] >= 475), 
-                           color='green', alpha=0.2)
-            ax.set_xlabel('Episode Number', fontweight='bold')
-            ax.set_ylabel('Total Reward', fontweight='bold')
-            ax.set_title('Your Episode Rewards Over Time', fontweight='bold', fontsize=14)
-            ax.legend()
-            ax.grid(True, alpha=0.3)
-
-            st.pyplot(fig)
-            plt.close()
+        # Best finished trial of the latest sweep on this environment (see run_sweep.py)
+        sweep_store = get_sweep_store()
+        env_sweeps = sweep_store.list_sweeps(env_name) if sweep_store is not None else []
+        best_trial = None
+        if env_sweeps:
+            finished = [t for t in sweep_store.trials(env_sweeps[0]['name']) if t['status'] == "complete"]
+            if finished:
+                best_trial = max(finished, key=lambda t: t['score'])
 
-        with col2:
-            st.subheader("Statistics")
-            st.metric("Episodes Run", len(history_df))
-            st.metric("Average Reward", f"{history_df['reward'].mean():.1f}")
-            st.metric("Best Reward", f"{history_df['reward'].max():.1f}")
-            st.metric("Success Rate", f"{(history_df['solved'].sum() / len(history_df) * 100):.1f}%")
-
-            st.markdown("---")
-
-            # Action distribution
-            total_left = history_df['left_actions'].sum()
-            total_right = history_df['right_actions'].sum()
-
-            fig, ax = plt.subplots(figsize=(5, 5))
-            colors = ['#FF6B6B', '#4ECDC4']
-            wedges, texts, autotexts = ax.pie(
-                [total_left, total_right], 
-                labels=['Left', 'Right'],
-                autopct='%1.1f%%',
-                colors=colors,
-                startangle=90,
-                textprops={'fontweight': 'bold'}
-            )
-            ax.set_title('Overall Action Distribution', fontweight='bold')
-            st.pyplot(fig)
-            plt.close()
-
-        # Show data table
-        st.subheader("Episode Details")
-        st.dataframe(history_df, use_container_width=True, hide_index=True)
-
-        # Download button
-        csv = history_df.to_csv(index=False)
-        st.download_button(
-            label="Download History as CSV",
-            data=csv,
-            file_name=f"ppo_agent_history_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
-    else:
-        st.info("Run some episodes in the Live Demo tab to see your history here!")
+        with col1:
+            st.subheader("Hyperparameter Schedules")
 
-with tab4:
-    st.header("Technical Analysis")
+            if best_trial is not None:
+                config = best_trial['config']
+                st.code(f"""
+Learning Rate Schedule (Linear):
+  Start: {config['lr_start']:g}
+  End:   {config['lr_end']:g}
 
-    col1, col2 = st.columns(2)
+Epsilon Schedule (Linear):
+  Start: {config['clip_start']:g}
+  End:   {config['clip_end']:g}
 
-    with col1:
-        st.subheader("Hyperparameter Schedules")
+Entropy Coefficient (Exponential):
+  Start: {config['entropy_start']:g}
+  End:   {config['entropy_end']:g}
 
-        st.code("""
+Hidden dim: {config['hidden_dim']}, gamma {config['gamma']:g}, GAE lambda {config['gae_lambda']:g}
+                """, language="python")
+                st.caption(f"Best trial #{best_trial['trial_id']} of sweep `{env_sweeps[0]['name']}` "
+                           f"(score {best_trial['score']:.1f})")
+            else:
+                st.code("""
 Learning Rate Schedule (Linear):
   Start: 3e-4 (exploration)
   End:   0.0 (fine-tuning)
@@ -464,12 +699,13 @@ Entropy Coefficient (Exponential):
   Start: 0.01 (exploration)
   End:   0.001 (exploitation)
   Type:  Exponential decay
-        """, language="python")
+                """, language="python")
+                st.caption("Documented schedules; run `python run_sweep.py` to reproduce the search")
 
-    with col2:
-        st.subheader("Network Architecture")
+        with col2:
+            st.subheader("Network Architecture")
 
-        st.code("""
+            st.code("""
 CartPole Network:
   Input:    4 (state dim)
   Hidden1:  128 neurons (ReLU)
@@ -484,100 +720,137 @@ CartPole Network:
     - Gamma: 0.99
     - GAE Lambda: 0.95
     - Epochs: 5 per batch
-        """, language="python")
+            """, language="python")
 
-    st.markdown("---")
+        st.markdown("---")
 
-    st.subheader("Key Findings")
+        st.subheader("Hyperparameter Sweeps")
+        if not env_sweeps:
+            st.info(f"No sweeps for {env_name} yet. Run `python run_sweep.py --env {env_name}` to start one; "
+                    "results appear here while it runs.")
+        else:
+            import pandas as pd
 
-    col1, col2 = st.columns(2)
+            sweep_name = st.selectbox("Sweep", [sw['name'] for sw in env_sweeps])
+            trials = sweep_store.trials(sweep_name)
+            statuses = pd.Series([t['status'] for t in trials]).value_counts()
+            sweep_cols = st.columns(4)
+            for col, status in zip(sweep_cols, ("complete", "pruned", "running", "pending")):
+                col.metric(status.capitalize(), int(statuses.get(status, 0)))
 
-    with col1:
-        st.success("""
-        **Performance**
-        - Expert-level: 475±25
-        - 95% success rate
-        - Lowest variance (CV=5.2%)
-        - 5x sample efficiency
-        """)
+            trials_df = pd.DataFrame([
+                dict(t['params'], trial=t['trial_id'], status=t['status'], score=t['score'],
+                     train_return=t['train_return'], steps=t['steps'], steps_per_sec=t['steps_per_sec'])
+                for t in trials
+            ]).sort_values('score', ascending=False, na_position='last')
+            st.dataframe(trials_df, width="stretch", hide_index=True)
 
-    with col2:
-        st.info("""
-        **Transfer Learning**
-        - Optimized on LunarLander
-        - Transferred to CartPole
-        - +137% improvement
-        - Environment-agnostic
-        """)
+            progress_df = pd.DataFrame(sweep_store.progress(sweep_name), columns=['trial', 'steps', 'mean_return'])
+            if not progress_df.empty:
+                curves = progress_df.pivot_table(index='steps', columns='trial', values='mean_return')
+                st.line_chart(curves.ffill())
+                st.caption("Recent mean training return per trial; pruned trials stop early")
+
+        st.markdown("---")
+
+        st.subheader("Key Findings")
+
+        col1, col2 = st.columns(2)
+
+        with col1:
+            # Measured on the served checkpoint, the same numbers as the Performance tab
+            if eval_stats is not None:
+                st.success(f"""
+                **Performance ({spec.label})**
+                - Mean reward: {eval_stats['mean_reward']:.0f}±{eval_stats['std_reward']:.0f}
+                - {eval_stats['success_rate'] * 100:.0f}% success rate
+                - CV={eval_stats['cv'] * 100:.1f}%
+                - Over {eval_stats['episodes']} seeded deterministic episodes
+                """)
+            else:
+                st.info(f"""
+                **Performance ({spec.label})**
+                - Evaluation of the current checkpoint pending
+                """)
+
+        with col2:
+            st.info("""
+            **Transfer Learning**
+            - Optimized on LunarLander
+            - Transferred to CartPole
+            - +137% improvement
+            - Environment-agnostic
+            """)
 
 with tab5:
-    st.header("About This Project")
+    if tab5.open:
+        st.header("About This Project")
 
-    st.markdown("""
-    ## Week 12: Autonomous RL Agent
+        st.markdown("""
+        ## Week 12: Autonomous RL Agent
 
-    This interactive demo showcases the results of **Week 12** of my **168-day ML Learning Journey**.
+        This interactive demo showcases the results of **Week 12** of my **168-day ML Learning Journey**.
 
-    ### Achievements
+        ### Achievements
 
-    - Implemented 3 algorithms: REINFORCE, A2C, PPO
-    - Optimized PPO: Dynamic hyperparameter schedules (+25% performance)
-    - Rigorous testing: 100+ episodes with statistical validation
-    - Expert performance: 475±25 on CartPole (95% success rate)
-    - Transfer learning: Validated across environments (+137% improvement)
-    - Research paper: ~6,500 word technical analysis
+        - Implemented 3 algorithms: REINFORCE, A2C, PPO
+        - Optimized PPO: Dynamic hyperparameter schedules (+25% performance)
+        - Rigorous testing: 100+ episodes with statistical validation
+        - Seeded evaluation of the served checkpoint (results in the Performance tab)
+        - Transfer learning: Validated across environments (+137% improvement)
+        - Research paper: ~6,500 word technical analysis
 
-    ### What I Learned
+        ### What I Learned
 
-    **Technical Skills:**
-    - Deep Reinforcement Learning (PPO, A2C, REINFORCE)
-    - PyTorch implementation from scratch
-    - Hyperparameter optimization strategies
-    - Statistical testing and validation
-    - Transfer learning techniques
+        **Technical Skills:**
+        - Deep Reinforcement Learning (PPO, A2C, REINFORCE)
+        - PyTorch implementation from scratch
+        - Hyperparameter optimization strategies
+        - Statistical testing and validation
+        - Transfer learning techniques
 
-    **Professional Skills:**
-    - Research methodology
-    - Technical writing
-    - Data visualization
-    - Software engineering
-    - Portfolio development
+        **Professional Skills:**
+        - Research methodology
+        - Technical writing
+        - Data visualization
+        - Software engineering
+        - Portfolio development
 
-    ### Week 12 Timeline
+        ### Week 12 Timeline
 
-    - **Day 78**: PPO Optimization (3000 episodes, hyperparameter schedules)
-    - **Day 79**: Transfer Learning (CartPole validation)
-    - **Day 80**: Extensive Testing (100+ episodes, statistical analysis)
-    - **Day 81**: Research Paper (~6,500 words, publication-quality)
-    - **Day 82**: Interactive Demo (this app!)
-    - **Day 83**: Deployment & Videos (coming soon)
-    - **Day 84**: Blog Post & Final Polish (coming soon)
+        - **Day 78**: PPO Optimization (3000 episodes, hyperparameter schedules)
+        - **Day 79**: Transfer Learning (CartPole validation)
+        - **Day 80**: Extensive Testing (100+ episodes, statistical analysis)
+        - **Day 81**: Research Paper (~6,500 words, publication-quality)
+        - **Day 82**: Interactive Demo (this app!)
+        - **Day 83**: Deployment & Videos (coming soon)
+        - **Day 84**: Blog Post & Final Polish (coming soon)
 
-    ### Resources
+        ### Resources
 
-    - Research Paper: `../results/day81/COMPLETE_RESEARCH_PAPER.txt`
-    - Training Code: `../day_78_ppo_optimization.ipynb`
-    - Testing Results: `../day_80_extensive_testing.ipynb`
+        - Research Paper: `../results/day81/COMPLETE_RESEARCH_PAPER.txt`
+        - Training Code: `../day_78_ppo_optimization.ipynb`
+        - Testing Results: `../day_80_extensive_testing.ipynb`
 
-    ### Author
+        ### Author
 
-    **Audrey**  
-    3rd Year Computer Science Student  
-    Lyceum of the Philippines University - Laguna  
-    Specialization: Game Development & AI
+        **Audrey**  
+        3rd Year Computer Science Student  
+        Lyceum of the Philippines University - Laguna  
+        Specialization: Game Development & AI
 
-    **Target**: Aerospace AI/ML Internship (Summer 2026)
+        **Target**: Aerospace AI/ML Internship (Summer 2026)
 
-    ---
+        ---
 
-    ### Progress
+        ### Progress
 
-    - **Day**: 82/168 (48.8%)
-    - **Week**: 12/24
-    - **Weeks Completed**: 11/24
+        - **Day**: 82/168 (48.8%)
+        - **Week**: 12/24
+        - **Weeks Completed**: 11/24
 
-    *Part of my journey to master Machine Learning and AI for aerospace applications*
-    """)
+        *Part of my journey to master Machine Learning and AI for aerospace applications*
+        """)
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Inference Microbenchmark
+Per-step latency of PPONetwork.get_action vs the batched act_batch path,
+and get_action throughput under concurrent callers with and without
+micro-batching
+"""
+
+import argparse
+import threading
+import time
+
+import numpy as np
+
+from ppo_network import PPONetwork
+from microbatch import MicroBatchPolicy
+import serving_config
+
+
+def time_per_call(fn, iters, warmup=50):
+    """Average seconds per call of fn()"""
+    for _ in range(warmup):
+        fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) / iters
+
+
+def bench_get_action(model, state_dim, deterministic, iters):
+    """Latency of the original single-state get_action"""
+    state = np.random.randn(state_dim).astype(np.float32)
+    return time_per_call(lambda: model.get_action(state, deterministic=deterministic), iters)
+
+
+def bench_act_batch(model, state_dim, action_dim, batch_size, deterministic, iters):
+    """Latency of act_batch with preallocated buffers"""
+    obs = np.random.randn(batch_size, state_dim).astype(np.float32)
+    actions = np.empty(batch_size, dtype=np.int64)
+    probs = np.empty((batch_size, action_dim), dtype=np.float32)
+    values = np.empty(batch_size, dtype=np.float32)
+    return time_per_call(
+        lambda: model.act_batch(obs, actions, probs, values, deterministic=deterministic), iters
+    )
+
+
+def bench_concurrent(policy, state_dim, threads, calls):
+    """Aggregate calls/sec and per-call latency percentiles of `threads` concurrent callers"""
+    latencies = np.zeros((threads, calls))
+    barrier = threading.Barrier(threads + 1)
+
+    def caller(i):
+        state = np.random.randn(state_dim).astype(np.float32)
+        barrier.wait()
+        for j in range(calls):
+            start = time.perf_counter()
+            policy.get_action(state, deterministic=True)
+            latencies[i, j] = time.perf_counter() - start
+
+    workers = [threading.Thread(target=caller, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1e6
+    return threads * calls / elapsed, p50, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PPONetwork inference microbenchmark")
+    parser.add_argument("--state-dim", type=int, default=4)
+    parser.add_argument("--action-dim", type=int, default=2)
+    parser.add_argument("--hidden-dim", type=int, default=128)
+    parser.add_argument("--iters", type=int, default=2000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 256])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16],
+                        help="Concurrent caller counts for the serving comparison")
+    args = parser.parse_args()
+
+    # Thread counts and inference mode come from the PPO_* serving variables
+    serving_config.configure_torch()
+    model = PPONetwork(args.state_dim, args.action_dim, args.hidden_dim)
+    model.eval()
+    model.grad_context = serving_config.grad_context()
+    print(f"Serving settings: {serving_config.serving_settings()}")
+
+    print(f"{'path':<12s} {'mode':<14s} {'B':>5s} {'us/call':>10s} {'us/state':>10s}")
+    for deterministic in (True, False):
+        mode = "deterministic" if deterministic else "stochastic"
+
+        t = bench_get_action(model, args.state_dim, deterministic, args.iters)
+        print(f"{'get_action':<12s} {mode:<14s} {1:>5d} {t * 1e6:>10.1f} {t * 1e6:>10.2f}")
+
+        for batch_size in args.batch_sizes:
+            t = bench_act_batch(model, args.state_dim, args.action_dim, batch_size,
+                                deterministic, args.iters)
+            print(f"{'act_batch':<12s} {mode:<14s} {batch_size:>5d} {t * 1e6:>10.1f} "
+                  f"{t * 1e6 / batch_size:>10.2f}")
+
+    calls = max(50, args.iters // 4)
+    batcher = MicroBatchPolicy(model, serving_config.MICROBATCH_WINDOW_MS, serving_config.MICROBATCH_MAX)
+    print(f"\n{'path':<12s} {'threads':>7s} {'calls/s':>10s} {'p50 us':>10s} {'p99 us':>10s} {'batch':>6s}")
+    for threads in args.threads:
+        for name, policy in (("direct", model), ("microbatch", batcher)):
+            batcher.batches = batcher.requests = 0
+            rate, p50, p99 = bench_concurrent(policy, args.state_dim, threads, calls)
+            batch = f"{batcher.mean_batch_size:.1f}" if policy is batcher else "-"
+            print(f"{name:<12s} {threads:>7d} {rate:>10.0f} {p50:>10.1f} {p99:>10.1f} {batch:>6s}")
+
+
+if __name__ == "__main__":
+    main()
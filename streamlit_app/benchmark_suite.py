@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Benchmark Suite
+Policy latency/throughput, checkpoint loading and episode pipeline timings,
+saved as JSON baselines and compared against them with a tolerance
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+
+import numpy as np
+
+from env_specs import APP_DIR, ENV_SPECS, get_spec
+from profiler import library_versions
+from serving_config import serving_settings
+
+DEFAULT_BASELINE = os.path.join(APP_DIR, "benchmarks", "baseline.json")
+
+# Run settings that must match the baseline's for timings to be comparable
+CONFIG_KEYS = ('env_name', 'env_steps', 'serving')
+BATCH_SIZES = [1, 4, 16, 64, 256, 1024]
+
+
+def median_time(fn, repeats, number=1, warmup=1):
+    """Median seconds per call of fn() over `repeats` timings of `number` calls"""
+    for _ in range(warmup):
+        fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+    return float(np.median(times))
+
+
+def metric(value, unit, better):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def bench_policy(model, spec, repeats):
+    """get_action latency, act_batch latency per batch size and forward throughput"""
+    import torch
+
+    results = {}
+    state = np.random.randn(spec.state_dim).astype(np.float32)
+    t = median_time(lambda: model.get_action(state, deterministic=True), repeats, number=200, warmup=50)
+    results['get_action_us'] = metric(t * 1e6, "us", "lower")
+
+    for batch_size in BATCH_SIZES:
+        obs = np.random.randn(batch_size, spec.state_dim).astype(np.float32)
+        actions = np.empty(batch_size, dtype=np.int64)
+        probs = np.empty((batch_size, spec.action_dim), dtype=np.float32)
+        values = np.empty(batch_size, dtype=np.float32)
+        number = max(10, 2000 // batch_size)
+        t = median_time(lambda: model.act_batch(obs, actions, probs, values, deterministic=True),
+                        repeats, number=number, warmup=10)
+        results[f'act_batch_b{batch_size}_us'] = metric(t * 1e6, "us", "lower")
+
+    # Forward pass of the network itself, also when it is wrapped by a MicroBatchPolicy
+    network = getattr(model, "policy", model)
+    obs = torch.randn(1024, spec.state_dim)
+    with torch.inference_mode():
+        t = median_time(lambda: network(obs), repeats, number=20, warmup=5)
+    results['forward_states_per_sec'] = metric(1024 / t, "states/s", "higher")
+    return results
+
+
+def bench_checkpoint_load(env_name, repeats):
+    """Cold checkpoint load bypassing the model cache: header only, and header plus weights"""
+    from ppo_network import PPONetwork
+    from checkpoint_format import read_header, load_state_dict
+
+    spec = get_spec(env_name)
+
+    def load():
+        model = PPONetwork(**spec.model_config)
+        model.load_state_dict(load_state_dict(spec.checkpoint, mmap=False))
+
+    return {
+        'checkpoint_header_ms': metric(median_time(lambda: read_header(spec.checkpoint), repeats) * 1000,
+                                       "ms", "lower"),
+        'checkpoint_load_ms': metric(median_time(load, repeats) * 1000, "ms", "lower"),
+    }
+
+
+def bench_env_steps(env_name, steps):
+    """Raw environment steps/sec with pre-drawn random actions"""
+    import gymnasium as gym
+
+    env = gym.make(env_name)
+    actions = np.random.default_rng(0).integers(0, env.action_space.n, size=steps)
+    env.reset(seed=0)
+    start = time.perf_counter()
+    for action in actions:
+        _, _, terminated, truncated, _ = env.step(int(action))
+        if terminated or truncated:
+            env.reset()
+    elapsed = time.perf_counter() - start
+    env.close()
+    return {'env_steps_per_sec': metric(steps / elapsed, "steps/s", "higher")}
+
+
+def run_episode(model, env, seed, render):
+    """One seeded deterministic episode; returns (steps, seconds)"""
+    state, _ = env.reset(seed=seed)
+    steps = 0
+    done = False
+    start = time.perf_counter()
+    while not done:
+        action, _, _ = model.get_action(state, deterministic=True)
+        state, _, terminated, truncated, _ = env.step(action)
+        done = terminated or truncated
+        if render:
+            env.render()
+        steps += 1
+    return steps, time.perf_counter() - start
+
+
+def bench_episode(model, env_name, repeats):
+    """Wall time of the same seeded episode with and without rendering every step"""
+    import gymnasium as gym
+
+    results = {}
+    for render in (False, True):
+        env = gym.make(env_name, render_mode="rgb_array" if render else None)
+        times = [run_episode(model, env, 0, render)[1] for _ in range(repeats)]
+        env.close()
+        name = 'episode_rendered_s' if render else 'episode_headless_s'
+        results[name] = metric(float(np.median(times)), "s", "lower")
+    return results
+
+
+def run_suite(env_name, repeats, env_steps):
+    from model_registry import get_model
+
+    # Torch threading follows the PPO_* serving variables (see serving_config.py)
+    spec = get_spec(env_name)
+    model, loaded = get_model(env_name)
+    if not loaded:
+        print(f"⚠️  No checkpoint at {spec.checkpoint}; timing random weights")
+
+    metrics = {}
+    for name, bench in [
+        ("policy", lambda: bench_policy(model, spec, repeats)),
+        ("checkpoint load", lambda: bench_checkpoint_load(env_name, repeats) if loaded else {}),
+        ("env steps", lambda: bench_env_steps(env_name, env_steps)),
+        ("episodes", lambda: bench_episode(model, env_name, max(1, repeats // 2))),
+    ]:
+        print(f"🚀 {name}...")
+        metrics.update(bench())
+
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1024 / (1024 if sys.platform == "darwin" else 1)
+    metrics['peak_rss_mb'] = metric(peak_mb, "MB", "lower")
+
+    return {
+        'meta': {
+            'env_name': env_name,
+            'env_steps': env_steps,
+            'repeats': repeats,
+            'time': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpu_count': os.cpu_count(),
+            'versions': library_versions(),
+            'serving': serving_settings(),
+        },
+        'metrics': metrics,
+    }
+
+
+def config_mismatches(results, baseline):
+    """Run settings in CONFIG_KEYS that differ from the baseline's, as (key, baseline, current)"""
+    return [(key, baseline['meta'].get(key), results['meta'].get(key)) for key in CONFIG_KEYS
+            if baseline['meta'].get(key) != results['meta'].get(key)]
+
+
+def compare(results, baseline, tolerance, overrides):
+    """Print each metric against the baseline; return the names that regressed or are missing from this run"""
+    regressions = []
+    print(f"\n{'metric':<26s} {'baseline':>12s} {'current':>12s} {'change':>9s}")
+    for name, current in results['metrics'].items():
+        base = baseline['metrics'].get(name)
+        if base is None:
+            print(f"{name:<26s} {'-':>12s} {current['value']:>12.2f}   (new)")
+            continue
+
+        change = (current['value'] - base['value']) / base['value']
+        # Positive `worse` means slower / bigger, whichever direction is bad for the metric
+        worse = change if current['better'] == "lower" else -change
+        allowed = overrides.get(name, tolerance)
+        status = "❌" if worse > allowed else "✅"
+        if worse > allowed:
+            regressions.append(name)
+        print(f"{name:<26s} {base['value']:>12.2f} {current['value']:>12.2f} {change * 100:>+8.1f}% "
+              f"{status} {current['unit']}")
+
+    # A metric that stopped being measured must not pass silently
+    for name, base in baseline['metrics'].items():
+        if name not in results['metrics']:
+            print(f"{name:<26s} {base['value']:>12.2f} {'-':>12s}   (missing) ❌")
+            regressions.append(name)
+    return regressions
+
+
+def parse_overrides(items):
+    overrides = {}
+    for item in items:
+        name, _, value = item.partition("=")
+        overrides[name] = float(value)
+    return overrides
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Policy and episode pipeline benchmark suite")
+    parser.add_argument("--env", default="CartPole-v1", choices=sorted(ENV_SPECS))
+    parser.add_argument("--repeats", type=int, default=7, help="Timings per metric (median is kept)")
+    parser.add_argument("--env-steps", type=int, default=20000)
+    parser.add_argument("--out", default=None, help="Write this run's results as JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results to --baseline")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--check", action="store_true",
+                        help="Fail when there is no baseline to compare against (for CI)")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="Allowed relative slowdown before a metric fails (0.15 = 15%%)")
+    parser.add_argument("--tolerance-for", nargs="*", default=[], metavar="METRIC=TOL",
+                        help="Per-metric tolerance overrides, e.g. peak_rss_mb=0.05")
+    args = parser.parse_args()
+
+    results = run_suite(args.env, args.repeats, args.env_steps)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"📊 Results written to {args.out}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Baseline saved to {args.baseline}")
+        return 0
+
+    # Timings are machine-specific, so each host records its own baseline
+    if not os.path.exists(args.baseline):
+        for name, m in results['metrics'].items():
+            print(f"{name:<26s} {m['value']:>12.2f} {m['unit']}")
+        if args.check:
+            print(f"❌ No baseline at {args.baseline}; record one on this host with --save-baseline")
+            return 1
+        print(f"⚠️  No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, "r") as f:
+        baseline = json.load(f)
+    mismatches = config_mismatches(results, baseline)
+    if mismatches:
+        for key, recorded, current in mismatches:
+            print(f"❌ Baseline {key} is {recorded}, this run has {current}")
+        print(f"❌ Not comparable with {args.baseline}; rerun with matching settings or re-record it with "
+              "--save-baseline")
+        return 1
+
+    regressions = compare(results, baseline, args.tolerance, parse_overrides(args.tolerance_for))
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed beyond tolerance or missing: {', '.join(regressions)}")
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+
+import numpy as np
+
+# File layout:
+#   magic (8 bytes) | format version (uint32) | header length (uint32) | header JSON | padding |
+#   payload: raw little-endian tensors, each starting on an ALIGN-byte boundary
+MAGIC = b"PPOCKPT\x00"
+FORMAT_VERSION = 1
+CHECKPOINT_SUFFIX = ".ppo"
+ALIGN = 64
+_PREAMBLE = struct.Struct("<8sII")
+
+DTYPES = ("float32", "float16")
+
+
+class CheckpointError(ValueError):
+    """Not a checkpoint in this format, an unsupported version, or a corrupt payload"""
+
+
+def _aligned(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def is_checkpoint(path):
+    """True if the file starts with the format's magic bytes"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def save_checkpoint(path, state_dict, env_id, architecture, training=None, dtype="float32"):
+    """
+    Write a state_dict (tensors or arrays) with its architecture, environment
+    id and training stats. The file is written to a temporary name and
+    renamed, so readers never see a partial checkpoint.
+    """
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported checkpoint dtype: {dtype}")
+
+    arrays = {}
+    for name, tensor in state_dict.items():
+        array = tensor.detach().cpu().numpy() if hasattr(tensor, "detach") else np.asarray(tensor)
+        arrays[name] = np.ascontiguousarray(array, dtype=np.dtype(dtype).newbyteorder("<"))
+
+    tensors = {}
+    offset = 0
+    digest = hashlib.sha256()
+    for name, array in arrays.items():
+        tensors[name] = {'dtype': dtype, 'shape': list(array.shape), 'offset': offset, 'nbytes': array.nbytes}
+        digest.update(array.tobytes())
+        offset = _aligned(offset + array.nbytes)
+
+    header = {
+        'format_version': FORMAT_VERSION,
+        'env_id': env_id,
+        'architecture': dict(architecture),
+        'dtype': dtype,
+        'num_params': int(sum(a.size for a in arrays.values())),
+        'payload_sha256': digest.hexdigest(),
+        'payload_nbytes': offset,
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'training': training or {},
+        'tensors': tensors,
+    }
+    header_bytes = json.dumps(header, indent=1).encode("utf-8")
+    payload_offset = _aligned(_PREAMBLE.size + len(header_bytes))
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\x00" * (payload_offset - _PREAMBLE.size - len(header_bytes)))
+        for name, array in arrays.items():
+            f.seek(payload_offset + tensors[name]['offset'])
+            f.write(array.tobytes())
+        f.truncate(payload_offset + offset)
+    os.replace(tmp_path, path)
+    return header
+
+
+def read_header(path):
+    """Header of a checkpoint, reading only the bytes before the payload"""
+    with open(path, "rb") as f:
+        preamble = f.read(_PREAMBLE.size)
+        if len(preamble) < _PREAMBLE.size:
+            raise CheckpointError(f"Not a PPO checkpoint: {path}")
+        magic, version, header_len = _PREAMBLE.unpack(preamble)
+        if magic != MAGIC:
+            raise CheckpointError(f"Not a PPO checkpoint: {path}")
+        if version > FORMAT_VERSION:
+            raise CheckpointError(f"Checkpoint format {version} is newer than supported ({FORMAT_VERSION})")
+        header = json.loads(f.read(header_len).decode("utf-8"))
+    header['payload_offset'] = _aligned(_PREAMBLE.size + header_len)
+    return header
+
+
+def load_arrays(path, header=None, mmap=True):
+    """
+    Weights as NumPy arrays. With `mmap` they are copy-on-write views of the
+    file: nothing is read until a weight is first used, and pages are shared
+    between processes serving the same checkpoint.
+    """
+    header = header or read_header(path)
+    offset = header['payload_offset']
+    if mmap:
+        if header['payload_nbytes'] == 0:
+            payload = np.zeros(0, dtype=np.uint8)
+        else:
+            payload = np.memmap(path, dtype=np.uint8, mode="c", offset=offset, shape=(header['payload_nbytes'],))
+    else:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            payload = np.frombuffer(bytearray(f.read(header['payload_nbytes'])), dtype=np.uint8)
+
+    arrays = {}
+    for name, info in header['tensors'].items():
+        dtype = np.dtype(info['dtype']).newbyteorder("<")
+        raw = payload[info['offset']:info['offset'] + info['nbytes']]
+        arrays[name] = raw.view(dtype).reshape(info['shape'])
+    return arrays
+
+
+def verify(path, header=None):
+    """Recompute the payload hash; raises CheckpointError on a mismatch"""
+    header = header or read_header(path)
+    digest = hashlib.sha256()
+    for array in load_arrays(path, header, mmap=True).values():
+        digest.update(array.tobytes())
+    if digest.hexdigest() != header['payload_sha256']:
+        raise CheckpointError(f"Payload hash mismatch in {path}")
+    return header
+
+
+def load_state_dict(path, mmap=True):
+    """
+    state_dict of a checkpoint in this format, or of a legacy torch.save file.
+    Tensors of the new format share memory with the (mapped) file.
+    """
+    import torch
+
+    if not is_checkpoint(path):
+        return torch.load(path, map_location="cpu")
+    return {name: torch.from_numpy(array) for name, array in load_arrays(path, mmap=mmap).items()}
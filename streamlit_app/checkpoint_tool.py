@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Tool
+Converts torch.save state_dicts to the versioned .ppo checkpoint format and
+inspects or verifies .ppo files
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from env_specs import ENV_SPECS, get_spec
+from checkpoint_format import (CheckpointError, DTYPES, is_checkpoint, read_header, save_checkpoint,
+                               verify, load_arrays)
+
+
+def convert(args):
+    import torch
+
+    if is_checkpoint(args.source):
+        print(f"❌ {args.source} is already a .ppo checkpoint")
+        return 1
+    spec = get_spec(args.env)
+    state_dict = torch.load(args.source, map_location="cpu")
+    shapes = {name: tuple(t.shape) for name, t in state_dict.items()}
+    if shapes.get("shared_fc1.weight") != (spec.hidden_dim, spec.state_dim):
+        print(f"❌ {args.source} does not match the {args.env} architecture {spec.model_config}")
+        return 1
+
+    training = json.loads(args.training) if args.training else {}
+    training.setdefault('converted_from', os.path.basename(args.source))
+    header = save_checkpoint(args.out, state_dict, args.env, spec.model_config, training=training, dtype=args.dtype)
+    print(f"✅ {args.out}: {header['num_params']:,} params, sha256 {header['payload_sha256'][:16]}...")
+    return 0
+
+
+def inspect(args):
+    start = time.perf_counter()
+    header = read_header(args.path)
+    elapsed = time.perf_counter() - start
+    tensors = header.pop('tensors')
+    print(json.dumps(header, indent=2))
+    for name, info in tensors.items():
+        print(f"   {name:<20s} {info['dtype']:<8s} {str(tuple(info['shape'])):<12s} @ {info['offset']}")
+    print(f"📊 Header read in {elapsed * 1e3:.2f} ms without touching the "
+          f"{header['payload_nbytes']:,}-byte payload")
+    return 0
+
+
+def verify_cmd(args):
+    failed = 0
+    for path in args.paths:
+        try:
+            header = verify(path)
+            load_arrays(path, header)
+            print(f"✅ {path}: {header['env_id']}, sha256 {header['payload_sha256'][:16]}...")
+        except (CheckpointError, OSError) as e:
+            print(f"❌ {path}: {e}")
+            failed += 1
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert, inspect and verify PPO checkpoints")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("convert", help="torch.save state_dict -> .ppo")
+    p.add_argument("source")
+    p.add_argument("out")
+    p.add_argument("--env", required=True, choices=sorted(ENV_SPECS))
+    p.add_argument("--dtype", default="float32", choices=DTYPES)
+    p.add_argument("--training", default=None, help="JSON object of training stats to embed")
+    p.set_defaults(func=convert)
+
+    p = sub.add_parser("inspect", help="Print the header only")
+    p.add_argument("path")
+    p.set_defaults(func=inspect)
+
+    p = sub.add_parser("verify", help="Recompute payload hashes")
+    p.add_argument("paths", nargs="+")
+    p.set_defaults(func=verify_cmd)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
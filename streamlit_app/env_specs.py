@@ -0,0 +1,71 @@
+import os
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+MODELS_DIR = os.path.normpath(os.path.join(APP_DIR, "..", "models"))
+
+
+class EnvSpec:
+    """Everything the app needs to know about one environment and its model"""
+
+    def __init__(self, env_id, label, state_dim, action_dim, hidden_dim, max_steps,
+                 solved_threshold, good_threshold, action_labels, checkpoint, history_actions=(0, 1)):
+        self.env_id = env_id
+        self.label = label
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+        self.hidden_dim = hidden_dim
+        self.max_steps = max_steps
+        self.solved_threshold = solved_threshold
+        self.good_threshold = good_threshold
+        self.action_labels = action_labels
+        self.checkpoint = checkpoint
+        # Actions counted in the History tab's left/right columns
+        self.history_actions = history_actions
+
+    @property
+    def model_config(self):
+        """PPONetwork constructor arguments"""
+        return {"state_dim": self.state_dim, "action_dim": self.action_dim, "hidden_dim": self.hidden_dim}
+
+    @property
+    def num_params(self):
+        """Parameter count of the PPONetwork for this environment"""
+        h = self.hidden_dim
+        return (self.state_dim + 1) * h + (h + 1) * h + (h + 1) * self.action_dim + (h + 1)
+
+
+ENV_SPECS = {
+    "CartPole-v1": EnvSpec(
+        env_id="CartPole-v1",
+        label="CartPole",
+        state_dim=4,
+        action_dim=2,
+        hidden_dim=128,
+        max_steps=500,
+        solved_threshold=475,
+        good_threshold=200,
+        action_labels=["Left", "Right"],
+        checkpoint=os.path.join(MODELS_DIR, "cartpole_best.ppo"),
+    ),
+    "LunarLander-v3": EnvSpec(
+        env_id="LunarLander-v3",
+        label="LunarLander",
+        state_dim=8,
+        action_dim=4,
+        hidden_dim=256,
+        max_steps=1000,
+        solved_threshold=200,
+        good_threshold=100,
+        action_labels=["Noop", "Left Engine", "Main Engine", "Right Engine"],
+        checkpoint=os.path.join(MODELS_DIR, "lunarlander_best.ppo"),
+        history_actions=(1, 3),
+    ),
+}
+
+
+def get_spec(env_name):
+    """Spec of a registered environment"""
+    try:
+        return ENV_SPECS[env_name]
+    except KeyError:
+        raise ValueError(f"Unknown environment: {env_name}")
@@ -0,0 +1,390 @@
+import os
+import queue
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+from model_registry import get_model, served_checkpoint, checkpoint_hash
+from evaluator import evaluate
+from frame_pipeline import FramePipeline
+from episode_stats import EpisodeAccumulator
+from env_specs import get_spec
+from trajectory_store import (TrajectoryRecorder, Trajectory, STATE_RENDERABLE, new_trajectory_path,
+                              prune_trajectories, render_state)
+from result_cache import ResultCache
+from profiler import StageProfiler, append_profile_log
+from serving_config import serving_settings
+from video_export import VIDEO_DIR, VideoExporter, new_video_path, prune_videos
+
+# Worker threads shared by every session, overridable per deployment
+DEFAULT_WORKERS = int(os.environ.get("PPO_RUNNER_WORKERS", "4"))
+
+
+class RunJob:
+    """Parameters of one episode run"""
+
+    def __init__(self, env_name, num_episodes=1, deterministic=True, seed=None,
+                 backend="torch", precision="fp32", headless=False, display_fps=15, realtime=True,
+                 max_steps=None, solved_threshold=None, record_dir=None, use_cache=False,
+                 profile_log=None, export_format=None, export_fps=None, export_dir=None):
+        # Episode limits default to the environment's spec
+        spec = get_spec(env_name)
+        self.env_name = env_name
+        self.num_episodes = num_episodes
+        self.deterministic = deterministic
+        self.seed = seed
+        self.backend = backend
+        self.precision = precision
+        self.headless = headless
+        self.display_fps = display_fps
+        self.realtime = realtime
+        self.max_steps = max_steps or spec.max_steps
+        self.solved_threshold = spec.solved_threshold if solved_threshold is None else solved_threshold
+        # Rendered episodes are recorded for replay when set
+        self.record_dir = record_dir
+        # Serve seeded deterministic episodes from the ResultCache when possible
+        self.use_cache = use_cache
+        # Per-episode stage timings are appended to this JSON-lines file when set
+        self.profile_log = profile_log
+        # Rendered episodes are also encoded to a "gif"/"mp4" clip in export_dir when set;
+        # export_fps defaults to the environment's native FPS, independent of display_fps
+        self.export_format = export_format
+        self.export_fps = export_fps
+        self.export_dir = export_dir or VIDEO_DIR
+
+
+class RunHandle:
+    """
+    Handle on a submitted job, polled by the UI.
+
+    Progress and frame updates are coalesced (only the newest of each is
+    kept), so a UI that stops polling never makes the runner buffer more
+    than one frame. Episode results, completion and errors are queued and
+    never dropped.
+    """
+
+    def __init__(self, job):
+        self.job = job
+        self.records = []
+        self.cache_hits = 0
+        self.model_loaded = None
+        self.error = None
+        self.future = None
+
+        self._events = queue.Queue()
+        self._latest = {}
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._finished = threading.Event()
+
+    # Runner side
+
+    def update(self, kind, **data):
+        """Publish a coalesced update ("progress" or "frame")"""
+        with self._lock:
+            self._latest[kind] = dict(data, type=kind)
+
+    def emit(self, kind, **data):
+        """Publish an event that must reach the UI"""
+        self._events.put(dict(data, type=kind))
+
+    def finish(self):
+        self._finished.set()
+
+    # UI side
+
+    def poll(self):
+        """Return the newest progress/frame updates followed by all queued events"""
+        with self._lock:
+            events = list(self._latest.values())
+            self._latest.clear()
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def wait(self, timeout=None):
+        """Block until the job finishes; True if it did"""
+        return self._finished.wait(timeout)
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+
+class _JobCache:
+    """ResultCache lookups for one job's checkpoint and settings"""
+
+    def __init__(self, job, digest, cache=None):
+        self.job = job
+        self.digest = digest
+        self.cache = cache or ResultCache()
+
+    def get(self, seed):
+        return self.cache.get(self.digest, self.job.env_name, seed, self.job.deterministic, self.job.max_steps)
+
+    def put(self, seed, record, trajectory=None):
+        self.cache.put(self.digest, self.job.env_name, seed, self.job.deterministic, self.job.max_steps,
+                       record, trajectory)
+
+
+def _job_cache(job, handle):
+    """Cache for a job, or None if its episodes are not reproducible"""
+    if not (job.use_cache and job.deterministic and job.seed is not None and handle.model_loaded):
+        return None
+    digest = checkpoint_hash(served_checkpoint(job.env_name, job.backend, job.precision))
+    return _JobCache(job, digest) if digest else None
+
+
+def _run_headless(job, handle, model, cache=None):
+    """All episodes in one vectorized batch, no frames"""
+    handle.update("progress", episode=0, step=0, fraction=0.0, status="Evaluating headless")
+
+    entries = [cache.get(job.seed + i) for i in range(job.num_episodes)] if cache else []
+    if entries and all(entries):
+        records = [dict(entry['record'], episode=i + 1) for i, entry in enumerate(entries)]
+        handle.cache_hits = len(records)
+    else:
+        records = evaluate(model, job.env_name, job.num_episodes, deterministic=job.deterministic,
+                           seed=job.seed, max_steps=job.max_steps,
+                           solved_threshold=job.solved_threshold)
+        # Keep existing entries, which may point at a recording
+        for i, record in enumerate(records):
+            if cache and entries[i] is None:
+                cache.put(job.seed + i, record)
+
+    for record in records:
+        handle.records.append(record)
+        handle.emit("episode", record=record)
+
+
+def _serve_cached(job, handle, env, pipeline, entry, ep, publish_frame):
+    """Publish a cached episode: its final frame, final stats and record"""
+    record = dict(entry['record'], episode=ep + 1)
+    trajectory = Trajectory.load(entry['trajectory']) if entry['trajectory'] else None
+    caption = f"Episode {ep+1}/{job.num_episodes} - Step {record['length']} (cached)"
+
+    if trajectory is not None:
+        if job.env_name in STATE_RENDERABLE:
+            env.reset()
+            pipeline.submit(render_state(env, trajectory.obs[-1]), caption, record['length'])
+            pipeline.show(publish_frame, pipeline.flush())
+        else:
+            frame, _ = trajectory.keyframe(len(trajectory))
+            if frame is not None:
+                publish_frame(frame, caption)
+
+    action_counts = record.get('action_counts', [record['left_actions'], record['right_actions']])
+    final = trajectory.step_stats(len(trajectory)) if trajectory is not None else {}
+    handle.update(
+        "progress", episode=ep, done=True, fraction=(ep + 1) / job.num_episodes,
+        status=f"Episode {ep+1}/{job.num_episodes} served from cache",
+        step=record['length'], reward=record['reward'], action_counts=action_counts,
+        left=record['left_actions'], right=record['right_actions'],
+        probs=final.get('probs'), value=final.get('value'),
+        mean_value=record.get('mean_value'), mean_entropy=record.get('mean_entropy'),
+    )
+
+    handle.cache_hits += 1
+    handle.records.append(record)
+    handle.emit("episode", record=record, trace=trajectory.policy_trace() if trajectory else None,
+                trajectory=entry['trajectory'])
+
+
+def _run_rendered(job, handle, model, cache=None):
+    """Episodes one at a time, streaming frames at the display FPS"""
+    import gymnasium as gym
+
+    env = gym.make(job.env_name, render_mode="rgb_array")
+    profiler = StageProfiler()
+    pipeline = FramePipeline(display_fps=job.display_fps, profiler=profiler)
+    render_fps = env.metadata.get("render_fps", 50)
+    step_interval = 1.0 / render_fps if job.realtime else 0.0
+    # Clips are exported every `export_every` steps and play back at simulated real time
+    export_every = max(1, round(render_fps / (job.export_fps or render_fps)))
+    spec = get_spec(job.env_name)
+    stats = EpisodeAccumulator(spec.action_dim, record_trace=True, history_actions=spec.history_actions)
+    clock = time.perf_counter
+
+    def publish_frame(data, caption):
+        handle.update("frame", data=data, caption=caption)
+
+    def show(encoded=None):
+        start = clock()
+        if pipeline.show(publish_frame, encoded):
+            profiler.count('frames')
+        profiler.add("publish", clock() - start)
+
+    exporter = None
+    try:
+        for ep in range(job.num_episodes):
+            if handle.cancelled:
+                break
+
+            seed = None if job.seed is None else job.seed + ep
+            # Cached episodes have no frames to export, so exporting runs re-simulate them
+            entry = cache.get(seed) if cache and not job.export_format else None
+            if entry is not None:
+                _serve_cached(job, handle, env, pipeline, entry, ep, publish_frame)
+                continue
+
+            state, _ = env.reset(seed=seed)
+            recorder = None
+            if job.record_dir:
+                recorder = TrajectoryRecorder(job.env_name, seed, job.deterministic)
+                if recorder.keyframe_due(0):
+                    recorder.add_keyframe(0, pipeline.encode(env.render()))
+
+            if job.export_format:
+                exporter = VideoExporter(new_video_path(job.env_name, job.export_format, job.export_dir),
+                                         job.export_format, fps=render_fps / export_every)
+                exporter.submit(env.render())
+
+            stats.reset()
+            profiler.reset()
+            dropped_before = pipeline.frames_dropped
+            done = False
+            next_step_time = clock()
+
+            while not done and stats.length < job.max_steps and not handle.cancelled:
+                t0 = clock()
+                action, probs, value = model.get_action(state, deterministic=job.deterministic)
+                t1 = clock()
+
+                obs = state
+                state, reward, terminated, truncated, _ = env.step(action)
+                done = terminated or truncated
+                t2 = clock()
+
+                stats.step(action, reward, probs, value)
+                if recorder is not None:
+                    recorder.record(obs, action, probs, value, reward)
+                    if recorder.keyframe_due(stats.length, done):
+                        recorder.add_keyframe(stats.length, pipeline.encode(env.render()))
+                t3 = clock()
+                profiler.add("get_action", t1 - t0)
+                profiler.add("env_step", t2 - t1)
+                profiler.add("record", t3 - t2)
+
+                # One render serves both the clip and the display
+                export_due = exporter is not None and (stats.length % export_every == 0 or done)
+                display_due = pipeline.due() or done
+                frame = env.render() if export_due or display_due else None
+                t4 = clock()
+                if frame is not None:
+                    profiler.add("render", t4 - t3)
+                if export_due:
+                    # Blocks only when the encoder is max_queue frames behind
+                    exporter.submit(frame)
+                    profiler.add("export", clock() - t4)
+
+                # Publish at the display FPS, and on the last step
+                if display_due:
+                    pipeline.submit(frame, f"Episode {ep+1}/{job.num_episodes} - Step {stats.length}",
+                                    stats.length)
+                    handle.update(
+                        "progress", episode=ep, done=done,
+                        fraction=min((stats.length / job.max_steps + ep) / job.num_episodes, 1.0),
+                        status=f"Running episode {ep+1}/{job.num_episodes}...",
+                        **stats.snapshot()
+                    )
+
+                show()
+
+                # Real-time pacing: wait only for what is left of this step's budget
+                if step_interval:
+                    next_step_time += step_interval
+                    delay = next_step_time - clock()
+                    if delay > 0:
+                        start = clock()
+                        time.sleep(delay)
+                        profiler.add("sleep", clock() - start)
+                    else:
+                        next_step_time = clock()
+
+            if handle.cancelled:
+                break
+
+            video = None
+            if exporter is not None:
+                start = clock()
+                video = exporter.close()
+                exporter = None
+                profiler.add("export", clock() - start)
+                prune_videos(job.export_dir)
+
+            # Make sure the final frame of the episode is shown
+            show(pipeline.flush())
+
+            record = stats.finalize(ep + 1, job.solved_threshold)
+            handle.records.append(record)
+
+            trajectory = None
+            if recorder is not None:
+                recorder.finish(state)
+                trajectory = recorder.save(new_trajectory_path(job.env_name, job.record_dir))
+                prune_trajectories(job.record_dir)
+            if cache:
+                cache.put(seed, record, trajectory)
+
+            profiler.count('frames_dropped', pipeline.frames_dropped - dropped_before)
+            profile = profiler.summary(steps=stats.length)
+            if job.profile_log:
+                append_profile_log(dict(profile, kind="episode", env_name=job.env_name, backend=job.backend,
+                                        precision=job.precision, episode=ep + 1,
+                                        realtime=job.realtime, display_fps=job.display_fps,
+                                        serving=serving_settings()), job.profile_log)
+            handle.emit("episode", record=record, trace=stats.trace, trajectory=trajectory, profile=profile,
+                        video=video)
+    finally:
+        # A cancelled or failed episode leaves no partial clip behind
+        if exporter is not None:
+            exporter.discard()
+        env.close()
+        pipeline.close()
+
+
+def run_job(job, handle):
+    """Execute a job on the calling thread, reporting through its handle"""
+    try:
+        model, handle.model_loaded = get_model(job.env_name, backend=job.backend, precision=job.precision)
+        cache = _job_cache(job, handle)
+        if job.headless:
+            _run_headless(job, handle, model, cache)
+        else:
+            _run_rendered(job, handle, model, cache)
+
+        if handle.cancelled:
+            handle.emit("cancelled", records=list(handle.records))
+        else:
+            handle.emit("done", records=list(handle.records))
+    except Exception as e:
+        handle.error = e
+        handle.emit("error", message=str(e), details=traceback.format_exc())
+    finally:
+        handle.finish()
+
+
+class EpisodeRunner:
+    """Thread pool that runs episode jobs in the background, shared by all sessions"""
+
+    def __init__(self, max_workers=DEFAULT_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="episode-runner")
+
+    def submit(self, job):
+        """Queue a job and return its handle"""
+        handle = RunHandle(job)
+        handle.future = self.executor.submit(run_job, job, handle)
+        return handle
+
+    def shutdown(self, cancel_futures=True):
+        self.executor.shutdown(wait=False, cancel_futures=cancel_futures)
@@ -0,0 +1,186 @@
+import numpy as np
+
+
+def _entropy(probs):
+    """Entropy of the last axis of a probability array"""
+    probs = np.asarray(probs, dtype=np.float64)
+    return -np.sum(probs * np.log(np.clip(probs, 1e-12, None)), axis=-1)
+
+
+def make_record(episode, reward, length, action_counts, solved_threshold,
+                mean_value=None, mean_entropy=None, history_actions=(0, 1)):
+    """
+    Per-episode record in the History tab format.
+
+    `history_actions` are the action indices reported as left/right
+    (see EnvSpec.history_actions).
+    """
+    left, right = history_actions
+    record = {
+        'episode': episode,
+        'reward': float(reward),
+        'length': int(length),
+        'left_actions': int(action_counts[left]),
+        'right_actions': int(action_counts[right]),
+        'solved': bool(reward >= solved_threshold),
+    }
+    if len(action_counts) > 2:
+        record['action_counts'] = [int(c) for c in action_counts]
+    if mean_value is not None:
+        record['mean_value'] = float(mean_value)
+    if mean_entropy is not None:
+        record['mean_entropy'] = float(mean_entropy)
+    return record
+
+
+class PolicyTrace:
+    """Growable per-step record of action probabilities and value estimates"""
+
+    def __init__(self, action_dim, capacity=512):
+        self.action_dim = action_dim
+        self._steps = np.zeros(capacity, dtype=np.int64)
+        self._probs = np.zeros((capacity, action_dim), dtype=np.float32)
+        self._values = np.zeros(capacity, dtype=np.float32)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def clear(self):
+        self._size = 0
+
+    def append(self, step, probs, value):
+        """Record one step (amortized O(1))"""
+        if self._size == len(self._steps):
+            capacity = 2 * len(self._steps)
+            self._steps = np.resize(self._steps, capacity)
+            self._probs = np.resize(self._probs, (capacity, self.action_dim))
+            self._values = np.resize(self._values, capacity)
+
+        self._steps[self._size] = step
+        self._probs[self._size] = probs
+        self._values[self._size] = value if value is not None else np.nan
+        self._size += 1
+
+    @property
+    def steps(self):
+        return self._steps[:self._size]
+
+    @property
+    def probs(self):
+        return self._probs[:self._size]
+
+    @property
+    def values(self):
+        return self._values[:self._size]
+
+
+class EpisodeAccumulator:
+    """
+    O(1)-per-step statistics of one episode.
+
+    Keeps counters for steps, reward, per-action counts, value estimates and
+    policy entropy, plus an optional PolicyTrace of every step.
+    """
+
+    def __init__(self, action_dim, record_trace=False, history_actions=(0, 1)):
+        self.action_dim = action_dim
+        self.history_actions = history_actions
+        self.trace = PolicyTrace(action_dim) if record_trace else None
+        self.reset()
+
+    def reset(self):
+        self.length = 0
+        self.reward = 0.0
+        self.action_counts = np.zeros(self.action_dim, dtype=np.int64)
+        self.value_sum = 0.0
+        self.value_count = 0
+        self.entropy_sum = 0.0
+        self.entropy_count = 0
+        self.last_probs = None
+        self.last_value = None
+        if self.trace is not None:
+            self.trace = PolicyTrace(self.action_dim)
+
+    def step(self, action, reward, probs=None, value=None):
+        """Record one environment step"""
+        if self.trace is not None and probs is not None:
+            self.trace.append(self.length, probs, value)
+
+        self.length += 1
+        self.reward += reward
+        self.action_counts[action] += 1
+
+        if value is not None:
+            self.value_sum += value
+            self.value_count += 1
+            self.last_value = value
+        if probs is not None:
+            self.entropy_sum += float(_entropy(probs))
+            self.entropy_count += 1
+            self.last_probs = probs
+
+    @property
+    def mean_value(self):
+        return self.value_sum / self.value_count if self.value_count else None
+
+    @property
+    def mean_entropy(self):
+        return self.entropy_sum / self.entropy_count if self.entropy_count else None
+
+    def snapshot(self):
+        """Current statistics, cheap enough to publish every display tick"""
+        return {
+            'step': self.length,
+            'reward': self.reward,
+            'action_counts': self.action_counts.tolist(),
+            'left': int(self.action_counts[self.history_actions[0]]),
+            'right': int(self.action_counts[self.history_actions[1]]),
+            'probs': self.last_probs,
+            'value': self.last_value,
+            'mean_value': self.mean_value,
+            'mean_entropy': self.mean_entropy,
+        }
+
+    def finalize(self, episode, solved_threshold):
+        """Per-episode record in the History tab format"""
+        return make_record(episode, self.reward, self.length, self.action_counts, solved_threshold,
+                           self.mean_value, self.mean_entropy, self.history_actions)
+
+
+class BatchEpisodeAccumulator:
+    """EpisodeAccumulator over a batch of vectorized environments, with a done mask"""
+
+    def __init__(self, num_envs, action_dim, history_actions=(0, 1)):
+        self.num_envs = num_envs
+        self.action_dim = action_dim
+        self.history_actions = history_actions
+        self._rows = np.arange(num_envs)
+        self.reset()
+
+    def reset(self):
+        self.length = np.zeros(self.num_envs, dtype=np.int64)
+        self.reward = np.zeros(self.num_envs, dtype=np.float64)
+        self.action_counts = np.zeros((self.num_envs, self.action_dim), dtype=np.int64)
+        self.value_sum = np.zeros(self.num_envs, dtype=np.float64)
+        self.entropy_sum = np.zeros(self.num_envs, dtype=np.float64)
+        self.active = np.ones(self.num_envs, dtype=bool)
+
+    def step(self, actions, rewards, terminated, truncated, probs=None, values=None):
+        """Record one vector step; only environments still in their episode count"""
+        active = self.active
+        self.length += active
+        self.reward += np.where(active, rewards, 0.0)
+        self.action_counts[self._rows[active], actions[active]] += 1
+        if values is not None:
+            self.value_sum += np.where(active, values, 0.0)
+        if probs is not None:
+            self.entropy_sum += np.where(active, _entropy(probs), 0.0)
+        self.active &= ~(terminated | truncated)
+
+    def finalize(self, i, episode, solved_threshold):
+        """Record of environment i"""
+        length = max(int(self.length[i]), 1)
+        return make_record(episode, self.reward[i], self.length[i], self.action_counts[i],
+                           solved_threshold, self.value_sum[i] / length, self.entropy_sum[i] / length,
+                           self.history_actions)
@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from env_specs import APP_DIR, ENV_SPECS
+from model_registry import served_weights_hash
+from episode_runner import RunJob
+
+# On-disk store of evaluation aggregates, one JSON file per checkpoint hash and eval config
+STORE_DIR = os.environ.get("PPO_EVAL_STORE", os.path.join(APP_DIR, ".eval_cache"))
+
+# Episodes and seed of the evaluation behind the Performance tab
+DEFAULT_EVAL_EPISODES = 100
+DEFAULT_EVAL_SEED = 0
+
+_pending = set()
+_lock = threading.Lock()
+
+
+def bootstrap_ci(values, statistic=np.mean, n_boot=2000, alpha=0.05, seed=0):
+    """Percentile bootstrap confidence interval of a statistic"""
+    values = np.asarray(values, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    samples = values[rng.integers(0, len(values), size=(n_boot, len(values)))]
+    stats = statistic(samples, axis=1)
+    return float(np.quantile(stats, alpha / 2)), float(np.quantile(stats, 1 - alpha / 2))
+
+
+def compute_aggregates(records):
+    """Mean, std, CV, success rate and 95% bootstrap CIs over episode records"""
+    rewards = np.array([r['reward'] for r in records], dtype=np.float64)
+    solved = np.array([r['solved'] for r in records], dtype=np.float64)
+    mean = float(rewards.mean())
+    std = float(rewards.std())
+
+    return {
+        'episodes': len(records),
+        'mean_reward': mean,
+        'std_reward': std,
+        'cv': std / abs(mean) if mean else float("nan"),
+        'success_rate': float(solved.mean()),
+        'mean_reward_ci': bootstrap_ci(rewards),
+        'success_rate_ci': bootstrap_ci(solved),
+        'mean_length': float(np.mean([r['length'] for r in records])),
+    }
+
+
+def config_key(config):
+    """Short stable hash of an evaluation config (episodes, seed, backend, ...)"""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+
+
+class EvalStore:
+    """Evaluation aggregates on disk, keyed by checkpoint hash, environment and eval config"""
+
+    def __init__(self, root=STORE_DIR):
+        self.root = root
+
+    def _path(self, digest, env_name, config):
+        return os.path.join(self.root, f"{env_name}_{digest[:16]}_{config_key(config)}.json")
+
+    def load(self, digest, env_name, config):
+        """Stored entry, or None"""
+        try:
+            with open(self._path(digest, env_name, config), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, digest, env_name, aggregates, config):
+        """Store aggregates atomically"""
+        os.makedirs(self.root, exist_ok=True)
+        entry = {
+            'checkpoint_hash': digest,
+            'env_name': env_name,
+            'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'config': config,
+            'aggregates': aggregates,
+        }
+        path = self._path(digest, env_name, config)
+        # Unique per writer: runner threads share a PID and may store the same key
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
+        return entry
+
+
+def request_evaluation(env_name, runner, backend="torch", precision="fp32", num_episodes=DEFAULT_EVAL_EPISODES,
+                       seed=DEFAULT_EVAL_SEED, store=None):
+    """
+    Return stored aggregates for the environment's current checkpoint.
+
+    On a miss, a headless batched evaluation is submitted to `runner` (at most
+    one per checkpoint and config at a time) and None is returned; later calls
+    with the same config are served from the store until the checkpoint file
+    changes.
+    """
+    store = store or EvalStore()
+    if env_name not in ENV_SPECS:
+        return None
+
+    digest = served_weights_hash(env_name, backend, precision)
+    if digest is None:
+        return None
+
+    config = {'episodes': num_episodes, 'seed': seed, 'deterministic': True, 'backend': backend,
+              'precision': precision}
+    entry = store.load(digest, env_name, config)
+    if entry is not None:
+        return entry['aggregates']
+
+    key = (digest, env_name, config_key(config))
+    with _lock:
+        if key in _pending:
+            return None
+        _pending.add(key)
+
+    handle = runner.submit(RunJob(env_name, num_episodes, deterministic=True, seed=seed,
+                                  backend=backend, precision=precision, headless=True))
+
+    def store_result(_):
+        try:
+            if handle.error is None and not handle.cancelled and handle.records:
+                store.save(digest, env_name, compute_aggregates(handle.records), config)
+        finally:
+            with _lock:
+                _pending.discard(key)
+
+    handle.future.add_done_callback(store_result)
+    return None
+
+
+def evaluation_pending(env_name):
+    """True while an evaluation for the environment is running"""
+    with _lock:
+        return any(name == env_name for _, name, _ in _pending)
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Batch Evaluation CLI
+Runs thousands of seeded episodes of a trained policy across a process pool
+and writes per-episode records to JSONL or Parquet
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from model_registry import MODEL_CONFIGS, BACKENDS, PRECISIONS, get_model
+from evaluator import evaluate
+
+
+def _init_worker(backend):
+    """Keep each worker single-threaded; parallelism comes from the pool"""
+    if backend == "torch":
+        import torch
+        torch.set_num_threads(1)
+
+
+def run_chunk(env_name, checkpoint, backend, seed, num_episodes, deterministic, precision="fp32"):
+    """Evaluate one chunk of consecutive seeds inside a worker process"""
+    model, loaded = get_model(env_name, checkpoint, backend=backend, precision=precision)
+    if not loaded:
+        raise FileNotFoundError(f"Checkpoint not found for {env_name}")
+
+    records = evaluate(model, env_name, num_episodes, deterministic=deterministic, seed=seed)
+    for i, record in enumerate(records):
+        record['episode'] = seed + i
+        record['seed'] = seed + i
+    return records
+
+
+def run_shared_memory(args):
+    """Evaluate on a RolloutPool: workers keep their envs and write episode stats to shared memory"""
+    from rollout_pool import RolloutPool
+
+    model, loaded = get_model(args.env, args.checkpoint)
+    if not loaded:
+        raise FileNotFoundError(f"Checkpoint not found for {args.env}")
+
+    # One chunk per worker at a time, `chunk_size` envs each
+    with RolloutPool(args.env, args.workers * args.chunk_size, 1, args.workers) as pool:
+        pool.broadcast(getattr(model, "policy", model))
+        records = pool.evaluate(args.episodes, deterministic=not args.stochastic, seed=args.seed)
+    for i, record in enumerate(records):
+        record['episode'] = args.seed + i
+        record['seed'] = args.seed + i
+    return records
+
+
+def write_records(records, path):
+    """Write records as JSONL, or Parquet if the path ends in .parquet"""
+    if path.endswith(".parquet"):
+        import pandas as pd
+        pd.DataFrame(records).to_parquet(path, index=False)
+        return
+
+    with open(path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def summarize(records):
+    """Aggregate statistics over per-episode records"""
+    rewards = np.array([r['reward'] for r in records], dtype=np.float64)
+    mean = float(rewards.mean())
+    std = float(rewards.std())
+    return {
+        'episodes': len(records),
+        'mean_reward': mean,
+        'std_reward': std,
+        'cv': std / abs(mean) if mean else float("nan"),
+        'success_rate': float(np.mean([r['solved'] for r in records])),
+        'total_steps': int(sum(r['length'] for r in records)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless batch evaluation of a PPO policy")
+    parser.add_argument("--env", default="CartPole-v1", choices=sorted(MODEL_CONFIGS))
+    parser.add_argument("--checkpoint", default=None, help="Defaults to the shipped checkpoint")
+    parser.add_argument("--backend", default="torch", choices=BACKENDS)
+    parser.add_argument("--precision", default="fp32", choices=PRECISIONS,
+                        help="Torch variant written by quantize_policy.py")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="Episode i uses seed + i")
+    parser.add_argument("--stochastic", action="store_true", help="Sample actions instead of argmax")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=50, help="Episodes per vectorized batch")
+    parser.add_argument("--shared-memory", action="store_true",
+                        help="Use persistent rollout workers that return results through shared memory "
+                             "(torch fp32 only)")
+    parser.add_argument("--out", default=None, help="Output .jsonl or .parquet file")
+    parser.add_argument("--min-mean", type=float, default=None, help="Fail if mean reward is below this")
+    parser.add_argument("--min-success", type=float, default=None, help="Fail if success rate (0-1) is below this")
+    args = parser.parse_args()
+    if args.shared_memory and (args.backend != "torch" or args.precision != "fp32"):
+        parser.error("--shared-memory runs the fp32 torch policy")
+
+    chunks = [(s, min(args.chunk_size, args.seed + args.episodes - s))
+              for s in range(args.seed, args.seed + args.episodes, args.chunk_size)]
+
+    print(f"🚀 Evaluating {args.episodes} episodes of {args.env} "
+          f"on {args.workers} workers ({len(chunks)} chunks)")
+
+    start = time.perf_counter()
+    if args.shared_memory:
+        records = run_shared_memory(args)
+    else:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(args.backend,)) as pool:
+            futures = [pool.submit(run_chunk, args.env, args.checkpoint, args.backend, seed, n,
+                                   not args.stochastic, args.precision)
+                       for seed, n in chunks]
+            records = [record for future in futures for record in future.result()]
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(records)
+    print(f"\n📊 Mean reward:   {summary['mean_reward']:.1f} ± {summary['std_reward']:.1f} "
+          f"(CV {summary['cv'] * 100:.1f}%)")
+    print(f"   Success rate:  {summary['success_rate'] * 100:.1f}%")
+    print(f"   Throughput:    {summary['total_steps'] / elapsed:,.0f} steps/sec, "
+          f"{len(records) / elapsed:,.1f} episodes/sec ({elapsed:.1f}s)")
+
+    if args.out:
+        write_records(records, args.out)
+        print(f"\n✅ Wrote {len(records)} records to {args.out}")
+
+    failed = False
+    if args.min_mean is not None and summary['mean_reward'] < args.min_mean:
+        print(f"❌ Mean reward {summary['mean_reward']:.1f} < {args.min_mean}")
+        failed = True
+    if args.min_success is not None and summary['success_rate'] < args.min_success:
+        print(f"❌ Success rate {summary['success_rate']:.3f} < {args.min_success}")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+import numpy as np
+
+from episode_stats import BatchEpisodeAccumulator
+from env_specs import get_spec
+
+
+def make_vector_env(env_name, num_envs, asynchronous=False):
+    """Create a Sync/Async vector env with `num_envs` copies of `env_name`"""
+    import gymnasium as gym
+
+    env_fns = [lambda: gym.make(env_name) for _ in range(num_envs)]
+    if asynchronous:
+        return gym.vector.AsyncVectorEnv(env_fns)
+    return gym.vector.SyncVectorEnv(env_fns)
+
+
+def _run_batch(model, envs, num_envs, deterministic, seed, max_steps, action_dim, history_actions):
+    """Run one episode in every sub-environment, masking finished ones"""
+    obs, _ = envs.reset(seed=seed)
+
+    # Inference buffers, reused every step
+    obs_buf = np.empty(obs.shape, dtype=np.float32)
+    actions = np.empty(num_envs, dtype=np.int64)
+    probs = np.empty((num_envs, action_dim), dtype=np.float32)
+    values = np.empty(num_envs, dtype=np.float32)
+
+    # Only steps of environments still in their first episode are counted
+    stats = BatchEpisodeAccumulator(num_envs, action_dim, history_actions)
+
+    while stats.active.any() and stats.length.max() < max_steps:
+        np.copyto(obs_buf, obs)
+        model.act_batch(obs_buf, actions, probs, values, deterministic=deterministic)
+
+        obs, reward, terminated, truncated, _ = envs.step(actions)
+        stats.step(actions, reward, terminated, truncated, probs, values)
+
+    return stats
+
+
+def evaluate(model, env_name, num_episodes, deterministic=True, seed=None,
+             num_envs=None, asynchronous=False, max_steps=None, solved_threshold=None):
+    """
+    Run `num_episodes` episodes headless in a vector env and return one record
+    per episode, in the same format as `st.session_state.episode_history`.
+
+    The policy is called once per step on the whole batch of observations
+    through `PPONetwork.act_batch`.
+    Episodes are run in batches of `num_envs` (default: all at once).
+    `max_steps` and `solved_threshold` default to the environment's spec.
+    """
+    spec = get_spec(env_name)
+    max_steps = max_steps or spec.max_steps
+    solved_threshold = spec.solved_threshold if solved_threshold is None else solved_threshold
+    num_envs = min(num_envs or num_episodes, num_episodes)
+    action_dim = model.action_dim
+
+    records = []
+    envs = make_vector_env(env_name, num_envs, asynchronous=asynchronous)
+    try:
+        while len(records) < num_episodes:
+            batch_seed = None if seed is None else seed + len(records)
+            stats = _run_batch(model, envs, num_envs, deterministic, batch_seed, max_steps, action_dim,
+                               spec.history_actions)
+
+            for i in range(min(num_envs, num_episodes - len(records))):
+                records.append(stats.finalize(i, len(records) + 1, solved_threshold))
+    finally:
+        envs.close()
+
+    return records
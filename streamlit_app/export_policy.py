@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Policy Export Script
+Freezes the PPONetwork actor (and optionally the critic) into a TorchScript
+or ONNX artifact plus a NumPy weights file, then checks parity against the
+eager model and compares load time and latency
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from model_registry import MODEL_CONFIGS, DEFAULT_CHECKPOINTS, get_model
+from checkpoint_format import load_state_dict
+from frozen_policy import (TORCHSCRIPT_SUFFIX, WEIGHTS_SUFFIX, ONNX_SUFFIX,
+                           load_frozen_policy)
+from ppo_network import PPONetwork
+
+
+class ActorHead(nn.Module):
+    """Shared layers + actor, returning action probabilities"""
+
+    def __init__(self, network):
+        super(ActorHead, self).__init__()
+        self.shared_fc1 = network.shared_fc1
+        self.shared_fc2 = network.shared_fc2
+        self.actor_fc = network.actor_fc
+
+    def forward(self, state):
+        x = F.relu(self.shared_fc1(state))
+        x = F.relu(self.shared_fc2(x))
+        return F.softmax(self.actor_fc(x), dim=-1)
+
+
+class ActorCriticHead(nn.Module):
+    """Shared layers + actor + critic, returning (probs, value)"""
+
+    def __init__(self, network):
+        super(ActorCriticHead, self).__init__()
+        self.shared_fc1 = network.shared_fc1
+        self.shared_fc2 = network.shared_fc2
+        self.actor_fc = network.actor_fc
+        self.critic_fc = network.critic_fc
+
+    def forward(self, state):
+        x = F.relu(self.shared_fc1(state))
+        x = F.relu(self.shared_fc2(x))
+        return F.softmax(self.actor_fc(x), dim=-1), self.critic_fc(x)
+
+
+def export_torchscript(head, path):
+    """Script, freeze and save a head module"""
+    frozen = torch.jit.freeze(torch.jit.script(head.eval()))
+    frozen.save(path)
+
+
+def export_onnx(head, path, state_dim, include_critic):
+    """Export a head module to ONNX (requires the onnx package)"""
+    output_names = ["probs", "value"] if include_critic else ["probs"]
+    torch.onnx.export(
+        head, torch.zeros(1, state_dim), path,
+        input_names=["state"], output_names=output_names,
+        dynamic_axes={name: {0: "batch"} for name in ["state"] + output_names},
+    )
+
+
+def export_weights(model, path, meta, include_critic):
+    """Save the weights needed for inference plus metadata as an .npz file"""
+    arrays = {k: v.detach().cpu().numpy().astype(np.float32)
+              for k, v in model.state_dict().items()
+              if include_critic or not k.startswith("critic_fc")}
+    np.savez(path, meta=np.array(json.dumps(meta)), **arrays)
+
+
+def timed(fn, iters=1):
+    """Average seconds per call of fn() and the last result"""
+    start = time.perf_counter()
+    for _ in range(iters):
+        result = fn()
+    return (time.perf_counter() - start) / iters, result
+
+
+def parity_report(model, prefix, env_name, checkpoint_path, include_critic,
+                  num_states=1000, iters=500):
+    """Compare exported backends to the eager model on random states"""
+    state_dim = MODEL_CONFIGS[env_name]["state_dim"]
+    states = np.random.default_rng(0).normal(size=(num_states, state_dim)).astype(np.float32)
+    with torch.no_grad():
+        logits, values = model(torch.from_numpy(states))
+        ref_probs = F.softmax(logits, dim=-1).numpy()
+        ref_values = values.numpy()[:, 0]
+    ref_actions = ref_probs.argmax(axis=-1)
+
+    print(f"\n{'backend':<12s} {'max|dp|':>10s} {'max|dv|':>10s} {'agree':>7s} "
+          f"{'load ms':>9s} {'us/step':>9s}")
+
+    def load_eager():
+        net = PPONetwork(**MODEL_CONFIGS[env_name])
+        net.load_state_dict(load_state_dict(checkpoint_path, mmap=False))
+        return net.eval()
+    load_time, _ = timed(load_eager)
+    step_time, _ = timed(lambda: model.get_action(states[0], deterministic=True), iters)
+    print(f"{'eager':<12s} {0.0:>10.2e} {0.0:>10.2e} {100.0:>6.1f}% "
+          f"{load_time * 1e3:>9.2f} {step_time * 1e6:>9.1f}")
+
+    backends = ["numpy"]
+    if os.path.exists(prefix + TORCHSCRIPT_SUFFIX):
+        backends.insert(0, "torchscript")
+
+    ok = True
+    for backend in backends:
+        load_time, policy = timed(lambda: load_frozen_policy(prefix, backend=backend))
+        probs, values = policy.predict(states)
+        dp = float(np.abs(probs - ref_probs).max())
+        dv = float(np.abs(values - ref_values).max()) if include_critic else 0.0
+        agree = float((probs.argmax(axis=-1) == ref_actions).mean() * 100)
+        step_time, _ = timed(lambda: policy.get_action(states[0], deterministic=True), iters)
+        print(f"{backend:<12s} {dp:>10.2e} {dv:>10.2e} {agree:>6.1f}% "
+              f"{load_time * 1e3:>9.2f} {step_time * 1e6:>9.1f}")
+        ok = ok and dp < 1e-5 and dv < 1e-4
+
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a frozen PPO policy")
+    parser.add_argument("--env", default="CartPole-v1", choices=sorted(MODEL_CONFIGS))
+    parser.add_argument("--checkpoint", default=None, help="Defaults to the shipped checkpoint")
+    parser.add_argument("--out", required=True, help="Output path prefix, e.g. ../models/cartpole_policy")
+    parser.add_argument("--format", choices=["torchscript", "onnx", "both"], default="torchscript")
+    parser.add_argument("--include-critic", action="store_true", help="Also export the value head")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or DEFAULT_CHECKPOINTS[args.env]
+    model, loaded = get_model(args.env, checkpoint_path)
+    if not loaded:
+        print("❌ Checkpoint not found, refusing to export random weights")
+        return 1
+
+    config = MODEL_CONFIGS[args.env]
+    head = ActorCriticHead(model) if args.include_critic else ActorHead(model)
+    meta = dict(config, env_name=args.env, include_critic=args.include_critic)
+
+    export_weights(model, args.out + WEIGHTS_SUFFIX, meta, args.include_critic)
+    print(f"✅ Weights:     {args.out + WEIGHTS_SUFFIX}")
+
+    if args.format in ("torchscript", "both"):
+        export_torchscript(head, args.out + TORCHSCRIPT_SUFFIX)
+        print(f"✅ TorchScript: {args.out + TORCHSCRIPT_SUFFIX}")
+
+    if args.format in ("onnx", "both"):
+        try:
+            export_onnx(head, args.out + ONNX_SUFFIX, config["state_dim"], args.include_critic)
+            print(f"✅ ONNX:        {args.out + ONNX_SUFFIX}")
+        except ImportError as e:
+            print(f"⚠️  ONNX export skipped ({e})")
+
+    ok = parity_report(model, args.out, args.env, checkpoint_path, args.include_critic)
+    print("\n✅ Parity check passed" if ok else "\n❌ Parity check FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
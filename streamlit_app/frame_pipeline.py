@@ -0,0 +1,151 @@
+import io
+import threading
+import time
+from contextlib import contextmanager
+
+from PIL import Image
+
+
+class EncodedFrame:
+    """An encoded frame ready to be sent to the browser"""
+
+    def __init__(self, data, caption, step):
+        self.data = data
+        self.caption = caption
+        self.step = step
+
+
+class FramePipeline:
+    """
+    Decouples rendering from simulation.
+
+    The episode loop asks `due()` whether a frame should be rendered at the
+    display FPS and hands raw frames to `submit()`. A worker thread
+    downscales and JPEG/WebP-encodes the newest frame; frames that arrive
+    while the worker is busy replace the pending one and are dropped. If
+    display work (pushing frames and stats to the browser) takes longer than
+    the frame interval, the effective display rate backs off instead of
+    stalling the simulation.
+    """
+
+    def __init__(self, display_fps=20, max_width=480, fmt="JPEG", quality=80, profiler=None):
+        self.frame_interval = 1.0 / display_fps
+        self.max_width = max_width
+        self.fmt = fmt
+        self.quality = quality
+        # Optional StageProfiler receiving "encode" durations from the worker
+        self.profiler = profiler
+
+        self.frames_submitted = 0
+        self.frames_dropped = 0
+        self.frames_displayed = 0
+
+        self._next_due = 0.0
+        self._display_time = 0.0
+        self._pending = None
+        self._encoded = None
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name="frame-encoder", daemon=True)
+        self._worker.start()
+
+    def due(self):
+        """True when the next frame should be rendered"""
+        now = time.perf_counter()
+        if now < self._next_due:
+            return False
+        self._next_due = now + max(self.frame_interval, self._display_time)
+        self._display_time = 0.0
+        return True
+
+    @contextmanager
+    def display(self):
+        """Time a block of display work so due() backs off when the browser lags"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._display_time += time.perf_counter() - start
+
+    def submit(self, frame, caption="", step=0):
+        """Queue a raw RGB frame for encoding, replacing any frame still pending"""
+        with self._cond:
+            if self._pending is not None:
+                self.frames_dropped += 1
+            self._pending = (frame, caption, step)
+            self.frames_submitted += 1
+            self._cond.notify()
+
+    def poll(self):
+        """Return the newest encoded frame not yet returned, or None"""
+        with self._cond:
+            encoded, self._encoded = self._encoded, None
+        return encoded
+
+    def flush(self, timeout=1.0):
+        """Wait for pending frames to be encoded, then return the newest one"""
+        deadline = time.perf_counter() + timeout
+        with self._cond:
+            while (self._pending is not None or self._busy) and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.poll()
+
+    def show(self, display_fn, encoded=None):
+        """
+        Send the newest encoded frame to `display_fn(data, caption)`.
+
+        The time taken to display is used to throttle `due()` when the
+        browser cannot keep up.
+        """
+        encoded = encoded or self.poll()
+        if encoded is None:
+            return False
+
+        with self.display():
+            display_fn(encoded.data, encoded.caption)
+        self.frames_displayed += 1
+        return True
+
+    def close(self):
+        """Stop the worker thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join(timeout=1.0)
+
+    def encode(self, frame):
+        """Downscale and compress one RGB array"""
+        image = Image.fromarray(frame)
+        if image.width > self.max_width:
+            height = round(image.height * self.max_width / image.width)
+            image = image.resize((self.max_width, height), Image.BILINEAR)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format=self.fmt, quality=self.quality)
+        return buffer.getvalue()
+
+    def _run(self):
+        """Worker loop: encode the newest pending frame"""
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                frame, caption, step = self._pending
+                self._pending = None
+                self._busy = True
+
+            start = time.perf_counter()
+            data = self.encode(frame)
+            if self.profiler is not None:
+                self.profiler.add("encode", time.perf_counter() - start)
+
+            with self._cond:
+                self._encoded = EncodedFrame(data, caption, step)
+                self._busy = False
+                self._cond.notify_all()
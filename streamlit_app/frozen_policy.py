@@ -0,0 +1,73 @@
+import importlib.util
+import json
+import os
+
+import numpy as np
+
+from numpy_policy import NumpyPolicy
+
+# Suffixes of the artifacts written by export_policy.py
+TORCHSCRIPT_SUFFIX = ".ts"
+WEIGHTS_SUFFIX = ".npz"
+ONNX_SUFFIX = ".onnx"
+
+
+class TorchScriptPolicy:
+    """Frozen TorchScript actor (and optional critic) exported by export_policy.py"""
+
+    def __init__(self, path, meta):
+        import torch
+
+        self._torch = torch
+        self.module = torch.jit.load(path, map_location="cpu")
+        self.module.eval()
+        self.meta = meta
+        self.action_dim = meta["action_dim"]
+        self.include_critic = meta["include_critic"]
+
+    def predict(self, states):
+        """Return (probs, values) for a batch of states; values is None without critic"""
+        with self._torch.no_grad():
+            out = self.module(self._torch.from_numpy(np.ascontiguousarray(states, dtype=np.float32)))
+        if self.include_critic:
+            return out[0].numpy(), out[1].numpy()[:, 0]
+        return out.numpy(), None
+
+    def get_action(self, state, deterministic=False):
+        """Get action for inference (same return format as PPONetwork.get_action)"""
+        probs, values = self.predict(np.reshape(state, (1, -1)))
+        if deterministic:
+            action = int(np.argmax(probs[0]))
+        else:
+            action = int(self._torch.multinomial(self._torch.from_numpy(probs[0]), 1).item())
+        value = None if values is None else float(values[0])
+        return action, probs[0], value
+
+
+def read_meta(prefix):
+    """Read the metadata stored next to an exported policy"""
+    with np.load(prefix + WEIGHTS_SUFFIX) as data:
+        return json.loads(str(data["meta"]))
+
+
+def load_frozen_policy(prefix, backend="auto"):
+    """
+    Load a policy exported by export_policy.py.
+
+    `prefix` is the artifact path without suffix (e.g. ../models/cartpole_policy).
+    backend: "torchscript", "numpy", or "auto" (TorchScript if torch is
+    installed and the .ts file exists, otherwise NumPy).
+    """
+    meta = read_meta(prefix)
+    ts_path = prefix + TORCHSCRIPT_SUFFIX
+
+    if backend == "auto":
+        # find_spec checks for torch without paying for its import
+        has_torch = importlib.util.find_spec("torch") is not None
+        backend = "torchscript" if has_torch and os.path.exists(ts_path) else "numpy"
+
+    if backend == "torchscript":
+        return TorchScriptPolicy(ts_path, meta)
+    if backend == "numpy":
+        return NumpyPolicy.load(prefix + WEIGHTS_SUFFIX)
+    raise ValueError(f"Unknown backend: {backend}")
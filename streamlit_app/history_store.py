@@ -0,0 +1,122 @@
+import os
+import sqlite3
+
+import numpy as np
+
+# Per-episode record layout, matching the History tab columns
+HISTORY_DTYPE = np.dtype([
+    ('episode', np.int64),
+    ('reward', np.float64),
+    ('length', np.int64),
+    ('left_actions', np.int64),
+    ('right_actions', np.int64),
+    ('solved', np.bool_),
+])
+
+DEFAULT_CAPACITY = int(os.environ.get("PPO_HISTORY_CAPACITY", "500"))
+
+
+class EpisodeHistory:
+    """
+    Bounded, columnar episode history.
+
+    The newest `capacity` episodes live in a preallocated structured array
+    used as a ring buffer. Aggregates (count, running mean, max, successes,
+    left/right totals) are updated on append and cover every episode ever
+    added, so reading them is O(1). If `spill_path` is set, episodes pushed
+    out of the ring are written to a SQLite table instead of being lost.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, spill_path=None):
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._data = np.zeros(capacity, dtype=HISTORY_DTYPE)
+        self._start = 0
+        self._size = 0
+        self._spill = None
+        self._reset_aggregates()
+
+    def _reset_aggregates(self):
+        self.count = 0
+        self.reward_sum = 0.0
+        self.max_reward = float("-inf")
+        self.success_count = 0
+        self.left_total = 0
+        self.right_total = 0
+
+    def __len__(self):
+        """Number of episodes currently retained in memory"""
+        return self._size
+
+    @property
+    def mean_reward(self):
+        return self.reward_sum / self.count if self.count else 0.0
+
+    @property
+    def success_rate(self):
+        return self.success_count / self.count if self.count else 0.0
+
+    def append(self, record):
+        """Add one episode record; its episode number is assigned here"""
+        row = (self.count + 1, record['reward'], record['length'],
+               record['left_actions'], record['right_actions'], record['solved'])
+
+        if self._size < self.capacity:
+            index = (self._start + self._size) % self.capacity
+            self._size += 1
+        else:
+            index = self._start
+            if self.spill_path:
+                self._spill_row(self._data[index])
+            self._start = (self._start + 1) % self.capacity
+        self._data[index] = row
+
+        self.count += 1
+        self.reward_sum += record['reward']
+        self.max_reward = max(self.max_reward, record['reward'])
+        self.success_count += int(record['solved'])
+        self.left_total += record['left_actions']
+        self.right_total += record['right_actions']
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def clear(self):
+        self._start = 0
+        self._size = 0
+        self._reset_aggregates()
+        if self._spill is not None:
+            self._spill.execute("DELETE FROM episodes")
+            self._spill.commit()
+
+    def records(self):
+        """Retained episodes as a structured array, oldest first"""
+        end = self._start + self._size
+        if end <= self.capacity:
+            return self._data[self._start:end]
+        return np.concatenate([self._data[self._start:], self._data[:end - self.capacity]])
+
+    def to_frame(self, include_spilled=False):
+        """Retained (optionally all) episodes as a pandas DataFrame"""
+        import pandas as pd
+
+        frame = pd.DataFrame(self.records())
+        if include_spilled and self._spill is not None:
+            spilled = pd.read_sql_query("SELECT * FROM episodes ORDER BY episode", self._spill)
+            spilled['solved'] = spilled['solved'].astype(bool)
+            frame = pd.concat([spilled, frame], ignore_index=True)
+        return frame
+
+    def _spill_row(self, row):
+        """Write an evicted episode to SQLite"""
+        if self._spill is None:
+            # Streamlit reruns may come from different threads
+            self._spill = sqlite3.connect(self.spill_path, check_same_thread=False)
+            self._spill.execute(
+                "CREATE TABLE IF NOT EXISTS episodes (episode INTEGER PRIMARY KEY, reward REAL, "
+                "length INTEGER, left_actions INTEGER, right_actions INTEGER, solved INTEGER)"
+            )
+        self._spill.execute("INSERT OR REPLACE INTO episodes VALUES (?, ?, ?, ?, ?, ?)",
+                            tuple(row.item()))
+        self._spill.commit()
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import numpy as np
+
+
+class _Request:
+    __slots__ = ("state", "deterministic", "result", "done")
+
+    def __init__(self, state, deterministic):
+        self.state = state
+        self.deterministic = deterministic
+        self.result = None
+        self.done = threading.Event()
+
+
+class MicroBatchPolicy:
+    """
+    Merges get_action calls from concurrent threads into one act_batch call.
+
+    A dispatcher thread takes the oldest pending request and waits up to
+    `window_ms` for more, but only as many as there are callers active in the
+    last second, so a single session never waits. Requests are grouped by the
+    deterministic flag and answered from one batched forward pass each. Every
+    other attribute (act_batch, state_dim, ...) is delegated to the wrapped
+    policy, so batch callers such as the evaluator bypass the dispatcher.
+    """
+
+    def __init__(self, policy, window_ms=1.0, max_batch=64):
+        self.policy = policy
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+
+        self.batches = 0
+        self.requests = 0
+
+        self._pending = []
+        self._callers = {}
+        self._cond = threading.Condition()
+        self._obs = np.zeros((max_batch, policy.state_dim), dtype=np.float32)
+        self._actions = np.zeros(max_batch, dtype=np.int64)
+        self._probs = np.zeros((max_batch, policy.action_dim), dtype=np.float32)
+        self._values = np.zeros(max_batch, dtype=np.float32)
+
+        self._worker = threading.Thread(target=self._run, name="microbatch", daemon=True)
+        self._worker.start()
+
+    def __getattr__(self, name):
+        return getattr(self.policy, name)
+
+    @property
+    def mean_batch_size(self):
+        return self.requests / self.batches if self.batches else 0.0
+
+    def get_action(self, state, deterministic=False):
+        """Same contract as PPONetwork.get_action: (action, probs, value)"""
+        request = _Request(state, deterministic)
+        with self._cond:
+            self._callers[threading.get_ident()] = time.perf_counter()
+            self._pending.append(request)
+            self._cond.notify()
+        request.done.wait()
+        if isinstance(request.result, Exception):
+            raise request.result
+        return request.result
+
+    def _expected_batch(self, now):
+        """Callers seen in the last second; stale ones are forgotten"""
+        for ident, seen in list(self._callers.items()):
+            if now - seen > 1.0:
+                del self._callers[ident]
+        return min(max(len(self._callers), 1), self.max_batch)
+
+    def _take_batch(self):
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            deadline = time.perf_counter() + self.window
+            expected = self._expected_batch(time.perf_counter())
+            while len(self._pending) < expected:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            for deterministic in (True, False):
+                group = [r for r in batch if r.deterministic == deterministic]
+                if group:
+                    self._answer(group, deterministic)
+            self.batches += 1
+            self.requests += len(batch)
+
+    def _answer(self, group, deterministic):
+        n = len(group)
+        try:
+            for i, request in enumerate(group):
+                self._obs[i] = request.state
+            self.policy.act_batch(self._obs[:n], self._actions[:n], self._probs[:n], self._values[:n],
+                                  deterministic=deterministic)
+            for i, request in enumerate(group):
+                request.result = (int(self._actions[i]), self._probs[i].copy(), float(self._values[i]))
+        except Exception as e:
+            for request in group:
+                request.result = e
+        for request in group:
+            request.done.set()
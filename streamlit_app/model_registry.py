@@ -0,0 +1,262 @@
+import hashlib
+import os
+import threading
+
+import numpy as np
+
+from env_specs import ENV_SPECS
+from checkpoint_format import is_checkpoint, read_header
+import serving_config
+
+# Network dimensions per environment
+MODEL_CONFIGS = {name: spec.model_config for name, spec in ENV_SPECS.items()}
+
+# Default checkpoint per environment
+DEFAULT_CHECKPOINTS = {name: spec.checkpoint for name, spec in ENV_SPECS.items()}
+
+# Inference backends: "torch" (PPONetwork) or "numpy" (NumpyPolicy, no torch import)
+BACKENDS = ("torch", "numpy")
+NUMPY_SUFFIX = ".npz"
+
+# Precisions of the torch backend; variants are written by quantize_policy.py
+PRECISIONS = ("fp32", "int8", "fp16", "bf16")
+
+# Process-wide cache shared by every Streamlit session:
+# (env_name, backend, precision, checkpoint_path) -> ((mtime, source mtime), model, loaded)
+_cache = {}
+_lock = threading.Lock()
+_hash_cache = {}
+
+
+def _checkpoint_mtime(checkpoint_path):
+    """Modification time of a checkpoint, or None if it does not exist"""
+    try:
+        return os.path.getmtime(checkpoint_path)
+    except OSError:
+        return None
+
+
+def numpy_checkpoint_path(checkpoint_path):
+    """Path of the NumPy weights converted from a torch checkpoint"""
+    return os.path.splitext(checkpoint_path)[0] + NUMPY_SUFFIX
+
+
+def variant_checkpoint_path(checkpoint_path, precision):
+    """Path of a precision variant next to the float32 checkpoint (variants are torch.save files)"""
+    if precision == "fp32":
+        return checkpoint_path
+    root, _ = os.path.splitext(checkpoint_path)
+    return f"{root}.{precision}.pt"
+
+
+def served_checkpoint(env_name, backend="torch", precision="fp32"):
+    """Checkpoint file get_model() loads by default for an environment, backend and precision"""
+    checkpoint_path = DEFAULT_CHECKPOINTS[env_name]
+    if backend == "numpy":
+        checkpoint_path = numpy_checkpoint_path(checkpoint_path)
+    else:
+        checkpoint_path = variant_checkpoint_path(checkpoint_path, precision)
+    return os.path.abspath(checkpoint_path)
+
+
+def source_checkpoint(env_name, checkpoint_path, backend="torch", precision="fp32"):
+    """
+    The float32 checkpoint a served derived file (the .npz or a precision
+    variant) is generated from, or None if checkpoint_path is not one
+    """
+    source = os.path.abspath(DEFAULT_CHECKPOINTS[env_name])
+    checkpoint_path = os.path.abspath(checkpoint_path)
+    if checkpoint_path == source or checkpoint_path != served_checkpoint(env_name, backend, precision):
+        return None
+    return source
+
+
+def checkpoint_hash(path):
+    """
+    SHA-256 identifying a checkpoint's weights, memoized per (path, mtime);
+    None if missing. .ppo checkpoints carry it in their header, so the
+    payload is not read; other files are hashed whole.
+    """
+    mtime = _checkpoint_mtime(path)
+    if mtime is None:
+        return None
+
+    key = (os.path.abspath(path), mtime)
+    digest = _hash_cache.get(key)
+    if digest is None and is_checkpoint(path):
+        digest = read_header(path)['payload_sha256']
+        _hash_cache[key] = digest
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _hash_cache[key] = digest
+    return digest
+
+
+def checkpoint_training(env_name):
+    """Training config and stats from the header of the environment's .ppo checkpoint, {} if unavailable"""
+    checkpoint_path = DEFAULT_CHECKPOINTS[env_name]
+    if not is_checkpoint(checkpoint_path):
+        return {}
+    return read_header(checkpoint_path).get('training', {})
+
+
+def served_weights_hash(env_name, backend="torch", precision="fp32"):
+    """
+    Hash identifying the weights get_model() serves by default: the served
+    file's hash, combined with its source checkpoint's for derived files
+    (which are rebuilt from the source when stale); None if neither exists
+    """
+    served = served_checkpoint(env_name, backend, precision)
+    source = source_checkpoint(env_name, served, backend, precision)
+    digests = [d for d in (checkpoint_hash(served), source and checkpoint_hash(source)) if d is not None]
+    if len(digests) < 2:
+        return digests[0] if digests else None
+    return hashlib.sha256("".join(digests).encode()).hexdigest()
+
+
+def _build_numpy_policy(env_name, checkpoint_path, source=None):
+    """
+    Load a NumpyPolicy. A file derived from `source` that is missing or was
+    converted from other weights is replaced by converting the source .ppo in
+    memory; without either, the weights are random.
+    """
+    from numpy_policy import NumpyPolicy
+
+    source_sha256 = checkpoint_hash(source) if source else None
+    if os.path.exists(checkpoint_path):
+        policy = NumpyPolicy.load(checkpoint_path)
+        if source_sha256 is None or policy.meta.get('source_sha256') == source_sha256:
+            return policy, True
+    if source_sha256 is not None and is_checkpoint(source):
+        from checkpoint_format import load_arrays
+        meta = {'env_name': env_name, 'source_sha256': source_sha256}
+        return NumpyPolicy.from_state_dict(load_arrays(source, mmap=False), meta=meta), True
+
+    config = MODEL_CONFIGS[env_name]
+    rng = np.random.default_rng()
+    shapes = {
+        "shared_fc1": (config["hidden_dim"], config["state_dim"]),
+        "shared_fc2": (config["hidden_dim"], config["hidden_dim"]),
+        "actor_fc": (config["action_dim"], config["hidden_dim"]),
+        "critic_fc": (1, config["hidden_dim"]),
+    }
+    params = {}
+    for name, (fan_out, fan_in) in shapes.items():
+        bound = 1.0 / np.sqrt(fan_in)
+        params[name + ".weight"] = rng.uniform(-bound, bound, (fan_out, fan_in))
+        params[name + ".bias"] = rng.uniform(-bound, bound, fan_out)
+    return NumpyPolicy(params), False
+
+
+def _build_model(env_name, checkpoint_path, precision="fp32", source=None):
+    """
+    Build a PPONetwork (or a quantized variant) and load its weights if the
+    checkpoint exists. A variant derived from `source` that is missing or was
+    quantized from other weights is re-quantized from the source in memory.
+    """
+    from quantized_policy import build_network, load_variant, quantize
+
+    serving_config.configure_torch()
+    loaded = False
+    if precision == "fp32" and is_checkpoint(checkpoint_path):
+        model = _build_from_checkpoint(env_name, checkpoint_path)
+        loaded = True
+    else:
+        model = build_network(MODEL_CONFIGS[env_name], precision)
+        state_dict, recorded_sha256 = None, None
+        if os.path.exists(checkpoint_path):
+            state_dict, recorded_sha256 = load_variant(checkpoint_path)
+        source_sha256 = checkpoint_hash(source) if source else None
+        if state_dict is not None and (source_sha256 is None or recorded_sha256 == source_sha256):
+            model.load_state_dict(state_dict)
+            loaded = True
+        elif source_sha256 is not None:
+            fp32_model, loaded = _build_model(env_name, source)
+            if loaded:
+                model = quantize(fp32_model, precision)
+
+    # Shared read-only across sessions
+    model.eval()
+    model.requires_grad_(False)
+    model.grad_context = serving_config.grad_context()
+    return model, loaded
+
+
+def _build_from_checkpoint(env_name, checkpoint_path):
+    """
+    Float32 PPONetwork shaped by a .ppo header. A float32 payload is aliased
+    memory-mapped, so no weight is read until the first forward pass; other
+    payload dtypes are upcast into the network's own parameters.
+    """
+    from ppo_network import PPONetwork
+    from checkpoint_format import load_state_dict
+
+    header = read_header(checkpoint_path)
+    if header['env_id'] != env_name:
+        raise ValueError(f"{checkpoint_path} was trained on {header['env_id']}, not {env_name}")
+    model = PPONetwork(**header['architecture'])
+    state_dict = load_state_dict(checkpoint_path, mmap=True)
+    # assign=True would swap in the payload's dtype along with its memory
+    model.load_state_dict(state_dict, assign=header['dtype'] == "float32")
+    model.checkpoint_header = header
+    return model
+
+
+def get_model(env_name, checkpoint_path=None, backend="torch", precision="fp32"):
+    """
+    Return (model, loaded) for an environment.
+
+    The model is loaded once per (env, backend, precision, checkpoint path,
+    file mtime) and reused by every caller until the checkpoint file changes
+    on disk. `loaded` is False when the checkpoint is missing and the network
+    has random weights. The "numpy" backend reads the .npz converted from the
+    checkpoint by numpy_policy.py and never imports torch. Torch precisions
+    other than "fp32" load the variant written by quantize_policy.py. Both
+    derived files record the weight hash of their source checkpoint and are
+    rebuilt from it in memory when it no longer matches.
+    """
+    if env_name not in MODEL_CONFIGS:
+        raise ValueError(f"No model configuration for environment: {env_name}")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+
+    if checkpoint_path is None:
+        checkpoint_path = served_checkpoint(env_name, backend, precision)
+    checkpoint_path = os.path.abspath(checkpoint_path)
+
+    key = (env_name, backend, precision, checkpoint_path)
+    # A derived file is reloaded when its source checkpoint changes too
+    source = source_checkpoint(env_name, checkpoint_path, backend, precision)
+    mtime = (_checkpoint_mtime(checkpoint_path), source and _checkpoint_mtime(source))
+
+    entry = _cache.get(key)
+    if entry is not None and entry[0] == mtime:
+        return entry[1], entry[2]
+
+    with _lock:
+        # Another session may have loaded it while we waited
+        entry = _cache.get(key)
+        if entry is not None and entry[0] == mtime:
+            return entry[1], entry[2]
+
+        if backend == "numpy":
+            model, loaded = _build_numpy_policy(env_name, checkpoint_path, source)
+        else:
+            model, loaded = _build_model(env_name, checkpoint_path, precision, source)
+        if serving_config.MICROBATCH:
+            from microbatch import MicroBatchPolicy
+            model = MicroBatchPolicy(model, serving_config.MICROBATCH_WINDOW_MS, serving_config.MICROBATCH_MAX)
+        _cache[key] = (mtime, model, loaded)
+        return model, loaded
+
+
+def clear_cache():
+    """Drop every cached model"""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+NumPy Inference Backend
+Runs PPONetwork inference without importing torch. Weights are stored as
+contiguous float32 arrays, either in one .npz file or as a directory of
+memory-mappable .npy files
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+
+# PPONetwork parameter names, in forward order
+LAYERS = ["shared_fc1", "shared_fc2", "actor_fc", "critic_fc"]
+
+
+class NumpyPolicy:
+    """PPO Actor-Critic inference in pure NumPy"""
+
+    def __init__(self, params, meta=None, seed=None):
+        # Torch layout: weight (out, in), bias (out,)
+        self.params = {k: np.ascontiguousarray(v, dtype=np.float32) for k, v in params.items()}
+        self.meta = meta or {}
+        self.state_dim = self.params["shared_fc1.weight"].shape[1]
+        self.hidden_dim = self.params["shared_fc1.weight"].shape[0]
+        self.action_dim = self.params["actor_fc.weight"].shape[0]
+        self.has_critic = "critic_fc.weight" in self.params
+        self.rng = np.random.default_rng(seed)
+
+        # Transposed views (in, out) so matmul needs no copy
+        self._w = {name: self.params[name + ".weight"].T for name in LAYERS
+                   if name + ".weight" in self.params}
+        self._b = {name: self.params[name + ".bias"] for name in LAYERS
+                   if name + ".bias" in self.params}
+        # Scratch buffers are per thread since one policy is shared by all sessions
+        self._local = threading.local()
+
+    @classmethod
+    def from_state_dict(cls, state_dict, meta=None):
+        """Convert a PPONetwork state_dict (torch tensors or arrays)"""
+        params = {}
+        for k, v in state_dict.items():
+            if hasattr(v, "detach"):
+                v = v.detach().cpu().numpy()
+            params[k] = np.asarray(v, dtype=np.float32)
+        return cls(params, meta=meta)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Load weights saved by `save`.
+
+        `path` is an .npz file or a directory of .npy files; directories are
+        memory-mapped unless `mmap` is False.
+        """
+        meta = None
+        if os.path.isdir(path):
+            params = {}
+            for filename in sorted(os.listdir(path)):
+                if filename.endswith(".npy"):
+                    params[filename[:-4]] = np.load(os.path.join(path, filename),
+                                                    mmap_mode="r" if mmap else None)
+            meta_path = os.path.join(path, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+        else:
+            with np.load(path) as data:
+                params = {k: data[k] for k in data.files if k != "meta"}
+                if "meta" in data.files:
+                    meta = json.loads(str(data["meta"]))
+        return cls(params, meta=meta)
+
+    def save(self, path):
+        """Save as an .npz file, or as a directory of .npy files if path has no suffix"""
+        if path.endswith(".npz"):
+            np.savez(path, meta=np.array(json.dumps(self.meta)), **self.params)
+            return
+
+        os.makedirs(path, exist_ok=True)
+        for k, v in self.params.items():
+            np.save(os.path.join(path, k + ".npy"), np.ascontiguousarray(v))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump(self.meta, f)
+
+    def _buffer(self, name, shape):
+        """Scratch array reused across calls with the same batch size"""
+        buffers = self._local.__dict__.setdefault("buffers", {})
+        buf = buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.float32)
+            buffers[name] = buf
+        return buf
+
+    def _linear(self, x, name, relu=False):
+        """x @ W + b (+ ReLU) computed in place in a scratch buffer"""
+        out = self._buffer(name, (x.shape[0], self._w[name].shape[1]))
+        np.matmul(x, self._w[name], out=out)
+        out += self._b[name]
+        if relu:
+            np.maximum(out, 0.0, out=out)
+        return out
+
+    def forward(self, states):
+        """
+        Forward pass: returns (logits, values) for a batch of states.
+
+        Both outputs live in scratch buffers overwritten by the next call.
+        """
+        x = np.asarray(states, dtype=np.float32)
+        if x.ndim == 1:
+            x = x[None, :]
+
+        h = self._linear(self._linear(x, "shared_fc1", relu=True), "shared_fc2", relu=True)
+        logits = self._linear(h, "actor_fc")
+        values = self._linear(h, "critic_fc")[:, 0] if self.has_critic else None
+        return logits, values
+
+    def predict(self, states):
+        """Return (probs, values) for a batch of states"""
+        logits, values = self.forward(states)
+        return softmax(logits), None if values is None else values.copy()
+
+    def get_action(self, state, deterministic=False):
+        """Get action for inference (same return format as PPONetwork.get_action)"""
+        logits, values = self.forward(state)
+        probs = softmax(logits)
+
+        if deterministic:
+            action = int(np.argmax(probs[0]))
+        else:
+            action = int(gumbel_argmax(logits, self.rng)[0])
+
+        value = None if values is None else float(values[0])
+        return action, probs.squeeze(), value
+
+    def act_batch(self, obs, actions_out, probs_out, values_out, deterministic=False, generator=None):
+        """Batched inference into caller-provided arrays (see PPONetwork.act_batch)"""
+        logits, values = self.forward(obs)
+        np.copyto(probs_out, softmax(logits))
+        if values is not None:
+            np.copyto(values_out, values)
+
+        if deterministic:
+            np.argmax(probs_out, axis=-1, out=actions_out)
+        else:
+            actions_out[:] = gumbel_argmax(logits, generator or self.rng)
+        return actions_out, probs_out, values_out
+
+
+def softmax(logits):
+    """Row-wise softmax"""
+    z = logits - logits.max(axis=-1, keepdims=True)
+    np.exp(z, out=z)
+    z /= z.sum(axis=-1, keepdims=True)
+    return z
+
+
+def gumbel_argmax(logits, rng):
+    """Sample from softmax(logits) with the Gumbel-max trick"""
+    return np.argmax(logits - np.log(rng.exponential(size=logits.shape)), axis=-1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a PPONetwork checkpoint to NumPy weights")
+    parser.add_argument("checkpoint", help="PPONetwork checkpoint (.ppo, or a torch.save state_dict)")
+    parser.add_argument("out", help="Output .npz file, or a directory for memory-mapped .npy files")
+    parser.add_argument("--env", default=None, help="Environment id to record in the metadata")
+    args = parser.parse_args()
+
+    import torch
+    from checkpoint_format import load_state_dict
+    from model_registry import checkpoint_hash
+
+    state_dict = load_state_dict(args.checkpoint, mmap=False)
+    # The registry rebuilds the .npz in memory once its source checkpoint changes
+    meta = {"env_name": args.env, "source_sha256": checkpoint_hash(args.checkpoint)}
+    policy = NumpyPolicy.from_state_dict(state_dict, meta=meta)
+    policy.save(args.out)
+
+    # Parity against the torch model
+    from ppo_network import PPONetwork
+    model = PPONetwork(policy.state_dim, policy.action_dim, policy.hidden_dim)
+    model.load_state_dict(state_dict)
+    model.eval()
+
+    states = np.random.default_rng(0).normal(size=(1000, policy.state_dim)).astype(np.float32)
+    with torch.no_grad():
+        logits, values = model(torch.from_numpy(states))
+    np_logits, np_values = NumpyPolicy.load(args.out).forward(states)
+    dl = float(np.abs(np_logits - logits.numpy()).max())
+    dv = float(np.abs(np_values - values.numpy()[:, 0]).max())
+
+    print(f"✅ Saved {args.out}")
+    print(f"   max |Δlogits| = {dl:.2e}, max |Δvalue| = {dv:.2e}")
+    return 0 if dl < 1e-4 and dv < 1e-4 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
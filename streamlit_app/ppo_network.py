@@ -9,6 +9,10 @@ class PPONetwork(nn.Module):
     
     def __init__(self, state_dim, action_dim, hidden_dim):
         super(PPONetwork, self).__init__()
+        self.state_dim = state_dim
+        self.action_dim = action_dim
+        # Autograd-free context for inference (see serving_config.grad_context)
+        self.grad_context = torch.no_grad
         
         # Shared layers
         self.shared_fc1 = nn.Linear(state_dim, hidden_dim)
@@ -38,7 +42,7 @@ class PPONetwork(nn.Module):
         if state.dim() == 1:
             state = state.unsqueeze(0)
         
-        with torch.no_grad():
+        with self.grad_context():
             logits, value = self.forward(state)
             probs = F.softmax(logits, dim=-1)
             
@@ -49,3 +53,35 @@ class PPONetwork(nn.Module):
                 action = dist.sample()
         
         return action.item(), probs.cpu().numpy().squeeze(), value.item()
+
+    def act_batch(self, obs, actions_out, probs_out, values_out, deterministic=False, generator=None):
+        """
+        Batched inference into caller-provided arrays.
+
+        obs:         float32 array (B, state_dim), read through a zero-copy view
+        actions_out: int64 array (B,)
+        probs_out:   float32 array (B, action_dim)
+        values_out:  float32 array (B,)
+
+        Stochastic actions use the Gumbel-max trick instead of building a
+        Categorical distribution. Deterministic actions are the argmax of the
+        same softmax used by get_action, so both paths pick identical actions.
+        """
+        state = torch.from_numpy(obs)
+        actions = torch.from_numpy(actions_out)
+        probs = torch.from_numpy(probs_out)
+        values = torch.from_numpy(values_out)
+
+        with self.grad_context():
+            logits, value = self.forward(state)
+            probs.copy_(F.softmax(logits, dim=-1))
+            values.copy_(value.squeeze(-1))
+
+            if deterministic:
+                torch.argmax(probs, dim=-1, out=actions)
+            else:
+                # Gumbel-max: argmax(logits + G), G = -log(E), E ~ Exp(1)
+                gumbel = torch.empty_like(logits).exponential_(generator=generator).log_().neg_()
+                torch.argmax(logits.add_(gumbel), dim=-1, out=actions)
+
+        return actions_out, probs_out, values_out
@@ -0,0 +1,284 @@
+import time
+
+import gymnasium as gym
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from ppo_network import PPONetwork
+from env_specs import get_spec
+
+
+class PPOConfig:
+    """Training hyperparameters; defaults are the ones the shipped checkpoints were trained with"""
+
+    def __init__(self, total_steps=200_000, num_envs=8, rollout_steps=256, epochs=5, minibatch_size=256,
+                 gamma=0.99, gae_lambda=0.95, lr_start=3e-4, lr_end=0.0, clip_start=0.2, clip_end=0.1,
+                 entropy_start=0.01, entropy_end=0.001, value_coef=0.5, max_grad_norm=0.5, seed=None,
+                 num_workers=0):
+        self.total_steps = total_steps
+        self.num_envs = num_envs
+        self.rollout_steps = rollout_steps
+        self.epochs = epochs
+        self.minibatch_size = minibatch_size
+        self.gamma = gamma
+        self.gae_lambda = gae_lambda
+        # Learning rate and clip epsilon decay linearly, the entropy coefficient exponentially
+        self.lr_start = lr_start
+        self.lr_end = lr_end
+        self.clip_start = clip_start
+        self.clip_end = clip_end
+        self.entropy_start = entropy_start
+        self.entropy_end = entropy_end
+        self.value_coef = value_coef
+        self.max_grad_norm = max_grad_norm
+        self.seed = seed
+        # Rollout worker processes (see rollout_pool.py); 0 steps the envs in this process
+        self.num_workers = num_workers
+
+    @property
+    def batch_size(self):
+        return self.num_envs * self.rollout_steps
+
+    def schedules(self, progress):
+        """(lr, clip epsilon, entropy coefficient) at `progress` in [0, 1]"""
+        lr = self.lr_start + (self.lr_end - self.lr_start) * progress
+        clip = self.clip_start + (self.clip_end - self.clip_start) * progress
+        entropy = self.entropy_start * (self.entropy_end / self.entropy_start) ** progress
+        return lr, clip, entropy
+
+
+class RolloutBuffer:
+    """
+    Preallocated (T, N, ...) tensors for T steps of N vector environments.
+
+    The numpy views share memory with the tensors, so the environment and
+    PPONetwork.act_batch write straight into the buffer without copies.
+    `arrays` supplies existing numpy arrays for the collected fields, such
+    as the shared-memory arrays of a RolloutPool.
+    """
+
+    def __init__(self, rollout_steps, num_envs, state_dim, action_dim, arrays=None):
+        shape = (rollout_steps, num_envs)
+        arrays = arrays or {}
+
+        def tensor(name, shape, dtype=torch.float32):
+            return torch.from_numpy(arrays[name]) if name in arrays else torch.zeros(shape, dtype=dtype)
+
+        self.obs = tensor('obs', shape + (state_dim,))
+        self.actions = tensor('actions', shape, torch.int64)
+        self.probs = tensor('probs', shape + (action_dim,))
+        self.values = tensor('values', shape)
+        self.rewards = tensor('rewards', shape)
+        # 1.0 where the episode ended at this step, terminated or truncated; a truncated
+        # step also has gamma * V(final obs) folded into its reward
+        self.dones = tensor('dones', shape)
+        self.advantages = torch.zeros(shape)
+        self.returns = torch.zeros(shape)
+        self.log_probs = torch.zeros(shape)
+
+        self.obs_np = self.obs.numpy()
+        self.actions_np = self.actions.numpy()
+        self.probs_np = self.probs.numpy()
+        self.values_np = self.values.numpy()
+        self.rewards_np = self.rewards.numpy()
+        self.dones_np = self.dones.numpy()
+
+    def __len__(self):
+        return self.obs.shape[0] * self.obs.shape[1]
+
+    def finalize(self, last_value, gamma, gae_lambda):
+        """Log-probabilities of the taken actions, GAE advantages and returns"""
+        self.log_probs.copy_(self.probs.gather(-1, self.actions.unsqueeze(-1)).squeeze(-1).clamp_min(1e-8).log())
+        compute_gae(self.rewards, self.values, self.dones, last_value, gamma, gae_lambda, out=self.advantages)
+        torch.add(self.advantages, self.values, out=self.returns)
+
+    def flat(self):
+        """Rollout as (T*N, ...) views for minibatching"""
+        n = len(self)
+        return (self.obs.view(n, -1), self.actions.view(n), self.log_probs.view(n),
+                self.advantages.view(n), self.returns.view(n))
+
+
+def compute_gae(rewards, values, dones, last_value, gamma, gae_lambda, out=None):
+    """
+    Generalized advantage estimates for (T, N) rollouts.
+
+    One reverse pass over time; every step updates all N environments at
+    once, so the Python loop runs T times rather than T * N. `dones` marks
+    every episode end, terminated or truncated, and cuts both the bootstrap
+    and the advantage chain there (a truncated step carries its own
+    gamma * V(final obs) in the reward); `last_value` is V(s_T) per env.
+    """
+    if out is None:
+        out = torch.empty_like(rewards)
+    not_done = 1.0 - dones
+    next_values = torch.cat([values[1:], last_value.unsqueeze(0)])
+    deltas = rewards + gamma * next_values * not_done - values
+    decay = gamma * gae_lambda * not_done
+
+    advantage = torch.zeros_like(last_value)
+    for t in range(rewards.shape[0] - 1, -1, -1):
+        advantage = deltas[t] + decay[t] * advantage
+        out[t] = advantage
+    return out
+
+
+class PPOTrainer:
+    """Clipped-surrogate PPO on a PPONetwork, with rollouts from a vector env"""
+
+    def __init__(self, env_name, config=None, model=None):
+        self.env_name = env_name
+        self.config = config or PPOConfig()
+        self.spec = get_spec(env_name)
+        cfg = self.config
+
+        if cfg.seed is not None:
+            torch.manual_seed(cfg.seed)
+        self.model = model or PPONetwork(**self.spec.model_config)
+        self.optimizer = torch.optim.Adam(self.model.parameters(), lr=cfg.lr_start, eps=1e-5)
+
+        self.generator = torch.Generator()
+        if cfg.seed is not None:
+            self.generator.manual_seed(cfg.seed)
+
+        self.pool = None
+        self.envs = None
+        if cfg.num_workers:
+            from rollout_pool import RolloutPool
+
+            # Workers step the envs and fill the buffer's shared arrays
+            self.pool = RolloutPool(env_name, cfg.num_envs, cfg.rollout_steps, cfg.num_workers,
+                                    gamma=cfg.gamma, seed=cfg.seed)
+            self.buffer = RolloutBuffer(cfg.rollout_steps, cfg.num_envs, self.spec.state_dim,
+                                        self.spec.action_dim, arrays=self.pool.shared.arrays)
+        else:
+            # Same-step autoreset: the returned obs already starts the next episode and the
+            # last obs of the finished one is in info["final_obs"], used to bootstrap truncation
+            self.envs = gym.vector.SyncVectorEnv([lambda: gym.make(env_name) for _ in range(cfg.num_envs)],
+                                                 autoreset_mode=gym.vector.AutoresetMode.SAME_STEP)
+            self.buffer = RolloutBuffer(cfg.rollout_steps, cfg.num_envs, self.spec.state_dim,
+                                        self.spec.action_dim)
+            self.obs, _ = self.envs.reset(seed=cfg.seed)
+
+        self.steps = 0
+        self.episode_returns = np.zeros(cfg.num_envs)
+        self.episode_lengths = np.zeros(cfg.num_envs, dtype=np.int64)
+        self.completed = []
+
+    def collect(self):
+        """Fill the rollout buffer; returns V(s_T) of the state after the last step"""
+        self.model.eval()
+        if self.pool is not None:
+            self.pool.broadcast(self.model)
+            self.completed.extend(self.pool.collect())
+            next_obs = torch.from_numpy(self.pool['next_obs'])
+        else:
+            next_obs = self._collect_local()
+
+        self.steps += len(self.buffer)
+        with torch.no_grad():
+            _, last_value = self.model(next_obs)
+        return last_value.squeeze(-1)
+
+    def _collect_local(self):
+        buf = self.buffer
+        cfg = self.config
+        for t in range(cfg.rollout_steps):
+            np.copyto(buf.obs_np[t], self.obs)
+            self.model.act_batch(buf.obs_np[t], buf.actions_np[t], buf.probs_np[t], buf.values_np[t],
+                                 generator=self.generator)
+
+            self.obs, reward, terminated, truncated, info = self.envs.step(buf.actions_np[t])
+            buf.rewards_np[t] = reward
+            # Both end the GAE chain: the next obs already belongs to the next episode
+            buf.dones_np[t] = terminated | truncated
+
+            # Truncated episodes did not end: fold gamma * V(final obs) into the reward
+            truncated_only = truncated & ~terminated
+            if truncated_only.any():
+                final_obs = np.stack(info["final_obs"][truncated_only]).astype(np.float32)
+                with torch.no_grad():
+                    _, final_value = self.model(torch.from_numpy(final_obs))
+                buf.rewards_np[t, truncated_only] += cfg.gamma * final_value.squeeze(-1).numpy()
+
+            self.episode_returns += reward
+            self.episode_lengths += 1
+            for i in np.flatnonzero(terminated | truncated):
+                self.completed.append((float(self.episode_returns[i]), int(self.episode_lengths[i])))
+                self.episode_returns[i] = 0.0
+                self.episode_lengths[i] = 0
+        return torch.as_tensor(self.obs, dtype=torch.float32)
+
+    def update(self, clip, entropy_coef):
+        """`epochs` passes of shuffled minibatch updates over the buffer"""
+        cfg = self.config
+        obs, actions, old_log_probs, advantages, returns = self.buffer.flat()
+        n = len(self.buffer)
+        self.model.train()
+
+        totals = {'policy_loss': 0.0, 'value_loss': 0.0, 'entropy': 0.0, 'clip_fraction': 0.0}
+        updates = 0
+        for _ in range(cfg.epochs):
+            order = torch.randperm(n, generator=self.generator)
+            for start in range(0, n, cfg.minibatch_size):
+                idx = order[start:start + cfg.minibatch_size]
+                logits, value = self.model(obs[idx])
+                log_probs_all = F.log_softmax(logits, dim=-1)
+                log_probs = log_probs_all.gather(-1, actions[idx].unsqueeze(-1)).squeeze(-1)
+                entropy = -(log_probs_all.exp() * log_probs_all).sum(-1).mean()
+
+                adv = advantages[idx]
+                adv = (adv - adv.mean()) / (adv.std() + 1e-8)
+                ratio = (log_probs - old_log_probs[idx]).exp()
+                policy_loss = -torch.min(ratio * adv, ratio.clamp(1 - clip, 1 + clip) * adv).mean()
+                value_loss = F.mse_loss(value.squeeze(-1), returns[idx])
+                loss = policy_loss + cfg.value_coef * value_loss - entropy_coef * entropy
+
+                self.optimizer.zero_grad(set_to_none=True)
+                loss.backward()
+                torch.nn.utils.clip_grad_norm_(self.model.parameters(), cfg.max_grad_norm)
+                self.optimizer.step()
+
+                totals['policy_loss'] += policy_loss.item()
+                totals['value_loss'] += value_loss.item()
+                totals['entropy'] += entropy.item()
+                totals['clip_fraction'] += ((ratio - 1).abs() > clip).float().mean().item()
+                updates += 1
+        return {name: total / updates for name, total in totals.items()}
+
+    def train_iteration(self):
+        """One rollout and update; returns the iteration's stats"""
+        cfg = self.config
+        lr, clip, entropy_coef = cfg.schedules(min(self.steps / cfg.total_steps, 1.0))
+        for group in self.optimizer.param_groups:
+            group['lr'] = lr
+
+        start = time.perf_counter()
+        last_value = self.collect()
+        self.buffer.finalize(last_value, cfg.gamma, cfg.gae_lambda)
+        rollout_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        losses = self.update(clip, entropy_coef)
+        update_s = time.perf_counter() - start
+
+        recent = self.completed[-20:]
+        return dict(
+            losses,
+            steps=self.steps,
+            lr=lr, clip=clip, entropy_coef=entropy_coef,
+            episodes=len(self.completed),
+            mean_return=float(np.mean([r for r, _ in recent])) if recent else None,
+            mean_length=float(np.mean([n for _, n in recent])) if recent else None,
+            rollout_s=rollout_s,
+            update_s=update_s,
+            rollout_steps_per_sec=len(self.buffer) / rollout_s,
+            steps_per_sec=len(self.buffer) / (rollout_s + update_s),
+        )
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+        if self.envs is not None:
+            self.envs.close()
@@ -0,0 +1,110 @@
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from env_specs import APP_DIR
+
+# Stages timed in the rendered episode loop
+EPISODE_STAGES = ("get_action", "env_step", "record", "render", "encode", "publish", "export", "sleep")
+
+# JSON-lines log of per-episode breakdowns
+PROFILE_LOG = os.environ.get("PPO_PROFILE_LOG", os.path.join(APP_DIR, ".profiles", "episodes.jsonl"))
+
+_log_lock = threading.Lock()
+
+
+class StageProfiler:
+    """
+    Per-stage wall-time samples and counters for one episode.
+
+    Samples go into preallocated arrays that grow by doubling, so recording
+    one costs a couple of array writes. Callers time stages with
+    time.perf_counter() and pass the duration to add(); stage() is a
+    convenience for code that is not on the per-step path.
+    """
+
+    def __init__(self, stages=EPISODE_STAGES, capacity=1024):
+        self.stages = tuple(stages)
+        self._samples = {stage: np.zeros(capacity) for stage in self.stages}
+        self._sizes = dict.fromkeys(self.stages, 0)
+        self.counters = {}
+        self.start_time = time.perf_counter()
+
+    def reset(self):
+        self._sizes = dict.fromkeys(self.stages, 0)
+        self.counters = {}
+        self.start_time = time.perf_counter()
+
+    def add(self, stage, seconds):
+        """Record one duration for a stage"""
+        samples = self._samples[stage]
+        size = self._sizes[stage]
+        if size == len(samples):
+            samples = self._samples[stage] = np.resize(samples, 2 * len(samples))
+        samples[size] = seconds
+        self._sizes[stage] = size + 1
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def samples(self, stage):
+        return self._samples[stage][:self._sizes[stage]]
+
+    def summary(self, steps=None):
+        """Per-stage count, total and p50/p95/p99 in ms, plus steps/sec and frames/sec"""
+        wall = time.perf_counter() - self.start_time
+        stages = {}
+        for stage in self.stages:
+            samples = self.samples(stage)
+            if len(samples) == 0:
+                continue
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+            stages[stage] = {
+                'count': int(len(samples)),
+                'total_ms': float(samples.sum() * 1000),
+                'share': float(samples.sum() / wall) if wall > 0 else 0.0,
+                'p50_ms': float(p50),
+                'p95_ms': float(p95),
+                'p99_ms': float(p99),
+            }
+
+        frames = self.counters.get('frames', 0)
+        return {
+            'wall_s': wall,
+            'steps': steps,
+            'steps_per_sec': steps / wall if steps and wall > 0 else None,
+            'frames_per_sec': frames / wall if wall > 0 else None,
+            'counters': dict(self.counters),
+            'stages': stages,
+        }
+
+
+def library_versions():
+    """Versions of the libraries whose upgrades the profile log is meant to catch"""
+    versions = {'python': sys.version.split()[0], 'numpy': np.__version__}
+    for name in ("torch", "gymnasium", "streamlit"):
+        module = sys.modules.get(name)
+        if module is not None:
+            versions[name] = getattr(module, "__version__", None)
+    return versions
+
+
+def append_profile_log(entry, path=PROFILE_LOG):
+    """Append one JSON line to the profile log"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line = json.dumps(dict(entry, time=time.strftime("%Y-%m-%d %H:%M:%S"), versions=library_versions()))
+    with _log_lock, open(path, "a") as f:
+        f.write(line + "\n")
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Policy Quantization Script
+Writes dynamic-int8 and float16/bfloat16 variants of a PPONetwork checkpoint
+and reports action agreement, episode reward, CPU latency and memory of each
+variant against the float32 baseline
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import gymnasium as gym
+import numpy as np
+
+from model_registry import (MODEL_CONFIGS, DEFAULT_CHECKPOINTS, PRECISIONS, get_model, variant_checkpoint_path,
+                            checkpoint_hash)
+from quantized_policy import quantize, model_nbytes, save_variant
+from evaluator import evaluate
+import serving_config
+
+
+def collect_states(model, env_name, num_episodes, seed):
+    """States visited by the float32 policy over seeded deterministic episodes"""
+    env = gym.make(env_name)
+    states = []
+    for i in range(num_episodes):
+        state, _ = env.reset(seed=seed + i)
+        done = False
+        while not done:
+            states.append(state)
+            action, _, _ = model.get_action(state, deterministic=True)
+            state, _, terminated, truncated, _ = env.step(action)
+            done = terminated or truncated
+    env.close()
+    return np.asarray(states, dtype=np.float32)
+
+
+def predict(model, states):
+    """Deterministic actions and probabilities for a batch of states"""
+    actions = np.empty(len(states), dtype=np.int64)
+    probs = np.empty((len(states), model.action_dim), dtype=np.float32)
+    values = np.empty(len(states), dtype=np.float32)
+    model.act_batch(states, actions, probs, values, deterministic=True)
+    return actions, probs
+
+
+def median_us(fn, iters, repeats=5):
+    """Median microseconds per call of fn()"""
+    for _ in range(50):
+        fn()
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(iters):
+            fn()
+        times.append((time.perf_counter() - start) / iters)
+    return float(np.median(times)) * 1e6
+
+
+def evaluate_variant(model, env_name, states, ref_actions, ref_probs, episodes, seed, iters):
+    """Agreement with the float32 actions, seeded episode reward, latency and size"""
+    actions, probs = predict(model, states)
+    rewards = [r['reward'] for r in evaluate(model, env_name, episodes, deterministic=True, seed=seed)]
+    batch = states[:256]
+    out = (np.empty(len(batch), dtype=np.int64), np.empty((len(batch), model.action_dim), dtype=np.float32),
+           np.empty(len(batch), dtype=np.float32))
+
+    return {
+        'action_agreement': float((actions == ref_actions).mean()),
+        'max_prob_error': float(np.abs(probs - ref_probs).max()),
+        'mean_reward': float(np.mean(rewards)),
+        'std_reward': float(np.std(rewards)),
+        'get_action_us': median_us(lambda: model.get_action(states[0], deterministic=True), iters),
+        'act_batch_256_us': median_us(lambda: model.act_batch(batch, *out, deterministic=True), max(1, iters // 10)),
+        'size_bytes': model_nbytes(model),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Quantize a PPO policy and compare it against float32")
+    parser.add_argument("--env", default="CartPole-v1", choices=sorted(MODEL_CONFIGS))
+    parser.add_argument("--checkpoint", default=None, help="Defaults to the shipped checkpoint")
+    parser.add_argument("--precisions", nargs="+", default=["int8", "fp16", "bf16"],
+                        choices=[p for p in PRECISIONS if p != "fp32"])
+    parser.add_argument("--episodes", type=int, default=50, help="Seeded episodes per variant")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iters", type=int, default=1000, help="Calls per latency measurement")
+    parser.add_argument("--no-save", action="store_true", help="Report only, do not write variant files")
+    parser.add_argument("--out", default=None, help="Write the report as JSON")
+    args = parser.parse_args()
+
+    checkpoint_path = args.checkpoint or DEFAULT_CHECKPOINTS[args.env]
+    model, loaded = get_model(args.env, checkpoint_path)
+    if not loaded:
+        print("❌ Checkpoint not found, refusing to quantize random weights")
+        return 1
+    model = getattr(model, "policy", model)
+    serving_config.configure_torch()
+
+    print(f"🚀 Collecting states from {args.episodes} float32 episodes of {args.env}...")
+    states = collect_states(model, args.env, args.episodes, args.seed)
+    ref_actions, ref_probs = predict(model, states)
+
+    report = {'env_name': args.env, 'checkpoint': checkpoint_path, 'episodes': args.episodes,
+              'seed': args.seed, 'states': len(states), 'variants': {}}
+    report['variants']['fp32'] = evaluate_variant(model, args.env, states, ref_actions, ref_probs,
+                                                  args.episodes, args.seed, args.iters)
+
+    for precision in args.precisions:
+        variant = quantize(model, precision)
+        variant.eval()
+        variant.requires_grad_(False)
+        variant.grad_context = serving_config.grad_context()
+        report['variants'][precision] = evaluate_variant(variant, args.env, states, ref_actions, ref_probs,
+                                                         args.episodes, args.seed, args.iters)
+        if not args.no_save:
+            path = variant_checkpoint_path(checkpoint_path, precision)
+            save_variant(path, variant, checkpoint_hash(checkpoint_path))
+            report['variants'][precision]['path'] = path
+            print(f"✅ {precision:<5s} -> {path}")
+
+    base = report['variants']['fp32']
+    print(f"\n{'variant':<8s} {'agree':>7s} {'max|dp|':>9s} {'reward':>14s} {'us/step':>8s} "
+          f"{'us/B256':>8s} {'KB':>7s}")
+    for precision, r in report['variants'].items():
+        print(f"{precision:<8s} {r['action_agreement'] * 100:>6.2f}% {r['max_prob_error']:>9.2e} "
+              f"{r['mean_reward']:>7.1f}±{r['std_reward']:<6.1f} {r['get_action_us']:>8.1f} "
+              f"{r['act_batch_256_us']:>8.1f} {r['size_bytes'] / 1024:>7.1f}")
+    print(f"\n📊 {len(states)} states from float32 episodes; speedups vs fp32: " + ", ".join(
+        f"{p} {base['get_action_us'] / r['get_action_us']:.2f}x" for p, r in report['variants'].items()
+        if p != "fp32"))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📊 Report written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import copy
+import io
+import warnings
+
+import torch
+import torch.nn as nn
+
+from ppo_network import PPONetwork
+from model_registry import PRECISIONS
+
+HALF_DTYPES = {"fp16": torch.float16, "bf16": torch.bfloat16}
+
+
+class HalfPrecisionNetwork(PPONetwork):
+    """PPONetwork with fp16/bf16 weights; takes and returns float32 like the original"""
+
+    def forward(self, state):
+        logits, value = super().forward(state.to(self.shared_fc1.weight.dtype))
+        return logits.float(), value.float()
+
+
+def _quantize_dynamic(model):
+    # Eager-mode dynamic quantization is deprecated upstream but still the only built-in int8 Linear on CPU
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        # Per-channel weight scales track the float policy more closely than one scale per layer
+        qconfig = torch.ao.quantization.per_channel_dynamic_qconfig
+        return torch.ao.quantization.quantize_dynamic(model, {nn.Linear: qconfig})
+
+
+def quantize(model, precision):
+    """Copy of a float32 PPONetwork at the given precision"""
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision: {precision}")
+    if precision == "fp32":
+        return model
+
+    model = copy.deepcopy(model)
+    if precision == "int8":
+        return _quantize_dynamic(model)
+
+    half = HalfPrecisionNetwork(model.state_dim, model.action_dim, model.shared_fc1.out_features)
+    half.load_state_dict(model.state_dict())
+    return half.to(HALF_DTYPES[precision])
+
+
+def build_network(config, precision):
+    """Empty network with the module layout a saved variant's state_dict expects"""
+    model = PPONetwork(**config)
+    if precision == "int8":
+        return _quantize_dynamic(model)
+    if precision in HALF_DTYPES:
+        return HalfPrecisionNetwork(**config).to(HALF_DTYPES[precision])
+    return model
+
+
+def save_variant(path, model, source_sha256):
+    """torch.save a variant with the weight hash of the float32 checkpoint it was quantized from"""
+    torch.save({'state_dict': model.state_dict(), 'source_sha256': source_sha256}, path)
+
+
+def load_variant(path):
+    """
+    (state_dict, source_sha256) of a saved variant, quieting the deprecation
+    warnings of packed int8 weights; the hash is None for bare state_dicts
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        data = torch.load(path, map_location="cpu")
+    if 'source_sha256' in data:
+        return data['state_dict'], data['source_sha256']
+    return data, None
+
+
+def model_nbytes(model):
+    """Serialized size of a model's state_dict (packed int8 weights included)"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes
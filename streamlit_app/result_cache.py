@@ -0,0 +1,60 @@
+import json
+import os
+import tempfile
+
+from env_specs import APP_DIR
+
+# Per-episode results of seeded deterministic runs, one JSON file per key
+RESULT_CACHE_DIR = os.environ.get("PPO_RESULT_CACHE", os.path.join(APP_DIR, ".eval_cache", "episodes"))
+
+
+class ResultCache:
+    """
+    Episode records memoized by (checkpoint hash, env id, seed, deterministic).
+
+    A deterministic policy from the same checkpoint, reset with the same seed,
+    plays the same episode, so its record (and recording, if one was kept) can
+    be served instead of running it again.
+    """
+
+    def __init__(self, root=RESULT_CACHE_DIR):
+        self.root = root
+
+    def _path(self, digest, env_name, seed, deterministic):
+        mode = "det" if deterministic else "stoch"
+        return os.path.join(self.root, f"{env_name}_{digest[:16]}_{mode}_{seed}.json")
+
+    def get(self, digest, env_name, seed, deterministic, max_steps):
+        """Stored entry ({'record', 'trajectory'}), or None"""
+        try:
+            with open(self._path(digest, env_name, seed, deterministic), "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('max_steps') != max_steps:
+            return None
+
+        # Recordings are pruned independently; serve the record without frames then
+        if entry.get('trajectory') and not os.path.exists(entry['trajectory']):
+            entry['trajectory'] = None
+        return entry
+
+    def put(self, digest, env_name, seed, deterministic, max_steps, record, trajectory=None):
+        """Store one episode atomically"""
+        os.makedirs(self.root, exist_ok=True)
+        entry = {
+            'checkpoint_hash': digest,
+            'env_name': env_name,
+            'seed': seed,
+            'deterministic': deterministic,
+            'max_steps': max_steps,
+            'record': record,
+            'trajectory': trajectory,
+        }
+        path = self._path(digest, env_name, seed, deterministic)
+        # Unique per writer: runner threads share a PID and may store the same key
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        return entry
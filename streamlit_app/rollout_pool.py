@@ -0,0 +1,284 @@
+import multiprocessing as mp
+import traceback
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from env_specs import get_spec
+
+
+class SharedArrays:
+    """NumPy arrays in named shared-memory blocks, created by the parent and attached by workers"""
+
+    def __init__(self):
+        self.specs = {}
+        self.arrays = {}
+        self._blocks = []
+
+    def create(self, name, shape, dtype):
+        dtype = np.dtype(dtype)
+        size = max(int(np.prod(shape)) * dtype.itemsize, 1)
+        block = shared_memory.SharedMemory(create=True, size=size)
+        self._blocks.append(block)
+        self.specs[name] = (block.name, tuple(shape), dtype.str)
+        self.arrays[name] = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+        self.arrays[name].fill(0)
+        return self.arrays[name]
+
+    @classmethod
+    def attach(cls, specs):
+        shared = cls()
+        for name, (block_name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            shared._blocks.append(block)
+            shared.specs[name] = (block_name, shape, dtype)
+            shared.arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return shared
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def close(self, unlink=False):
+        self.arrays.clear()
+        for block in self._blocks:
+            block.close()
+            if unlink:
+                block.unlink()
+        self._blocks = []
+
+
+def _worker(index, env_name, env_slice, specs, gamma, seed, conn):
+    """
+    Owns envs [lo, hi) of the pool. Commands arrive over `conn`; bulk data
+    (observations, actions, rewards, dones, weights, episode stats) moves
+    only through the shared arrays.
+    """
+    import gymnasium as gym
+    import torch
+
+    from ppo_network import PPONetwork
+    from evaluator import _run_batch
+
+    torch.set_num_threads(1)
+    spec = get_spec(env_name)
+    shared = SharedArrays.attach(specs)
+    lo, hi = env_slice
+    num_envs = hi - lo
+
+    model = PPONetwork(**spec.model_config)
+    model.eval()
+    params = list(model.parameters())
+    weights = torch.from_numpy(shared['weights'])
+    version = -1
+
+    generator = torch.Generator()
+    if seed is not None:
+        generator.manual_seed(seed + 7919 * index)
+
+    envs = gym.vector.SyncVectorEnv([lambda: gym.make(env_name) for _ in range(num_envs)],
+                                    autoreset_mode=gym.vector.AutoresetMode.SAME_STEP)
+    obs, _ = envs.reset(seed=None if seed is None else seed + lo)
+    episode_returns = np.zeros(num_envs)
+    episode_lengths = np.zeros(num_envs, dtype=np.int64)
+
+    try:
+        while True:
+            command, args = conn.recv()
+            if command == "close":
+                break
+            try:
+                # Reload weights only when the learner has broadcast new ones
+                if args['version'] != version:
+                    with torch.no_grad():
+                        torch.nn.utils.vector_to_parameters(weights, params)
+                    version = args['version']
+
+                if command == "collect":
+                    completed = []
+                    for t in range(shared['obs'].shape[0]):
+                        np.copyto(shared['obs'][t, lo:hi], obs)
+                        model.act_batch(shared['obs'][t, lo:hi], shared['actions'][t, lo:hi],
+                                        shared['probs'][t, lo:hi], shared['values'][t, lo:hi],
+                                        deterministic=args['deterministic'], generator=generator)
+                        obs, reward, terminated, truncated, info = envs.step(shared['actions'][t, lo:hi])
+                        rewards = shared['rewards'][t, lo:hi]
+                        rewards[:] = reward
+                        # Both end the GAE chain, as in PPOTrainer._collect_local
+                        shared['dones'][t, lo:hi] = terminated | truncated
+
+                        # Truncated episodes did not end: fold gamma * V(final obs) into the reward
+                        truncated_only = truncated & ~terminated
+                        if truncated_only.any():
+                            final_obs = np.stack(info["final_obs"][truncated_only]).astype(np.float32)
+                            with torch.no_grad():
+                                _, final_value = model(torch.from_numpy(final_obs))
+                            rewards[truncated_only] += gamma * final_value.squeeze(-1).numpy()
+
+                        episode_returns += reward
+                        episode_lengths += 1
+                        for i in np.flatnonzero(terminated | truncated):
+                            completed.append((float(episode_returns[i]), int(episode_lengths[i])))
+                            episode_returns[i] = 0.0
+                            episode_lengths[i] = 0
+                    np.copyto(shared['next_obs'][lo:hi], obs)
+                    conn.send(("ok", completed))
+
+                elif command == "evaluate":
+                    # Chunks of num_envs consecutive episodes; row i of the stats arrays is episode i
+                    results = SharedArrays.attach(args['result_specs'])
+                    for start in args['chunks']:
+                        stats = _run_batch(model, envs, num_envs, args['deterministic'],
+                                           None if args['seed'] is None else args['seed'] + start,
+                                           args['max_steps'], spec.action_dim, spec.history_actions)
+                        n = min(num_envs, args['num_episodes'] - start)
+                        rows = slice(start, start + n)
+                        results['reward'][rows] = stats.reward[:n]
+                        results['length'][rows] = stats.length[:n]
+                        results['action_counts'][rows] = stats.action_counts[:n]
+                        results['value_sum'][rows] = stats.value_sum[:n]
+                        results['entropy_sum'][rows] = stats.entropy_sum[:n]
+                    results.close()
+                    # Training rollouts continue from fresh episodes
+                    obs, _ = envs.reset()
+                    episode_returns[:] = 0.0
+                    episode_lengths[:] = 0
+                    conn.send(("ok", None))
+            except Exception:
+                conn.send(("error", traceback.format_exc()))
+    finally:
+        envs.close()
+        shared.close()
+
+
+class RolloutPool:
+    """
+    Worker processes that each step a contiguous slice of `num_envs` environments.
+
+    Every worker runs its own PPONetwork copy on its slice and writes
+    observations, actions, probabilities, values, rewards and dones of
+    `rollout_steps` steps straight into shared-memory arrays (T, N, ...),
+    which the learner wraps as tensors without copying or pickling. The
+    learner sends nothing back but the flattened weights, through one more
+    shared array; workers reload them when its version changes. Only
+    commands and finished-episode summaries travel over the pipes.
+    """
+
+    def __init__(self, env_name, num_envs, rollout_steps, num_workers, gamma=0.99, seed=None):
+        spec = get_spec(env_name)
+        self.env_name = env_name
+        self.num_envs = num_envs
+        self.num_workers = min(num_workers, num_envs)
+        self.version = 0
+
+        from ppo_network import PPONetwork
+        num_params = sum(p.numel() for p in PPONetwork(**spec.model_config).parameters())
+
+        self.shared = SharedArrays()
+        shape = (rollout_steps, num_envs)
+        self.shared.create('obs', shape + (spec.state_dim,), np.float32)
+        self.shared.create('actions', shape, np.int64)
+        self.shared.create('probs', shape + (spec.action_dim,), np.float32)
+        self.shared.create('values', shape, np.float32)
+        self.shared.create('rewards', shape, np.float32)
+        self.shared.create('dones', shape, np.float32)
+        self.shared.create('next_obs', (num_envs, spec.state_dim), np.float32)
+        self.shared.create('weights', (num_params,), np.float32)
+
+        bounds = np.linspace(0, num_envs, self.num_workers + 1).astype(int)
+        self.slices = [(int(bounds[i]), int(bounds[i + 1])) for i in range(self.num_workers)]
+        ctx = mp.get_context("spawn")
+        self._conns = []
+        self._procs = []
+        for i, env_slice in enumerate(self.slices):
+            parent, child = ctx.Pipe()
+            proc = ctx.Process(target=_worker, name=f"rollout-{i}", daemon=True,
+                               args=(i, env_name, env_slice, self.shared.specs, gamma, seed, child))
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def __getitem__(self, name):
+        return self.shared[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def broadcast(self, model):
+        """Publish the model's current weights to every worker"""
+        import torch
+        with torch.no_grad():
+            flat = torch.nn.utils.parameters_to_vector(model.parameters())
+        np.copyto(self.shared['weights'], flat.numpy())
+        self.version += 1
+
+    def _call(self, command, args_per_worker):
+        for conn, args in zip(self._conns, args_per_worker):
+            conn.send((command, dict(args, version=self.version)))
+        replies = [conn.recv() for conn in self._conns]
+        for status, payload in replies:
+            if status == "error":
+                raise RuntimeError(f"Rollout worker failed:\n{payload}")
+        return [payload for _, payload in replies]
+
+    def collect(self, deterministic=False):
+        """Fill the shared rollout arrays; returns the (return, length) of episodes finished meanwhile"""
+        replies = self._call("collect", [{'deterministic': deterministic}] * self.num_workers)
+        return [episode for completed in replies for episode in completed]
+
+    def evaluate(self, num_episodes, deterministic=True, seed=None, max_steps=None, solved_threshold=None):
+        """
+        Run `num_episodes` episodes across the workers and return one record
+        per episode, like evaluator.evaluate; episode i uses seed + i.
+        """
+        from episode_stats import make_record
+
+        spec = get_spec(self.env_name)
+        max_steps = max_steps or spec.max_steps
+        solved_threshold = spec.solved_threshold if solved_threshold is None else solved_threshold
+        # Per-episode stats of this call, one row per episode
+        results = SharedArrays()
+        results.create('reward', (num_episodes,), np.float64)
+        results.create('length', (num_episodes,), np.int64)
+        results.create('action_counts', (num_episodes, spec.action_dim), np.int64)
+        results.create('value_sum', (num_episodes,), np.float64)
+        results.create('entropy_sum', (num_episodes,), np.float64)
+
+        # Chunks are dealt round-robin, each as wide as its worker's slice
+        args = []
+        chunk_starts = [[] for _ in range(self.num_workers)]
+        start, w = 0, 0
+        while start < num_episodes:
+            chunk_starts[w].append(start)
+            lo, hi = self.slices[w]
+            start += hi - lo
+            w = (w + 1) % self.num_workers
+        for w in range(self.num_workers):
+            args.append({'chunks': chunk_starts[w], 'num_episodes': num_episodes, 'deterministic': deterministic,
+                         'seed': seed, 'max_steps': max_steps, 'result_specs': results.specs})
+        try:
+            self._call("evaluate", args)
+            length = results['length']
+            return [make_record(i + 1, results['reward'][i], length[i], results['action_counts'][i],
+                                solved_threshold, results['value_sum'][i] / max(length[i], 1),
+                                results['entropy_sum'][i] / max(length[i], 1), spec.history_actions)
+                    for i in range(num_episodes)]
+        finally:
+            results.close(unlink=True)
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=5)
+            if proc.is_alive():
+                proc.terminate()
+        self._conns = []
+        self._procs = []
+        self.shared.close(unlink=True)
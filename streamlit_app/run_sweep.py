@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Hyperparameter Sweep Runner
+Grid or random search over hidden_dim and PPO hyperparameters, one trial per
+pinned worker process, with median early stopping and a resumable SQLite store
+"""
+
+import argparse
+import inspect
+import itertools
+import json
+import multiprocessing as mp
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from env_specs import ENV_SPECS
+from sweep_store import SweepStore, SWEEP_DB
+
+# Values around the schedules shown in the Analysis tab
+DEFAULT_SPACE = {
+    "hidden_dim": [64, 128, 256],
+    "lr_start": [1e-4, 3e-4, 1e-3],
+    "clip_start": [0.1, 0.2, 0.3],
+    "entropy_start": [0.0, 0.01, 0.03],
+}
+
+# Trial settings fixed by the sweep, not searched
+FIXED = ("total_steps", "seed", "num_workers")
+
+
+def searchable_params():
+    from ppo_trainer import PPOConfig
+    names = [name for name in inspect.signature(PPOConfig).parameters if name not in FIXED]
+    return ["hidden_dim"] + names
+
+
+def grid_trials(space):
+    """Every combination of the listed values"""
+    for name, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"Grid search needs a list of values for {name}")
+    names = sorted(space)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(space[n] for n in names))]
+
+
+def _sample(values, rng):
+    if isinstance(values, list):
+        return values[rng.integers(len(values))]
+    low, high = values['low'], values['high']
+    if values.get('log'):
+        value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+    else:
+        value = float(rng.uniform(low, high))
+    return int(round(value)) if values.get('int') else value
+
+
+def random_trials(space, num_trials, seed):
+    """
+    `num_trials` independent draws: a list is sampled uniformly, and a
+    {"low", "high", "log", "int"} range is sampled (log-)uniformly
+    """
+    rng = np.random.default_rng(seed)
+    names = sorted(space)
+    return [{name: _sample(space[name], rng) for name in names} for _ in range(num_trials)]
+
+
+def _init_worker(counter, cpus):
+    """Pin each pool process to its own CPU and keep torch single-threaded"""
+    with counter.get_lock():
+        index = counter.value
+        counter.value += 1
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+
+    import torch
+    torch.set_num_threads(1)
+
+
+def run_trial(db_path, sweep, trial_id, params, env_name, settings):
+    """Train, evaluate and record one trial inside a worker process"""
+    import torch
+    from ppo_network import PPONetwork
+    from ppo_trainer import PPOConfig, PPOTrainer
+    from evaluator import evaluate
+    from env_specs import get_spec
+
+    store = SweepStore(db_path)
+    store.start_trial(sweep, trial_id)
+    start = time.perf_counter()
+    trainer = None
+    try:
+        spec = get_spec(env_name)
+        params = dict(params)
+        hidden_dim = int(params.pop('hidden_dim', spec.hidden_dim))
+        if 'num_envs' in params:
+            params['num_envs'] = int(params['num_envs'])
+        config = PPOConfig(total_steps=settings['total_steps'], seed=settings['seed'], **params)
+        torch.manual_seed(settings['seed'])
+        model = PPONetwork(spec.state_dim, spec.action_dim, hidden_dim)
+        trainer = PPOTrainer(env_name, config, model=model)
+
+        best = None
+        pruned = False
+        while trainer.steps < config.total_steps:
+            stats = trainer.train_iteration()
+            if stats['mean_return'] is None:
+                continue
+            best = stats['mean_return'] if best is None else max(best, stats['mean_return'])
+            store.report(sweep, trial_id, trainer.steps, stats['mean_return'])
+
+            # Median stopping: past the warm-up, give up on trials below the median of the others
+            if settings['prune'] and trainer.steps >= settings['warmup_fraction'] * config.total_steps:
+                others = store.returns_at(sweep, trainer.steps, exclude=trial_id)
+                if len(others) >= settings['min_trials'] and best < float(np.median(others)):
+                    pruned = True
+                    break
+
+        wall_s = time.perf_counter() - start
+        result = {'train_return': best, 'steps': trainer.steps, 'steps_per_sec': trainer.steps / wall_s,
+                  'wall_s': wall_s}
+        resolved = dict(vars(config), hidden_dim=hidden_dim)
+        if pruned:
+            store.finish_trial(sweep, trial_id, "pruned", config=resolved, **result)
+            return dict(result, trial_id=trial_id, status="pruned", score=None)
+
+        # Scored on seeded deterministic episodes, not the noisy training returns
+        records = evaluate(trainer.model, env_name, settings['eval_episodes'], deterministic=True,
+                           seed=settings['seed'] + 10_000)
+        score = float(np.mean([r['reward'] for r in records]))
+        store.finish_trial(sweep, trial_id, "complete", score=score, config=resolved, **result)
+        return dict(result, trial_id=trial_id, status="complete", score=score)
+    except Exception:
+        error = traceback.format_exc()
+        store.finish_trial(sweep, trial_id, "failed", wall_s=time.perf_counter() - start, error=error)
+        return {'trial_id': trial_id, 'status': "failed", 'score': None, 'error': error}
+    finally:
+        if trainer is not None:
+            trainer.close()
+        store.close()
+
+
+def print_leaderboard(store, sweep, top=5):
+    trials = [t for t in store.trials(sweep) if t['status'] == "complete"]
+    trials.sort(key=lambda t: t['score'], reverse=True)
+    counts = {}
+    for t in store.trials(sweep):
+        counts[t['status']] = counts.get(t['status'], 0) + 1
+    print(f"\n📊 {sweep}: " + ", ".join(f"{n} {status}" for status, n in sorted(counts.items())))
+    for t in trials[:top]:
+        params = ", ".join(f"{k}={v:g}" if isinstance(v, float) else f"{k}={v}" for k, v in t['params'].items())
+        print(f"   #{t['trial_id']:<4d} score {t['score']:7.1f}  ({params})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel, resumable PPO hyperparameter sweep")
+    parser.add_argument("--env", default="CartPole-v1", choices=sorted(ENV_SPECS))
+    parser.add_argument("--name", default=None, help="Sweep name; re-running the same name resumes it")
+    parser.add_argument("--method", default="grid", choices=["grid", "random"])
+    parser.add_argument("--trials", type=int, default=20, help="Number of random-search trials")
+    parser.add_argument("--space", default=None, help="JSON file with the search space (default: built in)")
+    parser.add_argument("--total-steps", type=int, default=100_000, help="Training steps per trial")
+    parser.add_argument("--eval-episodes", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Trials run in parallel")
+    parser.add_argument("--cpus", type=int, nargs="*", default=None,
+                        help="CPUs to pin workers to (default: all this process may use)")
+    parser.add_argument("--no-prune", action="store_true", help="Disable median early stopping")
+    parser.add_argument("--warmup", type=float, default=0.25,
+                        help="Fraction of a trial's steps before it can be pruned")
+    parser.add_argument("--min-trials", type=int, default=3, help="Trials needed before the median is trusted")
+    parser.add_argument("--db", default=SWEEP_DB)
+    args = parser.parse_args()
+
+    space = DEFAULT_SPACE
+    if args.space:
+        with open(args.space, "r") as f:
+            space = json.load(f)
+    unknown = set(space) - set(searchable_params())
+    if unknown:
+        parser.error(f"Not searchable: {', '.join(sorted(unknown))}")
+
+    name = args.name or f"{args.env}-{args.method}"
+    settings = {'total_steps': args.total_steps, 'eval_episodes': args.eval_episodes, 'seed': args.seed,
+                'prune': not args.no_prune, 'warmup_fraction': args.warmup, 'min_trials': args.min_trials}
+    trials = grid_trials(space) if args.method == "grid" else random_trials(space, args.trials, args.seed)
+
+    store = SweepStore(args.db)
+    if store.create_sweep(name, args.env, args.method, space, settings, trials):
+        print(f"🚀 New sweep {name}: {len(trials)} trials of {args.env}")
+    else:
+        # The stored trials and settings win, so a resumed sweep is the same sweep
+        sweep = store.get_sweep(name)
+        if sweep['env_name'] != args.env:
+            parser.error(f"Sweep {name} is for {sweep['env_name']}")
+        settings = sweep['settings']
+        reset = store.reset_interrupted(name)
+        print(f"🚀 Resuming sweep {name}" + (f" ({reset} interrupted trials restarted)" if reset else ""))
+
+    pending = store.pending_trials(name)
+    if not pending:
+        print("✅ Nothing left to run")
+        print_leaderboard(store, name)
+        return 0
+
+    cpus = args.cpus
+    if cpus is None and hasattr(os, "sched_getaffinity"):
+        cpus = sorted(os.sched_getaffinity(0))
+    workers = max(1, min(args.workers, len(pending)))
+    print(f"   {len(pending)} pending on {workers} workers" + (f", pinned to CPUs {cpus}" if cpus else ""))
+
+    ctx = mp.get_context("spawn")
+    counter = ctx.Value("i", 0)
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=_init_worker,
+                             initargs=(counter, cpus)) as pool:
+        futures = [pool.submit(run_trial, args.db, name, trial_id, params, args.env, settings)
+                   for trial_id, params in pending]
+        for future in as_completed(futures):
+            result = future.result()
+            if result['status'] == "complete":
+                print(f"✅ trial {result['trial_id']}: score {result['score']:.1f} "
+                      f"({result['steps_per_sec']:.0f} steps/s, {result['wall_s']:.0f}s)")
+            elif result['status'] == "pruned":
+                print(f"⚠️  trial {result['trial_id']}: pruned at {result['steps']} steps "
+                      f"(best return {result['train_return']:.1f})")
+            else:
+                failed += 1
+                print(f"❌ trial {result['trial_id']} failed:\n{result['error']}")
+
+    print_leaderboard(store, name)
+    store.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
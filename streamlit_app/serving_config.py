@@ -0,0 +1,62 @@
+import os
+import threading
+
+# CPU serving settings, read once at startup
+TORCH_THREADS = int(os.environ.get("PPO_TORCH_THREADS", "1"))
+TORCH_INTEROP_THREADS = int(os.environ.get("PPO_TORCH_INTEROP_THREADS", "1"))
+INFERENCE_MODE = os.environ.get("PPO_INFERENCE_MODE", "1") == "1"
+
+# Micro-batching of get_action calls from concurrent sessions
+MICROBATCH = os.environ.get("PPO_MICROBATCH", "0") == "1"
+MICROBATCH_WINDOW_MS = float(os.environ.get("PPO_MICROBATCH_WINDOW_MS", "1"))
+MICROBATCH_MAX = int(os.environ.get("PPO_MICROBATCH_MAX", "64"))
+
+_configured = False
+_lock = threading.Lock()
+
+
+def configure_torch():
+    """
+    Apply the thread settings to torch once per process.
+
+    Every forward pass here is tiny, so the default of one intra-op thread
+    per core only makes concurrent sessions fight over cores. Interop threads
+    can only be set before torch runs any parallel work; if that has already
+    happened the current value is kept.
+    """
+    global _configured
+    import torch
+
+    with _lock:
+        if _configured:
+            return
+        torch.set_num_threads(TORCH_THREADS)
+        try:
+            torch.set_num_interop_threads(TORCH_INTEROP_THREADS)
+        except RuntimeError:
+            pass
+        _configured = True
+
+
+def grad_context():
+    """Context manager that disables autograd for inference"""
+    import torch
+
+    return torch.inference_mode if INFERENCE_MODE else torch.no_grad
+
+
+def serving_settings():
+    """Effective settings, for logs and the UI"""
+    settings = {
+        'torch_threads': TORCH_THREADS,
+        'torch_interop_threads': TORCH_INTEROP_THREADS,
+        'inference_mode': INFERENCE_MODE,
+        'microbatch': MICROBATCH,
+        'microbatch_window_ms': MICROBATCH_WINDOW_MS,
+        'microbatch_max': MICROBATCH_MAX,
+    }
+    if _configured:
+        import torch
+        settings['torch_threads'] = torch.get_num_threads()
+        settings['torch_interop_threads'] = torch.get_num_interop_threads()
+    return settings
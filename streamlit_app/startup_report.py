@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Startup Report
+Runs app.py headlessly under `python -X importtime` and reports the wall time
+and import cost of the first run, a rerun and the first visit of each tab
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from env_specs import APP_DIR
+
+# Imports the first page view should not pay for
+HEAVY_MODULES = ("torch", "gymnasium", "pandas", "matplotlib", "seaborn", "av", "pyarrow")
+
+_MARKER = "### startup-report phase: "
+
+# Executed in a fresh interpreter so every import is cold
+_CHILD = r"""
+import json, os, sys, time
+from streamlit.testing.v1 import AppTest
+
+def phase(name):
+    sys.stderr.write("{marker}" + name + "\n")
+    sys.stderr.flush()
+
+results = []
+def timed(name, run):
+    before = set(sys.modules)
+    phase(name)
+    start = time.perf_counter()
+    run()
+    results.append({{'phase': name, 'wall_ms': (time.perf_counter() - start) * 1000,
+                    'new_modules': sorted({{m.split('.')[0] for m in set(sys.modules) - before}})}})
+
+at = AppTest.from_file({app!r}, default_timeout=600)
+timed("first_run", at.run)
+timed("rerun", at.run)
+for label in {tabs!r}:
+    at.session_state["main_tab"] = label
+    timed("tab:" + label, at.run)
+phase("done")
+sys.stdout.write(json.dumps({{'results': results, 'exception': [str(e.value) for e in at.exception]}}))
+sys.stdout.flush()
+os._exit(0)
+"""
+
+TABS = ["Performance", "Training History", "Analysis", "About"]
+
+
+def parse_importtime(stderr):
+    """Self import time (ms) per top-level package, for each phase between markers"""
+    phases = defaultdict(lambda: defaultdict(float))
+    current = "interpreter"
+    for line in stderr.splitlines():
+        if line.startswith(_MARKER):
+            current = line[len(_MARKER):].strip()
+            continue
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # import time: self [us] | cumulative | indented module name
+        self_us, _, name = line[len("import time:"):].split("|")
+        phases[current][name.strip().split(".")[0]] += int(self_us) / 1000
+    return phases
+
+
+def run_report(app_path, tabs):
+    child = _CHILD.format(marker=_MARKER, app=app_path, tabs=tabs)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", child], cwd=APP_DIR,
+                          capture_output=True, text=True)
+    if proc.returncode != 0 or not proc.stdout:
+        raise RuntimeError(f"App run failed:\n{proc.stderr[-4000:]}")
+    report = json.loads(proc.stdout)
+    imports = parse_importtime(proc.stderr)
+    for row in report['results']:
+        packages = imports.get(row['phase'], {})
+        row['import_ms'] = sum(packages.values())
+        row['top_imports'] = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:8]
+        row['heavy_modules'] = [m for m in HEAVY_MODULES if m in row['new_modules']]
+    report['harness_import_ms'] = sum(imports.get("interpreter", {}).values())
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import and run times of the Streamlit app")
+    parser.add_argument("--app", default=os.path.join(APP_DIR, "app.py"))
+    parser.add_argument("--no-tabs", action="store_true", help="Only time the first run and a rerun")
+    parser.add_argument("--out", default=None, help="Write the report as JSON")
+    parser.add_argument("--max-first-run-ms", type=float, default=None,
+                        help="Fail if the first run takes longer than this")
+    parser.add_argument("--forbid-heavy", action="store_true",
+                        help=f"Fail if the first run imports any of {', '.join(HEAVY_MODULES)}")
+    args = parser.parse_args()
+
+    print(f"🚀 Cold-starting {args.app} under -X importtime")
+    report = run_report(args.app, [] if args.no_tabs else TABS)
+
+    print(f"\n📊 Interpreter + streamlit harness imports: {report['harness_import_ms']:.0f} ms")
+    for row in report['results']:
+        print(f"\n   {row['phase']:<24s} {row['wall_ms']:8.0f} ms wall, {row['import_ms']:7.0f} ms importing")
+        for name, ms in row['top_imports']:
+            if ms >= 1:
+                print(f"      {name:<22s} {ms:7.1f} ms")
+        if row['heavy_modules']:
+            print(f"      heavy: {', '.join(row['heavy_modules'])}")
+
+    if report['exception']:
+        print(f"\n❌ App raised: {report['exception']}")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Wrote {args.out}")
+
+    first = report['results'][0]
+    failed = bool(report['exception'])
+    if args.max_first_run_ms is not None and first['wall_ms'] > args.max_first_run_ms:
+        print(f"❌ First run {first['wall_ms']:.0f} ms > {args.max_first_run_ms:.0f} ms")
+        failed = True
+    if args.forbid_heavy and first['heavy_modules']:
+        print(f"❌ First run imported {', '.join(first['heavy_modules'])}")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+import io
+
+# Baselines of the Algorithm Comparison chart (CartPole experiments); PPO (Opt) is replaced
+# by the measured checkpoint when its evaluation is available
+COMPARISON_BASELINES = {
+    'Algorithm': ['REINFORCE', 'A2C', 'PPO (Base)', 'PPO (Opt)'],
+    'Mean Reward': [200, 200, 200, 475],
+    'Std Dev': [50, 50, 40, 25],
+    'Success Rate (%)': [42, 42, 42, 95],
+}
+
+# Same resolution st.pyplot renders at
+PNG_DPI = 200
+
+
+def _figure(figsize):
+    """
+    Figure without pyplot: no GUI backend is loaded and nothing is registered
+    globally, so figures can be drawn from any thread and need no closing
+    """
+    from matplotlib.figure import Figure
+    return Figure(figsize=figsize)
+
+
+def _png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=PNG_DPI, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+def comparison_data(ppo_stats=None):
+    """Comparison table columns, with PPO (Opt) taken from (mean, std, success %) when given"""
+    data = {name: list(values) for name, values in COMPARISON_BASELINES.items()}
+    if ppo_stats is not None:
+        data['Mean Reward'][3], data['Std Dev'][3], data['Success Rate (%)'][3] = ppo_stats
+    return data
+
+
+def comparison_chart(data, solved_threshold):
+    """Mean reward per algorithm with std error bars, as PNG bytes"""
+    fig = _figure((6, 4))
+    ax = fig.subplots()
+    colors = ['#FF6B6B', '#FFA07A', '#FFD93D', '#6BCB77']
+    ax.bar(data['Algorithm'], data['Mean Reward'],
+           yerr=data['Std Dev'], capsize=5, color=colors,
+           alpha=0.8, edgecolor='black', linewidth=2)
+    ax.axhline(solved_threshold, color='green', linestyle='--', linewidth=2, alpha=0.7, label='Solved Threshold')
+    ax.set_ylabel('Average Reward', fontweight='bold')
+    ax.set_xlabel('Algorithm', fontweight='bold')
+    ax.set_title('Performance Comparison', fontweight='bold', fontsize=14)
+    ax.legend()
+    ax.grid(True, alpha=0.3, axis='y')
+    return _png(fig)
+
+
+def reward_chart(episodes, rewards, solved, solved_threshold):
+    """Episode rewards over time, solved episodes shaded, as PNG bytes"""
+    fig = _figure((10, 5))
+    ax = fig.subplots()
+    ax.plot(episodes, rewards,
+            marker='o', linewidth=2, markersize=8,
+            color='#1f77b4', label='Episode Reward')
+    ax.axhline(solved_threshold, color='green', linestyle='--', linewidth=2,
+               alpha=0.7, label='Solved Threshold')
+    ax.fill_between(episodes, 0, rewards,
+                    where=solved,
+                    color='green', alpha=0.2)
+    ax.set_xlabel('Episode Number', fontweight='bold')
+    ax.set_ylabel('Total Reward', fontweight='bold')
+    ax.set_title('Your Episode Rewards Over Time', fontweight='bold', fontsize=14)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+    return _png(fig)
+
+
+def action_pie(counts, labels):
+    """Share of each tracked action, as PNG bytes"""
+    fig = _figure((5, 5))
+    ax = fig.subplots()
+    ax.pie(
+        counts,
+        labels=labels,
+        autopct='%1.1f%%',
+        colors=['#FF6B6B', '#4ECDC4'],
+        startangle=90,
+        textprops={'fontweight': 'bold'}
+    )
+    ax.set_title('Overall Action Distribution', fontweight='bold')
+    return _png(fig)
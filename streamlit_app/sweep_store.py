@@ -0,0 +1,142 @@
+import json
+import os
+import sqlite3
+import time
+
+from env_specs import APP_DIR
+
+# SQLite database shared by run_sweep.py (writers) and the Analysis tab (reader)
+SWEEP_DB = os.environ.get("PPO_SWEEP_DB", os.path.join(APP_DIR, ".sweeps", "sweeps.sqlite"))
+
+TRIAL_STATES = ("pending", "running", "complete", "pruned", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    name TEXT PRIMARY KEY, env_name TEXT, method TEXT, space TEXT, settings TEXT, created REAL
+);
+CREATE TABLE IF NOT EXISTS trials (
+    sweep TEXT, trial_id INTEGER, params TEXT, status TEXT,
+    score REAL, train_return REAL, steps INTEGER, steps_per_sec REAL, wall_s REAL,
+    started REAL, finished REAL, error TEXT, config TEXT,
+    PRIMARY KEY (sweep, trial_id)
+);
+CREATE TABLE IF NOT EXISTS progress (
+    sweep TEXT, trial_id INTEGER, steps INTEGER, mean_return REAL,
+    PRIMARY KEY (sweep, trial_id, steps)
+);
+"""
+
+
+class SweepStore:
+    """
+    Sweeps, their trials and per-trial learning curves in one SQLite file.
+
+    Every trial row is written when the sweep is created, so an interrupted
+    sweep resumes by running whatever is still pending (trials left
+    "running" by a killed process are reset first). Each process opens its
+    own connection; WAL mode lets the Analysis tab read while trials write.
+    """
+
+    def __init__(self, path=SWEEP_DB):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Streamlit reruns may come from different threads
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def create_sweep(self, name, env_name, method, space, settings, trials):
+        """Register a sweep and its trial parameter sets; a no-op if it already exists"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO sweeps VALUES (?, ?, ?, ?, ?, ?)",
+                (name, env_name, method, json.dumps(space), json.dumps(settings), time.time()))
+            if cursor.rowcount == 0:
+                return False
+            self.conn.executemany(
+                "INSERT INTO trials (sweep, trial_id, params, status) VALUES (?, ?, ?, 'pending')",
+                [(name, i, json.dumps(params)) for i, params in enumerate(trials)])
+        return True
+
+    def get_sweep(self, name):
+        row = self.conn.execute("SELECT * FROM sweeps WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        sweep = dict(row)
+        sweep['space'] = json.loads(sweep['space'])
+        sweep['settings'] = json.loads(sweep['settings'])
+        return sweep
+
+    def list_sweeps(self, env_name=None):
+        query = "SELECT name, env_name, method, created FROM sweeps"
+        args = ()
+        if env_name is not None:
+            query += " WHERE env_name = ?"
+            args = (env_name,)
+        return [dict(row) for row in self.conn.execute(query + " ORDER BY created DESC", args)]
+
+    def reset_interrupted(self, sweep):
+        """Return trials a killed run left "running" to the queue"""
+        with self.conn:
+            return self.conn.execute("UPDATE trials SET status = 'pending', started = NULL "
+                                     "WHERE sweep = ? AND status = 'running'", (sweep,)).rowcount
+
+    def pending_trials(self, sweep):
+        rows = self.conn.execute("SELECT trial_id, params FROM trials WHERE sweep = ? AND status = 'pending' "
+                                 "ORDER BY trial_id", (sweep,))
+        return [(row['trial_id'], json.loads(row['params'])) for row in rows]
+
+    def start_trial(self, sweep, trial_id):
+        with self.conn:
+            self.conn.execute("DELETE FROM progress WHERE sweep = ? AND trial_id = ?", (sweep, trial_id))
+            self.conn.execute("UPDATE trials SET status = 'running', started = ? WHERE sweep = ? AND trial_id = ?",
+                              (time.time(), sweep, trial_id))
+
+    def report(self, sweep, trial_id, steps, mean_return):
+        """Record a point of a trial's learning curve"""
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO progress VALUES (?, ?, ?, ?)",
+                              (sweep, trial_id, steps, mean_return))
+
+    def finish_trial(self, sweep, trial_id, status, score=None, train_return=None, steps=None,
+                     steps_per_sec=None, wall_s=None, error=None, config=None):
+        """Final state of a trial; `config` is the full resolved training configuration"""
+        if status not in TRIAL_STATES:
+            raise ValueError(f"Unknown trial status: {status}")
+        with self.conn:
+            self.conn.execute(
+                "UPDATE trials SET status = ?, score = ?, train_return = ?, steps = ?, steps_per_sec = ?, "
+                "wall_s = ?, finished = ?, error = ?, config = ? WHERE sweep = ? AND trial_id = ?",
+                (status, score, train_return, steps, steps_per_sec, wall_s, time.time(), error,
+                 None if config is None else json.dumps(config), sweep, trial_id))
+
+    def returns_at(self, sweep, steps, exclude=None):
+        """
+        Best mean return that each other trial had reached by `steps`, over
+        trials that have trained at least that far (for median stopping)
+        """
+        rows = self.conn.execute(
+            "SELECT trial_id, MAX(CASE WHEN steps <= ? THEN mean_return END) AS best, MAX(steps) AS reached "
+            "FROM progress WHERE sweep = ? AND trial_id != ? GROUP BY trial_id HAVING reached >= ?",
+            (steps, sweep, -1 if exclude is None else exclude, steps))
+        return [row['best'] for row in rows if row['best'] is not None]
+
+    def trials(self, sweep):
+        """All trials of a sweep as dicts, params decoded"""
+        rows = self.conn.execute("SELECT * FROM trials WHERE sweep = ? ORDER BY trial_id", (sweep,))
+        trials = []
+        for row in rows:
+            trial = dict(row)
+            trial['params'] = json.loads(trial['params'])
+            trial['config'] = json.loads(trial['config']) if trial['config'] else None
+            trials.append(trial)
+        return trials
+
+    def progress(self, sweep):
+        """Learning curves as (trial_id, steps, mean_return) rows"""
+        return [tuple(row) for row in self.conn.execute(
+            "SELECT trial_id, steps, mean_return FROM progress WHERE sweep = ? ORDER BY trial_id, steps", (sweep,))]
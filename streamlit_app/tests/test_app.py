@@ -0,0 +1,14 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+def test_unknown_precision_falls_back_to_fp32(monkeypatch):
+    monkeypatch.setenv("PPO_PRECISION", "fp8")
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    assert not at.exception
+    assert any("PPO_PRECISION" in warning.value for warning in at.sidebar.warning)
+    assert next(box for box in at.selectbox if box.label == "Model Precision").value == "fp32"
@@ -0,0 +1,57 @@
+import json
+import sys
+
+import pytest
+
+import benchmark_suite
+
+
+def results(env_name="CartPole-v1", **values):
+    metrics = {name: {'value': value, 'unit': "us", 'better': "lower"} for name, value in values.items()}
+    return {'meta': {'env_name': env_name, 'env_steps': 20000, 'serving': {'microbatch': False}},
+            'metrics': metrics}
+
+
+@pytest.fixture
+def run(tmp_path, monkeypatch):
+    """main() with run_suite returning `current`, against a baseline file in tmp_path"""
+    baseline_path = str(tmp_path / "baseline.json")
+
+    def run_main(current, baseline=None, *flags):
+        if baseline is not None:
+            with open(baseline_path, "w") as f:
+                json.dump(baseline, f)
+        monkeypatch.setattr(benchmark_suite, "run_suite", lambda env_name, repeats, env_steps: current)
+        monkeypatch.setattr(sys, "argv", ["benchmark_suite.py", "--baseline", baseline_path, *flags])
+        return benchmark_suite.main()
+
+    return run_main
+
+
+def test_missing_baseline_fails_only_under_check(run):
+    assert run(results(get_action=10.0)) == 0
+    assert run(results(get_action=10.0), None, "--check") == 1
+
+
+def test_saved_baseline_compares_clean(run):
+    assert run(results(get_action=10.0), None, "--save-baseline") == 0
+    assert run(results(get_action=11.0), None, "--check") == 0
+
+
+def test_regression_beyond_tolerance_fails(run):
+    assert run(results(get_action=12.0), results(get_action=10.0)) == 1
+    assert run(results(get_action=12.0), None, "--tolerance-for", "get_action=0.25") == 0
+
+
+def test_metric_missing_from_the_run_fails(run):
+    assert run(results(get_action=10.0), results(get_action=10.0, peak_rss_mb=100.0)) == 1
+    # A metric new in this run is only reported
+    assert run(results(get_action=10.0, peak_rss_mb=100.0), results(get_action=10.0)) == 0
+
+
+@pytest.mark.parametrize("meta", [{'env_name': "LunarLander-v3"}, {'env_steps': 1000},
+                                  {'serving': {'microbatch': True}}])
+def test_baseline_recorded_with_other_settings_fails(run, meta):
+    baseline = results(get_action=10.0)
+    baseline['meta'].update(meta)
+    assert run(results(get_action=10.0), baseline) == 1
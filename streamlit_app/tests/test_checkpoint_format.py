@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+
+import checkpoint_format
+from checkpoint_format import (CheckpointError, is_checkpoint, load_arrays, read_header, save_checkpoint,
+                               verify)
+
+ARCHITECTURE = {'state_dim': 4, 'action_dim': 2, 'hidden_dim': 8}
+
+
+def state_dict(seed=0):
+    rng = np.random.default_rng(seed)
+    shapes = {'shared_fc1': (8, 4), 'shared_fc2': (8, 8), 'actor_fc': (2, 8), 'critic_fc': (1, 8)}
+    params = {}
+    for name, shape in shapes.items():
+        params[name + ".weight"] = rng.normal(size=shape).astype(np.float32)
+        params[name + ".bias"] = rng.normal(size=shape[0]).astype(np.float32)
+    return params
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "policy.ppo")
+    params = state_dict()
+    save_checkpoint(path, params, "CartPole-v1", ARCHITECTURE, training={'steps': 1000})
+
+    header = verify(path)
+    assert is_checkpoint(path)
+    assert header['env_id'] == "CartPole-v1"
+    assert header['architecture'] == ARCHITECTURE
+    assert header['training'] == {'steps': 1000}
+    assert header['num_params'] == sum(a.size for a in params.values())
+    assert header['payload_offset'] % checkpoint_format.ALIGN == 0
+    for mmap in (True, False):
+        arrays = load_arrays(path, mmap=mmap)
+        assert list(arrays) == list(params)
+        for name, array in params.items():
+            np.testing.assert_array_equal(arrays[name], array)
+
+
+def test_float16_checkpoint_loads_as_float32_model(tmp_path):
+    import torch
+    from model_registry import _build_from_checkpoint
+
+    path = str(tmp_path / "policy.ppo")
+    params = state_dict()
+    save_checkpoint(path, params, "CartPole-v1", ARCHITECTURE, dtype="float16")
+    assert read_header(path)['dtype'] == "float16"
+
+    model = _build_from_checkpoint("CartPole-v1", path)
+    assert model.actor_fc.weight.dtype == torch.float32
+    np.testing.assert_array_equal(model.actor_fc.weight.detach().numpy(),
+                                  params['actor_fc.weight'].astype(np.float16).astype(np.float32))
+    with pytest.raises(ValueError):
+        _build_from_checkpoint("LunarLander-v3", path)
+
+
+def test_newer_format_version_is_rejected(tmp_path):
+    path = str(tmp_path / "policy.ppo")
+    save_checkpoint(path, state_dict(), "CartPole-v1", ARCHITECTURE)
+    with open(path, "r+b") as f:
+        f.seek(len(checkpoint_format.MAGIC))
+        f.write(np.uint32(checkpoint_format.FORMAT_VERSION + 1).tobytes())
+
+    with pytest.raises(CheckpointError, match="newer"):
+        read_header(path)
+
+
+def test_corrupt_payload_and_foreign_files_are_rejected(tmp_path):
+    path = str(tmp_path / "policy.ppo")
+    save_checkpoint(path, state_dict(), "CartPole-v1", ARCHITECTURE)
+    header = read_header(path)
+    # Flip a byte of the first tensor (the file ends in alignment padding)
+    with open(path, "r+b") as f:
+        f.seek(header['payload_offset'])
+        first = f.read(1)
+        f.seek(header['payload_offset'])
+        f.write(bytes([first[0] ^ 0xFF]))
+    with pytest.raises(CheckpointError, match="hash"):
+        verify(path)
+
+    other = tmp_path / "policy.pt"
+    other.write_bytes(b"not a checkpoint")
+    assert not is_checkpoint(str(other))
+    with pytest.raises(CheckpointError):
+        read_header(str(other))
+    with pytest.raises(ValueError):
+        save_checkpoint(path, state_dict(), "CartPole-v1", ARCHITECTURE, dtype="int8")
+    assert read_header(path)['payload_sha256'] == header['payload_sha256']
@@ -0,0 +1,60 @@
+from concurrent.futures import Future
+
+import eval_store
+from eval_store import EvalStore, compute_aggregates, request_evaluation
+
+CONFIG = {'episodes': 100, 'seed': 0, 'deterministic': True, 'backend': "torch", 'precision': "fp32"}
+RECORDS = [{'reward': 10.0, 'solved': False, 'length': 10}, {'reward': 30.0, 'solved': True, 'length': 30}]
+
+
+class FakeRunner:
+    """Collects submitted jobs; their handles finish when `finish` is called"""
+
+    def __init__(self):
+        self.handles = []
+
+    def submit(self, job):
+        handle = type("Handle", (), {'job': job, 'future': Future(), 'error': None, 'cancelled': False,
+                                     'records': RECORDS})()
+        self.handles.append(handle)
+        return handle
+
+    def finish(self):
+        for handle in self.handles:
+            if not handle.future.done():
+                handle.future.set_result(None)
+
+
+def test_store_is_keyed_by_checkpoint_env_and_config(tmp_path):
+    store = EvalStore(str(tmp_path))
+    store.save("a" * 64, "CartPole-v1", {'mean_reward': 1.0}, CONFIG)
+
+    assert store.load("a" * 64, "CartPole-v1", dict(CONFIG))['aggregates'] == {'mean_reward': 1.0}
+    assert store.load("b" * 64, "CartPole-v1", CONFIG) is None
+    assert store.load("a" * 64, "LunarLander-v3", CONFIG) is None
+    for change in ({'episodes': 10}, {'seed': 1}, {'deterministic': False}, {'backend': "numpy"},
+                   {'precision': "int8"}):
+        assert store.load("a" * 64, "CartPole-v1", dict(CONFIG, **change)) is None
+
+
+def test_request_evaluation_runs_once_per_config(tmp_path):
+    store = EvalStore(str(tmp_path))
+    runner = FakeRunner()
+
+    assert request_evaluation("CartPole-v1", runner, num_episodes=5, store=store) is None
+    assert request_evaluation("CartPole-v1", runner, num_episodes=5, store=store) is None
+    assert request_evaluation("CartPole-v1", runner, num_episodes=7, store=store) is None
+    assert [handle.job.num_episodes for handle in runner.handles] == [5, 7]
+    assert eval_store.evaluation_pending("CartPole-v1")
+
+    runner.finish()
+    assert not eval_store.evaluation_pending("CartPole-v1")
+    assert request_evaluation("CartPole-v1", runner, num_episodes=5, store=store)['mean_reward'] == 20.0
+    assert request_evaluation("CartPole-v1", runner, num_episodes=5, seed=3, store=store) is None
+    assert len(runner.handles) == 3
+    runner.finish()
+
+
+def test_cv_is_relative_to_the_mean_magnitude():
+    negative = [dict(record, reward=-record['reward']) for record in RECORDS]
+    assert compute_aggregates(negative)['cv'] == compute_aggregates(RECORDS)['cv'] == 0.5
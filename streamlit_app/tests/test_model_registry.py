@@ -0,0 +1,62 @@
+import shutil
+
+import numpy as np
+import pytest
+
+import model_registry
+from model_registry import checkpoint_hash, get_model, served_checkpoint, served_weights_hash
+from numpy_policy import NumpyPolicy
+
+ENV = "CartPole-v1"
+
+
+@pytest.fixture
+def checkpoint(tmp_path, monkeypatch):
+    """Copy of the shipped .ppo served as the CartPole default, with an empty model cache"""
+    path = str(tmp_path / "policy.ppo")
+    shutil.copy(model_registry.DEFAULT_CHECKPOINTS[ENV], path)
+    monkeypatch.setitem(model_registry.DEFAULT_CHECKPOINTS, ENV, path)
+    model_registry.clear_cache()
+    yield path
+    model_registry.clear_cache()
+
+
+def write_npz(source_sha256, scale=1.0):
+    from checkpoint_format import load_arrays
+
+    arrays = {name: array * scale for name, array in load_arrays(model_registry.DEFAULT_CHECKPOINTS[ENV]).items()}
+    NumpyPolicy(arrays, meta={'env_name': ENV, 'source_sha256': source_sha256}).save(served_checkpoint(ENV, "numpy"))
+
+
+def test_numpy_weights_from_their_source_are_served(checkpoint):
+    write_npz(checkpoint_hash(checkpoint), scale=2.0)
+    policy, loaded = get_model(ENV, backend="numpy")
+    assert loaded
+    assert policy.params["actor_fc.bias"] == pytest.approx(get_model(ENV)[0].actor_fc.bias.numpy() * 2.0)
+
+
+def test_stale_numpy_weights_are_rebuilt_from_the_source(checkpoint):
+    write_npz("0" * 64, scale=2.0)
+    stale_hash = served_weights_hash(ENV, "numpy")
+    policy, loaded = get_model(ENV, backend="numpy")
+    assert loaded
+    assert policy.meta['source_sha256'] == checkpoint_hash(checkpoint)
+    np.testing.assert_array_equal(policy.params["actor_fc.bias"], get_model(ENV)[0].actor_fc.bias.numpy())
+
+    # Regenerating the file changes what the eval store is keyed by
+    write_npz(checkpoint_hash(checkpoint))
+    assert served_weights_hash(ENV, "numpy") != stale_hash
+
+
+def test_stale_precision_variant_is_requantized(checkpoint):
+    from quantized_policy import quantize, save_variant
+
+    fp32_model, _ = get_model(ENV)
+    halved = quantize(fp32_model, "fp16")
+    halved.actor_fc.bias.data.mul_(2.0)
+    save_variant(served_checkpoint(ENV, precision="fp16"), halved, "0" * 64)
+
+    model, loaded = get_model(ENV, precision="fp16")
+    assert loaded
+    np.testing.assert_array_equal(model.actor_fc.bias.float().numpy(),
+                                  quantize(fp32_model, "fp16").actor_fc.bias.detach().float().numpy())
@@ -0,0 +1,68 @@
+import gymnasium as gym
+import numpy as np
+import torch
+
+from ppo_trainer import PPOConfig, PPOTrainer, compute_gae
+
+
+def reference_gae(rewards, values, dones, last_value, gamma, gae_lambda):
+    """Per-env, per-step GAE that restarts at every episode end"""
+    T, N = rewards.shape
+    out = np.zeros((T, N))
+    for n in range(N):
+        advantage = 0.0
+        for t in reversed(range(T)):
+            next_value = last_value[n] if t == T - 1 else values[t + 1, n]
+            if dones[t, n]:
+                advantage = rewards[t, n] - values[t, n]
+            else:
+                delta = rewards[t, n] + gamma * next_value - values[t, n]
+                advantage = delta + gamma * gae_lambda * advantage
+            out[t, n] = advantage
+    return out
+
+
+def test_gae_matches_reference_across_episode_ends():
+    rng = np.random.default_rng(0)
+    rewards = rng.normal(size=(16, 3))
+    values = rng.normal(size=(16, 3))
+    dones = rng.random((16, 3)) < 0.2
+    last_value = rng.normal(size=3)
+
+    gae = compute_gae(torch.tensor(rewards), torch.tensor(values), torch.tensor(dones, dtype=torch.float64),
+                      torch.tensor(last_value), 0.99, 0.95)
+    np.testing.assert_allclose(gae.numpy(), reference_gae(rewards, values, dones, last_value, 0.99, 0.95))
+
+
+def test_truncation_cuts_the_advantage_chain():
+    # Step 1 is truncated; the folded reward already holds gamma * V(final obs)
+    rewards = torch.tensor([[1.0], [1.0 + 0.99 * 0.8], [1.0], [1.0]])
+    values = torch.tensor([[0.5], [0.9], [50.0], [50.0]])
+    dones = torch.tensor([[0.0], [1.0], [0.0], [0.0]])
+    gae = compute_gae(rewards, values, dones, torch.tensor([50.0]), 0.99, 0.95)
+
+    truncated = 1.0 + 0.99 * 0.8 - 0.9
+    assert abs(gae[1, 0].item() - truncated) < 1e-5
+    # The value of the next episode's states (50) must not leak back
+    assert abs(gae[0, 0].item() - (1.0 + 0.99 * 0.9 - 0.5 + 0.99 * 0.95 * truncated)) < 1e-5
+
+
+def test_collector_marks_truncated_steps_done():
+    trainer = PPOTrainer("CartPole-v1", PPOConfig(num_envs=2, rollout_steps=12, seed=0))
+    # CartPole cannot terminate within 5 steps, so episodes end by truncation only
+    trainer.envs.close()
+    trainer.envs = gym.vector.SyncVectorEnv(
+        [lambda: gym.make("CartPole-v1", max_episode_steps=5) for _ in range(2)],
+        autoreset_mode=gym.vector.AutoresetMode.SAME_STEP)
+    trainer.obs, _ = trainer.envs.reset(seed=0)
+
+    last_value = trainer.collect()
+    buf = trainer.buffer
+    expected = np.zeros((12, 2), dtype=np.float32)
+    expected[[4, 9]] = 1.0
+    np.testing.assert_array_equal(buf.dones_np, expected)
+
+    buf.finalize(last_value, trainer.config.gamma, trainer.config.gae_lambda)
+    # A truncated step's advantage is its folded reward minus its value, nothing from the next episode
+    np.testing.assert_allclose(buf.advantages[4].numpy(), (buf.rewards[4] - buf.values[4]).numpy(), rtol=1e-6)
+    trainer.close()
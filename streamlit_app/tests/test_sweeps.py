@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import run_sweep
+import sweep_store
+from sweep_store import SweepStore
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+SETTINGS = {'total_steps': 1000, 'eval_episodes': 1, 'seed': 0, 'prune': True, 'warmup_fraction': 0.25,
+            'min_trials': 2}
+
+
+def make_sweep(path, name="s", trials=({'lr_start': 1e-3}, {'lr_start': 3e-4}, {'lr_start': 1e-4})):
+    store = SweepStore(path)
+    store.create_sweep(name, "CartPole-v1", "grid", {'lr_start': [t['lr_start'] for t in trials]}, SETTINGS,
+                       list(trials))
+    return store
+
+
+def test_create_sweep_is_idempotent(tmp_path):
+    store = make_sweep(str(tmp_path / "db.sqlite"))
+    assert not store.create_sweep("s", "CartPole-v1", "grid", {}, SETTINGS, [{'lr_start': 1.0}])
+    assert [trial_id for trial_id, _ in store.pending_trials("s")] == [0, 1, 2]
+
+
+def test_interrupted_trials_resume(tmp_path):
+    store = make_sweep(str(tmp_path / "db.sqlite"))
+    store.start_trial("s", 0)
+    store.report("s", 0, 512, 20.0)
+    store.start_trial("s", 1)
+    store.finish_trial("s", 1, "complete", score=100.0)
+
+    # A killed run leaves trial 0 "running"; resuming puts it back in the queue
+    assert [trial_id for trial_id, _ in store.pending_trials("s")] == [2]
+    assert store.reset_interrupted("s") == 1
+    assert [trial_id for trial_id, _ in store.pending_trials("s")] == [0, 2]
+    # Restarting a trial discards its old learning curve
+    store.start_trial("s", 0)
+    assert store.progress("s") == []
+
+
+def test_returns_at_uses_best_so_far_of_trials_that_got_that_far(tmp_path):
+    store = make_sweep(str(tmp_path / "db.sqlite"))
+    for steps, value in ((100, 10.0), (200, 30.0), (300, 25.0)):
+        store.report("s", 0, steps, value)
+    store.report("s", 1, 100, 50.0)  # never reached 200 steps
+    store.report("s", 2, 200, 5.0)
+
+    assert sorted(store.returns_at("s", 200)) == [5.0, 30.0]
+    assert store.returns_at("s", 200, exclude=0) == [5.0]
+    with pytest.raises(ValueError):
+        store.finish_trial("s", 0, "exploded")
+
+
+def test_resumed_sweep_with_nothing_pending_exits_cleanly(tmp_path, monkeypatch, capsys):
+    db = str(tmp_path / "db.sqlite")
+    store = make_sweep(db)
+    for trial_id in range(3):
+        store.finish_trial("s", trial_id, "complete", score=float(trial_id), config={})
+    store.close()
+
+    monkeypatch.setattr(sys, "argv", ["run_sweep.py", "--name", "s", "--db", db])
+    assert run_sweep.main() == 0
+    assert "Nothing left to run" in capsys.readouterr().out
+
+    # The stored sweep decides the environment; a different --env is refused
+    monkeypatch.setattr(sys, "argv", ["run_sweep.py", "--name", "s", "--db", db, "--env", "LunarLander-v3"])
+    with pytest.raises(SystemExit) as exit_info:
+        run_sweep.main()
+    assert exit_info.value.code == 2
+
+
+def test_analysis_tab_picks_up_a_sweep_started_after_the_app(tmp_path, monkeypatch):
+    db = str(tmp_path / "sweeps.sqlite")
+    monkeypatch.setattr(sweep_store, "SWEEP_DB", db)
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.session_state["main_tab"] = "Analysis"
+    at.run()
+    assert not at.exception
+    assert any("No sweeps" in info.value for info in at.info)
+
+    make_sweep(db).close()
+    at.run()
+    assert not at.exception
+    assert [box.label for box in at.selectbox if box.label == "Sweep"] == ["Sweep"]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+PPO Training Script
+Trains a PPONetwork on a vector environment with the documented schedules,
+saving the best checkpoint and reporting environment steps per second
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+import torch
+
+from env_specs import ENV_SPECS, MODELS_DIR, get_spec
+from ppo_trainer import PPOConfig, PPOTrainer
+from checkpoint_format import save_checkpoint, CHECKPOINT_SUFFIX
+
+
+def default_output(env_name):
+    return os.path.join(MODELS_DIR, f"{env_name.split('-')[0].lower()}_trained{CHECKPOINT_SUFFIX}")
+
+
+def main():
+    defaults = PPOConfig()
+    parser = argparse.ArgumentParser(description="Train a PPO policy")
+    parser.add_argument("--env", default="CartPole-v1", choices=sorted(ENV_SPECS))
+    parser.add_argument("--total-steps", type=int, default=defaults.total_steps)
+    parser.add_argument("--num-envs", type=int, default=defaults.num_envs)
+    parser.add_argument("--rollout-steps", type=int, default=defaults.rollout_steps, help="Steps per env per update")
+    parser.add_argument("--epochs", type=int, default=defaults.epochs)
+    parser.add_argument("--minibatch-size", type=int, default=defaults.minibatch_size)
+    parser.add_argument("--lr", type=float, default=defaults.lr_start, help="Initial learning rate (decays to 0)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=None, help="torch.set_num_threads for the updates")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="Rollout worker processes sharing the envs (0 = step them in this process)")
+    parser.add_argument("--out", default=None, help="Best checkpoint (default: ../models/<env>_trained.ppo)")
+    parser.add_argument("--log", default=None, help="Append per-iteration stats to this JSON-lines file")
+    parser.add_argument("--stop-at-solved", action="store_true",
+                        help="Stop once the recent mean return reaches the env's solved threshold")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    spec = get_spec(args.env)
+    out = args.out or default_output(args.env)
+    config = PPOConfig(total_steps=args.total_steps, num_envs=args.num_envs, rollout_steps=args.rollout_steps,
+                       epochs=args.epochs, minibatch_size=args.minibatch_size, lr_start=args.lr, seed=args.seed,
+                       num_workers=args.workers)
+    trainer = PPOTrainer(args.env, config)
+
+    print(f"🚀 Training {args.env}: {config.total_steps} steps, {config.num_envs} envs x "
+          f"{config.rollout_steps} steps per batch, {config.epochs} epochs"
+          + (f", {config.num_workers} rollout workers" if config.num_workers else ""))
+    best = None
+    start = time.perf_counter()
+    try:
+        while trainer.steps < config.total_steps:
+            stats = trainer.train_iteration()
+            mean_return = stats['mean_return']
+            marker = ""
+            if mean_return is not None and (best is None or mean_return > best):
+                best = mean_return
+                os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+                training = {name: value for name, value in vars(config).items() if name != "num_workers"}
+                training.update(steps=stats['steps'], episodes=stats['episodes'], mean_return=mean_return,
+                                steps_per_sec=stats['steps_per_sec'])
+                save_checkpoint(out, trainer.model.state_dict(), args.env, spec.model_config, training=training)
+                marker = " ✅"
+
+            print(f"📊 {stats['steps']:>8d} steps | return {mean_return if mean_return is not None else float('nan'):7.1f} "
+                  f"| {stats['steps_per_sec']:6.0f} steps/s (rollout {stats['rollout_steps_per_sec']:.0f}) "
+                  f"| lr {stats['lr']:.1e} clip {stats['clip']:.3f} ent {stats['entropy_coef']:.4f}{marker}")
+            if args.log:
+                with open(args.log, "a") as f:
+                    f.write(json.dumps(dict(stats, env_name=args.env)) + "\n")
+
+            if args.stop_at_solved and mean_return is not None and mean_return >= spec.solved_threshold:
+                print(f"✅ Solved (mean return {mean_return:.1f} >= {spec.solved_threshold})")
+                break
+    finally:
+        trainer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n📊 {trainer.steps} steps in {elapsed:.1f}s ({trainer.steps / elapsed:.0f} steps/s), "
+          f"{len(trainer.completed)} episodes")
+    if best is None:
+        print("⚠️  No episode finished; nothing saved")
+        return 1
+    print(f"✅ Best recent mean return {best:.1f} saved to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
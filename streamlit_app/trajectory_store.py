@@ -0,0 +1,209 @@
+import json
+import os
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from env_specs import APP_DIR, get_spec
+from episode_stats import PolicyTrace
+
+# Recorded episodes, one compressed .npz per episode
+TRAJECTORY_DIR = os.environ.get("PPO_TRAJECTORY_DIR", os.path.join(APP_DIR, ".trajectories"))
+# Oldest recordings beyond this many are deleted on save
+MAX_TRAJECTORIES = int(os.environ.get("PPO_TRAJECTORY_KEEP", "200"))
+
+# Environments whose frames can be redrawn from an observation, so replay needs no keyframes
+STATE_RENDERABLE = {"CartPole-v1"}
+
+
+class TrajectoryRecorder:
+    """
+    Records one episode: observations, actions, probabilities, values and rewards.
+
+    Arrays are preallocated and grow by doubling, like PolicyTrace. Keyframes
+    are encoded frames taken every `keyframe_interval` steps, for environments
+    that cannot be redrawn from an observation.
+    """
+
+    def __init__(self, env_name, seed=None, deterministic=True, keyframe_interval=10, capacity=512):
+        spec = get_spec(env_name)
+        self.meta = {
+            'env_name': env_name,
+            'seed': seed,
+            'deterministic': deterministic,
+            'action_labels': spec.action_labels,
+            'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        self.keyframe_interval = keyframe_interval if env_name not in STATE_RENDERABLE else 0
+
+        self._obs = np.zeros((capacity + 1, spec.state_dim), dtype=np.float32)
+        self._actions = np.zeros(capacity, dtype=np.int16)
+        self._probs = np.zeros((capacity, spec.action_dim), dtype=np.float32)
+        self._values = np.zeros(capacity, dtype=np.float32)
+        self._rewards = np.zeros(capacity, dtype=np.float32)
+        self._size = 0
+
+        self._keyframe_steps = []
+        self._keyframes = []
+
+    def __len__(self):
+        return self._size
+
+    def record(self, obs, action, probs, value, reward):
+        """Record one step: the observation acted on and its outcome"""
+        if self._size == len(self._actions):
+            capacity = 2 * len(self._actions)
+            self._obs = np.resize(self._obs, (capacity + 1, self._obs.shape[1]))
+            self._actions = np.resize(self._actions, capacity)
+            self._probs = np.resize(self._probs, (capacity, self._probs.shape[1]))
+            self._values = np.resize(self._values, capacity)
+            self._rewards = np.resize(self._rewards, capacity)
+
+        i = self._size
+        self._obs[i] = obs
+        self._actions[i] = action
+        self._probs[i] = probs if probs is not None else np.nan
+        self._values[i] = value if value is not None else np.nan
+        self._rewards[i] = reward
+        self._size += 1
+
+    def finish(self, final_obs):
+        """Record the observation after the last step"""
+        self._obs[self._size] = final_obs
+
+    def keyframe_due(self, step, done=False):
+        """True when the state after `step` steps should be kept as a keyframe"""
+        if not self.keyframe_interval:
+            return False
+        if not self._keyframe_steps:
+            return True
+        return done or step - self._keyframe_steps[-1] >= self.keyframe_interval
+
+    def add_keyframe(self, step, data):
+        """Keep an encoded frame of the state after `step` steps"""
+        self._keyframe_steps.append(step)
+        self._keyframes.append(np.frombuffer(data, dtype=np.uint8))
+
+    def save(self, path):
+        """Write the episode as a compressed .npz"""
+        n = self._size
+        lengths = [len(k) for k in self._keyframes]
+        meta = dict(self.meta, length=n, total_reward=float(self._rewards[:n].sum()))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez_compressed(
+            tmp_path,
+            meta=np.array(json.dumps(meta)),
+            obs=self._obs[:n + 1],
+            actions=self._actions[:n],
+            probs=self._probs[:n],
+            values=self._values[:n],
+            rewards=self._rewards[:n],
+            keyframe_steps=np.array(self._keyframe_steps, dtype=np.int64),
+            keyframe_offsets=np.cumsum([0] + lengths, dtype=np.int64),
+            keyframe_data=np.concatenate(self._keyframes) if self._keyframes else np.zeros(0, dtype=np.uint8),
+        )
+        os.replace(tmp_path, path)
+        return path
+
+
+class Trajectory:
+    """A recorded episode, loaded for replay without the environment or the network"""
+
+    def __init__(self, meta, obs, actions, probs, values, rewards,
+                 keyframe_steps, keyframe_offsets, keyframe_data):
+        self.meta = meta
+        self.env_name = meta['env_name']
+        self.seed = meta.get('seed')
+        self.action_labels = meta['action_labels']
+        self.obs = obs
+        self.actions = actions
+        self.probs = probs
+        self.values = values
+        self.rewards = rewards
+        self.keyframe_steps = keyframe_steps
+        self._keyframe_offsets = keyframe_offsets
+        self._keyframe_data = keyframe_data
+
+        # Running totals, so any step can be shown in O(1)
+        self.cumulative_reward = np.concatenate([[0.0], np.cumsum(rewards, dtype=np.float64)])
+        counts = np.zeros((len(actions) + 1, len(self.action_labels)), dtype=np.int64)
+        counts[np.arange(1, len(actions) + 1), actions] = 1
+        self.cumulative_actions = np.cumsum(counts, axis=0)
+
+    def __len__(self):
+        return len(self.actions)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(json.loads(str(data['meta'])), data['obs'], data['actions'], data['probs'],
+                       data['values'], data['rewards'], data['keyframe_steps'],
+                       data['keyframe_offsets'], data['keyframe_data'])
+
+    def step_stats(self, step):
+        """Statistics after `step` steps (0 = initial state)"""
+        last = min(step, len(self)) - 1
+        return {
+            'step': step,
+            'reward': float(self.cumulative_reward[step]),
+            'action_counts': self.cumulative_actions[step].tolist(),
+            'action': int(self.actions[last]) if last >= 0 else None,
+            'probs': self.probs[last] if last >= 0 else None,
+            'value': float(self.values[last]) if last >= 0 else None,
+        }
+
+    def keyframe(self, step):
+        """Encoded frame of the latest keyframe at or before `step`, with its step"""
+        i = np.searchsorted(self.keyframe_steps, step, side="right") - 1
+        if i < 0:
+            return None, None
+        start, stop = self._keyframe_offsets[i], self._keyframe_offsets[i + 1]
+        return self._keyframe_data[start:stop].tobytes(), int(self.keyframe_steps[i])
+
+    def policy_trace(self):
+        """Per-step probabilities and values as a PolicyTrace"""
+        trace = PolicyTrace(self.probs.shape[1], capacity=max(len(self), 1))
+        for step in range(len(self)):
+            trace.append(step, self.probs[step], self.values[step])
+        return trace
+
+
+def render_state(env, obs):
+    """Draw a STATE_RENDERABLE environment (already reset) at a recorded observation"""
+    env.unwrapped.state = np.asarray(obs, dtype=np.float64)
+    return env.render()
+
+
+class StateRenderer:
+    """Draws frames straight from recorded observations (STATE_RENDERABLE envs only)"""
+
+    def __init__(self, env_name):
+        import gymnasium as gym
+
+        self.env = gym.make(env_name, render_mode="rgb_array")
+        self.env.reset(seed=0)
+        self._lock = threading.Lock()
+
+    def render(self, obs):
+        with self._lock:
+            return render_state(self.env, obs)
+
+
+def new_trajectory_path(env_name, root=TRAJECTORY_DIR):
+    """Unique path for a new recording"""
+    os.makedirs(root, exist_ok=True)
+    return os.path.join(root, f"{env_name}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.npz")
+
+
+def prune_trajectories(root=TRAJECTORY_DIR, keep=MAX_TRAJECTORIES):
+    """Delete the oldest recordings beyond `keep`"""
+    paths = sorted((os.path.join(root, name) for name in os.listdir(root) if name.endswith(".npz")),
+                   key=os.path.getmtime)
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
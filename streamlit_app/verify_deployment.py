@@ -71,7 +71,7 @@ def main():
         'streamlit_app/requirements.txt': 'Dependencies',
         'streamlit_app/README.md': 'Documentation',
         'streamlit_app/.streamlit/config.toml': 'Configuration',
-        'results/day79/cartpole_best_model.pt': 'Trained model'
+        'models/cartpole_best.ppo': 'Trained model'
     }
 
     all_good = True
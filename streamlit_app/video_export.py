@@ -0,0 +1,183 @@
+import importlib.util
+import os
+import queue
+import threading
+import time
+import uuid
+from fractions import Fraction
+
+import numpy as np
+from PIL import Image, GifImagePlugin
+
+from env_specs import APP_DIR
+
+# Finished clips, offered for download by the app
+VIDEO_DIR = os.environ.get("PPO_VIDEO_DIR", os.path.join(APP_DIR, ".videos"))
+VIDEO_FORMATS = ("gif", "mp4")
+MAX_VIDEOS = int(os.environ.get("PPO_VIDEO_KEEP", "20"))
+
+
+def mp4_available():
+    """
+    MP4 needs PyAV (bundled libav, no ffmpeg binary); GIF only needs Pillow.
+    Checked without importing av, which is only loaded once a clip is encoded.
+    """
+    return importlib.util.find_spec("av") is not None
+
+
+class _GifWriter:
+    """
+    Appends frames to an animated GIF as they arrive.
+
+    Every frame is quantized to the palette of the first one, so the file
+    has a single global color table and each frame can be written and
+    forgotten immediately.
+    """
+
+    def __init__(self, path, fps):
+        self.file = open(path, "wb")
+        self.duration = int(round(1000 / fps))
+        self.palette = None
+
+    def write(self, image):
+        if self.palette is None:
+            self.palette = image.quantize(colors=128)
+            header, _ = GifImagePlugin.getheader(self.palette)
+            header[0] = header[0].replace(b"GIF87a", b"GIF89a")
+            for chunk in header:
+                self.file.write(chunk)
+            # Loop forever
+            self.file.write(b"\x21\xff\x0bNETSCAPE2.0\x03\x01\x00\x00\x00")
+
+        frame = image.quantize(palette=self.palette, dither=Image.Dither.NONE)
+        for chunk in GifImagePlugin.getdata(frame, duration=self.duration):
+            self.file.write(chunk)
+
+    def close(self):
+        self.file.write(b";")
+        self.file.close()
+
+
+class _Mp4Writer:
+    """H.264 (or MPEG-4 Part 2 if unavailable) through PyAV"""
+
+    def __init__(self, path, fps):
+        import av
+
+        self.av = av
+        self.container = av.open(path, mode="w")
+        rate = Fraction(fps).limit_denominator(1000)
+        try:
+            self.stream = self.container.add_stream("libx264", rate=rate)
+        except (ValueError, av.FFmpegError):
+            self.stream = self.container.add_stream("mpeg4", rate=rate)
+        self.stream.pix_fmt = "yuv420p"
+        self.started = False
+
+    def write(self, image):
+        if not self.started:
+            # yuv420p needs even dimensions
+            self.stream.width = image.width - image.width % 2
+            self.stream.height = image.height - image.height % 2
+            self.started = True
+        array = np.asarray(image)[:self.stream.height, :self.stream.width]
+        frame = self.av.VideoFrame.from_ndarray(np.ascontiguousarray(array), format="rgb24")
+        for packet in self.stream.encode(frame):
+            self.container.mux(packet)
+
+    def close(self):
+        if self.started:
+            for packet in self.stream.encode():
+                self.container.mux(packet)
+        self.container.close()
+
+
+class VideoExporter:
+    """
+    Streams raw frames into a GIF or MP4 file on a worker thread.
+
+    submit() hands a frame to a bounded queue; when the encoder falls behind
+    it blocks instead of buffering, so memory stays at `max_queue` frames no
+    matter how long the episode is. The worker downscales and encodes each
+    frame and writes it straight to disk.
+    """
+
+    def __init__(self, path, fmt="gif", fps=25, max_width=480, max_queue=8):
+        if fmt not in VIDEO_FORMATS:
+            raise ValueError(f"Unknown video format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.fps = fps
+        self.max_width = max_width
+        self.frames_written = 0
+        self.encode_time = 0.0
+        self.error = None
+
+        self._writer = _Mp4Writer(path, fps) if fmt == "mp4" else _GifWriter(path, fps)
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._worker = threading.Thread(target=self._run, name="video-export", daemon=True)
+        self._worker.start()
+
+    def submit(self, frame):
+        """Queue one RGB frame (blocks while the queue is full)"""
+        if self.error is None:
+            self._queue.put(frame)
+
+    def close(self):
+        """Finish the file; returns its path, or raises the worker's error"""
+        self._queue.put(None)
+        self._worker.join()
+        if self.error is not None:
+            raise self.error
+        return self.path
+
+    def discard(self):
+        """Stop the worker and delete the partial file"""
+        try:
+            self.close()
+        except Exception:
+            pass
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _run(self):
+        try:
+            while True:
+                frame = self._queue.get()
+                if frame is None:
+                    break
+                start = time.perf_counter()
+                image = Image.fromarray(frame)
+                if image.width > self.max_width:
+                    height = round(image.height * self.max_width / image.width)
+                    image = image.resize((self.max_width, height), Image.BILINEAR)
+                self._writer.write(image)
+                self.frames_written += 1
+                self.encode_time += time.perf_counter() - start
+        except Exception as e:
+            self.error = e
+            # Keep draining so submit() never blocks on a dead worker
+            while self._queue.get() is not None:
+                pass
+        finally:
+            self._writer.close()
+
+
+def new_video_path(env_name, fmt, root=VIDEO_DIR):
+    """Unique path for a new clip"""
+    os.makedirs(root, exist_ok=True)
+    return os.path.join(root, f"{env_name}_{time.strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}.{fmt}")
+
+
+def prune_videos(root=VIDEO_DIR, keep=MAX_VIDEOS):
+    """Delete the oldest clips beyond `keep`"""
+    paths = sorted((os.path.join(root, name) for name in os.listdir(root)
+                    if name.endswith(tuple(f".{fmt}" for fmt in VIDEO_FORMATS))),
+                   key=os.path.getmtime)
+    for path in paths[:max(0, len(paths) - keep)]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass